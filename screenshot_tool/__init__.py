@@ -1,12 +1,32 @@
-"""Automated Screenshot Tool for Multi-Language Windows Applications."""
+"""Automated Screenshot Tool for Multi-Language Windows Applications.
 
-from .app_logger import AppLogger
-from .automation import DropdownAutomation
-from .capture import WindowCapture
-from .cli import ScreenshotCLI
-from .config import Settings
-from .dropdown_reader import DropdownReader
-from .window_finder import WindowFinder
+The public classes are imported on first access, so ``import screenshot_tool``
+(and with it every CLI start) does not pull in pyautogui, pywinauto, keyboard,
+PIL or the ctypes window bindings until a mode actually needs them.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .app_logger import AppLogger
+    from .automation import DropdownAutomation
+    from .capture import WindowCapture
+    from .cli import ScreenshotCLI
+    from .config import Settings
+    from .dropdown_reader import DropdownReader
+    from .window_finder import WindowFinder
+
+# Public name -> submodule defining it
+_EXPORTS = {
+    "AppLogger": "app_logger",
+    "DropdownAutomation": "automation",
+    "DropdownReader": "dropdown_reader",
+    "Settings": "config",
+    "WindowCapture": "capture",
+    "ScreenshotCLI": "cli",
+    "WindowFinder": "window_finder",
+}
 
 __all__ = [
     "AppLogger",
@@ -17,3 +37,11 @@ __all__ = [
     "ScreenshotCLI",
     "WindowFinder",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
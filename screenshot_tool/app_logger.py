@@ -2,10 +2,22 @@
 
 All application code logs through ``AppLogger`` instead of ``print`` so output can
 be level-filtered or silenced from a single place.
+
+Besides the human-readable lines on stdout, ``enable_metrics`` opens an
+optional structured sink: one JSON object per line with typed fields (run id,
+event, phase, frame counts, durations, bytes written, errors), so CI can feed
+dashboards without scraping the text output.
 """
 
+import atexit
+import json
 import logging
+import os
 import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, TextIO
 
 _LOGGER_NAME = "screenshot_tool"
 _DEFAULT_LEVEL = "INFO"
@@ -15,6 +27,10 @@ class AppLogger:
     """Thin wrapper over the stdlib logger — the one logging entry point."""
 
     _logger: logging.Logger | None = None
+    _metrics: TextIO | None = None
+    _metrics_lock = threading.Lock()  # runs may report from several threads
+    _atexit_registered = False  # the daemon enables metrics once per job
+    run_id: str | None = None
 
     @classmethod
     def configure(cls, level: str = _DEFAULT_LEVEL) -> None:
@@ -35,6 +51,15 @@ class AppLogger:
         assert cls._logger is not None
         return cls._logger
 
+    @classmethod
+    def add_handler(cls, handler: logging.Handler) -> None:
+        """Send every message to ``handler`` too (e.g. a daemon job's client)."""
+        cls._get().addHandler(handler)
+
+    @classmethod
+    def remove_handler(cls, handler: logging.Handler) -> None:
+        cls._get().removeHandler(handler)
+
     @classmethod
     def debug(cls, message: str) -> None:
         cls._get().debug(message)
@@ -50,3 +75,49 @@ class AppLogger:
     @classmethod
     def error(cls, message: str) -> None:
         cls._get().error(message)
+        cls.metric("error", message=message.strip())
+
+    @classmethod
+    def enable_metrics(cls, path: Path, run_id: str | None = None) -> str:
+        """Start appending JSON-lines metrics to ``path``.
+
+        Args:
+            path: Metrics file; appended to, so several invocations can share it
+            run_id: Identifies this invocation in every line (random if omitted)
+
+        Returns:
+            The run id.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        cls.close_metrics()
+        cls._metrics = path.open("a", encoding="utf-8")
+        cls.run_id = run_id or os.urandom(6).hex()
+        if not cls._atexit_registered:
+            atexit.register(cls.close_metrics)
+            cls._atexit_registered = True
+        return cls.run_id
+
+    @classmethod
+    def close_metrics(cls) -> None:
+        """Close the metrics sink, if open. Safe to call more than once."""
+        with cls._metrics_lock:
+            if cls._metrics is not None:
+                cls._metrics.close()
+                cls._metrics = None
+
+    @classmethod
+    def metric(cls, event: str, **fields: Any) -> None:
+        """Emit one structured record; a no-op unless ``enable_metrics`` ran.
+
+        Args:
+            event: Record type, e.g. "phase", "recording", "summary", "error"
+            **fields: JSON-serializable values (counts, seconds, bytes, ...)
+        """
+        if cls._metrics is None:
+            return
+        record = {"ts": round(time.time(), 3), "run_id": cls.run_id, "event": event, **fields}
+        line = json.dumps(record, default=str)
+        with cls._metrics_lock:
+            if cls._metrics is not None:
+                cls._metrics.write(line + "\n")
+                cls._metrics.flush()  # complete lines even if the run crashes
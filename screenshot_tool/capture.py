@@ -7,6 +7,8 @@ before recording, so nothing else can bleed into the frame.
 """
 
 import ctypes
+from collections import Counter
+from collections.abc import Iterable
 from pathlib import Path
 
 import pyautogui
@@ -28,19 +30,11 @@ class WindowCapture:
     """Capture screenshots of Windows application windows."""
 
     @staticmethod
-    def capture_window(hwnd: int) -> Image.Image:
-        """Capture a window and return as PIL Image.
-
-        Uses pyautogui for reliable capture with proper DPI handling.
-
-        Args:
-            hwnd: Window handle to capture
-
-        Returns:
-            PIL Image of the window
+    def window_region(hwnd: int) -> tuple[int, int, int, int]:
+        """Screen region (left, top, width, height) a window capture grabs.
 
         Raises:
-            RuntimeError: If capture fails
+            RuntimeError: If the window has no visible area
         """
         # Real visible bounds (no invisible DWM border), clamped to the work area
         # so the taskbar can't appear even when the window overlaps it.
@@ -54,20 +48,96 @@ class WindowCapture:
 
         if width <= 0 or height <= 0:
             raise RuntimeError(f"Invalid window dimensions: {width}x{height}")
+        return left, top, width, height
+
+    @staticmethod
+    def inset_region(
+        region: tuple[int, int, int, int], inset: tuple[int, int, int, int]
+    ) -> tuple[int, int, int, int] | None:
+        """Shrink a region by a (top, right, bottom, left) inset.
+
+        Returns:
+            The smaller region, or None when the inset leaves nothing of it.
+        """
+        left, top, width, height = region
+        inset_top, inset_right, inset_bottom, inset_left = inset
+        width -= inset_left + inset_right
+        height -= inset_top + inset_bottom
+        if width <= 0 or height <= 0:
+            return None
+        return left + inset_left, top + inset_top, width, height
+
+    @staticmethod
+    def capture_window(hwnd: int, inset: tuple[int, int, int, int] = (0, 0, 0, 0)) -> Image.Image:
+        """Capture a window and return as PIL Image.
+
+        Uses pyautogui for reliable capture with proper DPI handling.
+
+        Args:
+            hwnd: Window handle to capture
+            inset: Pixels (top, right, bottom, left) to leave out of the grab,
+                so they are never transferred or allocated. Ignored when larger
+                than the window.
+
+        Returns:
+            PIL Image of the window
+
+        Raises:
+            RuntimeError: If capture fails
+        """
+        region = WindowCapture.window_region(hwnd)
+        region = WindowCapture.inset_region(region, inset) or region
 
         # Use pyautogui to capture the screen region
         # This handles DPI scaling correctly
-        screenshot = pyautogui.screenshot(region=(left, top, width, height))
+        screenshot = pyautogui.screenshot(region=region)
 
         return screenshot
 
     @staticmethod
-    def save_screenshot(image: Image.Image, output_path: Path) -> None:
+    def save_screenshot(image: Image.Image, output_path: Path, skip_unchanged: bool = False) -> str:
         """Save image to file, creating directories as needed.
 
         Args:
             image: PIL Image to save
             output_path: Path where to save the image
+            skip_unchanged: Compare with an existing file's decoded pixels first
+                and leave it untouched when identical - no PNG encoding, no
+                churn in a version-controlled output folder
+
+        Returns:
+            "written" for a new file, "changed" when an existing file was
+            replaced, "unchanged" when it was left as is.
         """
+        existed = output_path.is_file()
+        if skip_unchanged and existed and WindowCapture.same_pixels(image, output_path):
+            return "unchanged"
         output_path.parent.mkdir(parents=True, exist_ok=True)
         image.save(output_path, "PNG", optimize=True)
+        return "changed" if existed else "written"
+
+    @staticmethod
+    def count_saves(results: Iterable[str]) -> dict[str, int]:
+        """How many ``save_screenshot`` calls wrote, changed, or kept a file."""
+        counts = Counter(results)
+        return {result: counts[result] for result in ("written", "changed", "unchanged")}
+
+    @staticmethod
+    def summarize_saves(results: Iterable[str]) -> str:
+        """One summary line for a run's ``save_screenshot`` results."""
+        counts = WindowCapture.count_saves(results)
+        return (
+            f"Files: {counts['written']} written, {counts['changed']} changed, "
+            f"{counts['unchanged']} unchanged"
+        )
+
+    @staticmethod
+    def same_pixels(image: Image.Image, path: Path) -> bool:
+        """True if the image file at ``path`` decodes to exactly ``image``'s pixels."""
+        try:
+            with Image.open(path) as existing:
+                if existing.size != image.size:
+                    return False
+                return existing.convert(image.mode).tobytes() == image.tobytes()
+        except (OSError, ValueError):
+            return False  # unreadable: overwrite it
@@ -1,37 +1,64 @@
 """Command-line interface for automated screenshot capture."""
 
 import time
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 
 import keyboard
+import numpy as np
 
 from . import config
 from .app_logger import AppLogger
 from .automation import DropdownAutomation
 from .capture import WindowCapture
 from .dropdown_reader import DropdownReader
+from .journal import JOURNAL_NAME, CaptureJournal, JournalEntry, file_sha256
+from .language_driver import LanguageDriver
+from .profiling import RunProfiler
+from .settle import wait_for_settle
 from .window_finder import WindowFinder
 
 
 class ScreenshotCLI:
     """Automated CLI for capturing multi-language screenshots."""
 
-    def __init__(self, output_dir: str | None = None, delay: float | None = None):
+    def __init__(
+        self,
+        output_dir: str | None = None,
+        delay: float | None = None,
+        skip_unchanged: bool = False,
+        profile: bool = False,
+    ):
         """Initialize the CLI.
 
         Args:
             output_dir: Directory to save screenshots (defaults to config value)
-            delay: Delay in seconds after each language change (defaults to config value)
+            delay: Upper bound in seconds for the UI to settle after each language
+                change (defaults to config value)
+            skip_unchanged: Leave screenshots whose pixels did not change untouched
+            profile: Profile finding the window and capturing (cProfile +
+                tracemalloc) into ``<output>/profile``
         """
         self.output_dir = Path(output_dir or config.settings.output_dir)
         self.delay: float = (
             delay if delay is not None else (config.settings.delay_after_change or 0.0)
         )
+        self._delay_given = delay is not None
         self.hwnd: int | None = None
         self.automation: DropdownAutomation | None = None
         self.dropdown_reader: DropdownReader | None = None
+        self.skip_unchanged = skip_unchanged
         self.captured: list[str] = []
         self.failed: list[tuple[str, str]] = []
+        # save_screenshot result per captured language
+        self.file_results: list[str] = []
+        # Thumbnail of the previous language's screen; the next one must differ
+        self._last_thumbnail: np.ndarray | None = None
+        self.journal = CaptureJournal(self.output_dir / JOURNAL_NAME)
+        # Codes already captured by an earlier run (--resume)
+        self.already_done: set[str] = set()
+        self.profiler = RunProfiler("languages") if profile else None
 
     def find_window(self) -> bool:
         """Locate the target application window.
@@ -60,68 +87,156 @@ class ScreenshotCLI:
         AppLogger.error("Make sure the application is running and visible.")
         return False
 
-    def capture_language(self, index: int, total: int) -> bool:
+    def _fail(self, code: str, error: str) -> None:
+        """Record a failed language in the summary and the journal."""
+        self.failed.append((code, error))
+        self.journal.record(JournalEntry(code=code, status="failed", error=error))
+
+    def capture_language(self, index: int, total: int, expected_code: str | None = None) -> bool:
         """Capture screenshot for the current language shown in dropdown.
 
         Args:
             index: Current index (1-based)
             total: Total number of languages
+            expected_code: Language just selected, if known; names failures that
+                happen before the dropdown could be read
 
         Returns:
             True if capture was successful
         """
         assert self.hwnd is not None and self.dropdown_reader is not None
+        hwnd = self.hwnd
+        code = expected_code or f"item {index}"
         try:
-            time.sleep(self.delay)
-
-            if not WindowFinder.is_window_valid(self.hwnd):
+            if not WindowFinder.is_window_valid(hwnd):
                 AppLogger.error("Window closed unexpectedly")
                 return False
 
+            # Wait only as long as the app actually takes to repaint
+            settle = wait_for_settle(
+                lambda: WindowCapture.capture_window(hwnd),
+                timeout=self.delay,
+                baseline=self._last_thumbnail,
+            )
+            self._last_thumbnail = settle.thumbnail
+            settle_note = (
+                f"settled in {settle.seconds * 1000:.0f} ms"
+                if settle.settled
+                else f"not settled after {settle.seconds:.2f}s"
+            )
+
             display_name = self.dropdown_reader.get_selected_language()
             if not display_name:
                 AppLogger.error(f"[{index}/{total}] Could not read dropdown value")
-                self.failed.append(("unknown", "Could not read dropdown"))
+                self._fail(code, "Could not read dropdown")
                 return False
 
             lang_code = DropdownReader.lookup_code(display_name)
             if not lang_code:
                 AppLogger.error(f"[{index}/{total}] Unknown language '{display_name}'")
-                self.failed.append((display_name, "Unknown language name"))
+                self._fail(display_name, "Unknown language name")
                 return False
-
-            image = WindowCapture.capture_window(self.hwnd)
+            code = lang_code
+            if lang_code in self.already_done:
+                AppLogger.info(f"[{index}/{total}] {lang_code} - already captured, skipped")
+                return True
 
             # Save in language subfolder (e.g., screenshots/de/main.png)
             filename = config.settings.screenshot_filename or "screenshot.png"
             output_path = self.output_dir / lang_code / filename
-            WindowCapture.save_screenshot(image, output_path)
-
-            AppLogger.info(f"[{index}/{total}] {lang_code} - {display_name}... saved")
+            result = WindowCapture.save_screenshot(settle.image, output_path, self.skip_unchanged)
+            self.file_results.append(result)
+            self.journal.record(
+                JournalEntry(
+                    code=lang_code,
+                    status="ok",
+                    path=str(output_path),
+                    sha256=file_sha256(output_path),
+                )
+            )
+
+            AppLogger.info(
+                f"[{index}/{total}] {lang_code} - {display_name}... {result} ({settle_note})"
+            )
+            AppLogger.metric(
+                "language",
+                code=lang_code,
+                result=result,
+                settle_seconds=round(settle.seconds, 4),
+                settled=settle.settled,
+                bytes_written=0 if result == "unchanged" else output_path.stat().st_size,
+            )
             self.captured.append(lang_code)
             return True
 
         except Exception as e:
             AppLogger.error(f"[{index}/{total}] FAILED: {e}")
-            self.failed.append(("unknown", str(e)))
+            self._fail(code, str(e))
             return False
 
-    def run_automated(self, start_from: str | None = None) -> int:
+    def run_automated(self, start_from: str | None = None, resume: bool = False) -> int:
         """Run fully automated capture session.
 
         Args:
             start_from: Optional language code to start from
+            resume: Retry only the languages the journal does not record as
+                captured (failed, missing, or changed on disk since)
 
         Returns:
             Exit code (0 for success, 1 for errors)
         """
+        try:
+            return self._run_automated(start_from, resume)
+        finally:
+            if self.profiler is not None:
+                self.profiler.save(self.output_dir / "profile")
+
+    @contextmanager
+    def _phase(self, name: str) -> Iterator[None]:
+        """Profile the enclosed block as phase ``name`` when profiling is on."""
+        if self.profiler is None:
+            yield
+        else:
+            with self.profiler.phase(name):
+                yield
+
+    def _missing_dropdown_keys(self) -> list[str]:
+        """Language-mode config keys that are unset (--delay stands in for the delay)."""
+        settings = config.settings
+        values = {
+            "dropdown_relative_pos": settings.dropdown_relative_pos,
+            "screenshot_filename": settings.screenshot_filename,
+            "delay_after_change": 0.0 if self._delay_given else settings.delay_after_change,
+        }
+        return [key for key, value in values.items() if value is None]
+
+    def _run_automated(self, start_from: str | None, resume: bool) -> int:
         if config.settings.language_names is None:
             AppLogger.error("Config has no 'languages' section - nothing to capture.")
             AppLogger.error("Use --demo to run the demos defined in this config.")
             return 1
-        language_names = config.settings.language_names
+        # A config with demos may leave out the dropdown keys (--language-demo
+        # needs none); clicking through the dropdown does
+        missing = self._missing_dropdown_keys()
+        if missing:
+            AppLogger.error(
+                f"Config lacks {', '.join(missing)}, needed to capture languages through "
+                "the dropdown. Add them, or use --language-demo."
+            )
+            return 1
 
-        if not self.find_window():
+        if resume:
+            self.already_done = self.journal.completed()
+            remaining = [c for c in config.settings.language_codes if c not in self.already_done]
+            AppLogger.info(
+                f"Resuming: {len(self.already_done)} captured earlier, {len(remaining)} to go"
+            )
+            if not remaining:
+                return 0
+
+        with self._phase("find_window"):
+            found = self.find_window()
+        if not found:
             return 1
         assert self.hwnd is not None
 
@@ -139,16 +254,78 @@ class ScreenshotCLI:
             languages = languages[start_index:]
             AppLogger.info(f"Starting from '{start_from}' ({len(languages)} languages)")
 
+        # Only now: a run that never gets to capture keeps the last run's journal
+        self.journal.start(resume)
+        with self._phase("capture"):
+            AppLogger.info("\nBringing window to foreground...")
+            WindowFinder.bring_to_foreground(self.hwnd)
+            time.sleep(0.3)
+
+            driver = LanguageDriver(self.hwnd)
+            if driver.connect():
+                AppLogger.info(f"Selecting languages via UI Automation ({len(driver.items)} items)")
+                languages = [c for c in languages if c not in self.already_done]
+                self._capture_with_driver(driver, languages)
+            else:
+                AppLogger.info("UI Automation selection unavailable; falling back to keypresses")
+                # Keypresses must walk every item; capture_language skips done ones
+                if not self._capture_with_keypresses(languages, start_from):
+                    return 1
+        total = len([c for c in languages if c not in self.already_done])
+
+        AppLogger.metric(
+            "summary",
+            mode="language",
+            runs=total,
+            succeeded=len(self.captured),
+            failed=[code for code, _ in self.failed],
+            **WindowCapture.count_saves(self.file_results),
+        )
+        AppLogger.info(f"\n{'=' * 50}")
+        AppLogger.info("Capture complete!")
+        AppLogger.info(f"  Captured: {len(self.captured)}/{total}")
+        AppLogger.info(f"  {WindowCapture.summarize_saves(self.file_results)}")
+        if self.failed:
+            AppLogger.info(f"  Failed: {len(self.failed)}")
+            for code, error in self.failed:
+                AppLogger.info(f"    - {code}: {error}")
+        AppLogger.info(f"  Output: {self.output_dir.absolute()}")
+        if self.failed:
+            AppLogger.info("  Re-run with --resume to retry only the failed languages.")
+
+        return 0 if not self.failed else 1
+
+    def _capture_with_driver(self, driver: LanguageDriver, languages: list[str]) -> None:
+        """Select each language by name through UIA, then capture it."""
+        language_names = config.settings.language_names or {}
+        self.dropdown_reader = driver
         total = len(languages)
-        AppLogger.info("\nBringing window to foreground...")
-        WindowFinder.bring_to_foreground(self.hwnd)
-        time.sleep(0.3)
+        AppLogger.info(f"\nCapturing {total} languages automatically...\n")
+        for i, code in enumerate(languages, 1):
+            name = language_names.get(code, code)
+            if name not in driver.items:
+                AppLogger.error(f"[{i}/{total}] '{name}' is not in the dropdown")
+                self._fail(code, "Not in dropdown")
+                continue
+            if not driver.select(name):
+                self._fail(code, "Could not select language")
+                continue
+            self.capture_language(i, total, expected_code=code)
+
+    def _capture_with_keypresses(self, languages: list[str], start_from: str | None) -> bool:
+        """Walk the dropdown with Home/Down keypresses, capturing each item.
 
+        Returns:
+            False if the dropdown could not be read at all
+        """
+        assert self.hwnd is not None
+        language_names = config.settings.language_names or {}
+        total = len(languages)
         self.automation = DropdownAutomation(self.hwnd)
         self.dropdown_reader = DropdownReader(self.hwnd)
         if not self.dropdown_reader.connect():
             AppLogger.error("Could not connect to window for reading dropdown")
-            return 1
+            return False
 
         AppLogger.info("Focusing language dropdown...")
         self.automation.focus_dropdown()
@@ -166,22 +343,4 @@ class ScreenshotCLI:
             self.capture_language(i, total)
             if i < total:
                 self.automation.next_item()
-
-        AppLogger.info(f"\n{'=' * 50}")
-        AppLogger.info("Capture complete!")
-        AppLogger.info(f"  Captured: {len(self.captured)}/{total}")
-        if self.failed:
-            AppLogger.info(f"  Failed: {len(self.failed)}")
-            for code, error in self.failed:
-                AppLogger.info(f"    - {code}: {error}")
-        AppLogger.info(f"  Output: {self.output_dir.absolute()}")
-
-        return 0 if not self.failed else 1
-
-    def list_languages(self) -> None:
-        """Log all supported language codes."""
-        names = config.settings.language_names or {}
-        AppLogger.info("Supported language codes:\n")
-        for code in config.settings.language_codes:
-            AppLogger.info(f"  {code:4} - {names.get(code, '')}")
-        AppLogger.info(f"\nTotal: {len(config.settings.language_codes)} languages")
+        return True
@@ -0,0 +1,244 @@
+"""Visual regression check of stills: ``--compare BASELINE``.
+
+Pairs every PNG under the current output directory with the file at the same
+relative path under a baseline directory (``de/screenshot.png``,
+``demos/basic-math/de/start.png``, ...) and diffs each pair in a process pool:
+
+- changed pixels: pixels where any channel differs by more than
+  ``PIXEL_TOLERANCE`` (filters PNG/antialiasing noise), as a share of the image
+- perceptual score: 1 - mean SSIM over 8x8 blocks of the luminance (0 =
+  identical structure; small for a color shift, large for moved layout)
+
+Pairs above the threshold get a heatmap (the baseline, dimmed, with changed
+pixels in red). ``compare.json`` and ``compare.html`` in
+``<current>/_compare/`` list every pair; the run exits with 1 when anything
+changed, is missing or is new, so CI can gate on it.
+"""
+
+import html
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from .app_logger import AppLogger
+
+COMPARE_DIR = "_compare"
+HEATMAP_DIR = "heatmaps"
+# Per-channel difference not counted as a change (PNG/antialiasing noise)
+PIXEL_TOLERANCE = 16
+# Share of changed pixels (%) above which a still counts as changed
+DEFAULT_THRESHOLD = 0.1
+# Pairs handed to a worker process at a time
+_CHUNK = 16
+_SSIM_BLOCK = 8
+_SSIM_C1 = (0.01 * 255) ** 2
+_SSIM_C2 = (0.03 * 255) ** 2
+
+
+@dataclass(frozen=True)
+class StillDiff:
+    """Comparison result of one still."""
+
+    path: str  # relative to both roots, with "/" separators
+    status: str  # "unchanged", "changed", "resized", "missing" (baseline only), "new"
+    changed_pixels: int = 0
+    changed_percent: float = 0.0
+    score: float = 0.0
+    heatmap: str | None = None  # relative to the compare directory
+
+
+def _luminance(pixels: np.ndarray) -> np.ndarray:
+    return pixels @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def perceptual_score(a: np.ndarray, b: np.ndarray) -> float:
+    """1 - mean SSIM of two same-size RGB arrays over 8x8 luminance blocks."""
+    x, y = _luminance(a.astype(np.float32)), _luminance(b.astype(np.float32))
+    block = max(1, min(_SSIM_BLOCK, *x.shape))
+    height, width = (n // block for n in x.shape)
+    shape = (height, block, width, block)
+    x = x[: height * block, : width * block].reshape(shape)
+    y = y[: height * block, : width * block].reshape(shape)
+    mean_x, mean_y = x.mean(axis=(1, 3)), y.mean(axis=(1, 3))
+    var_x, var_y = x.var(axis=(1, 3)), y.var(axis=(1, 3))
+    cov = (x * y).mean(axis=(1, 3)) - mean_x * mean_y
+    ssim = ((2 * mean_x * mean_y + _SSIM_C1) * (2 * cov + _SSIM_C2)) / (
+        (mean_x**2 + mean_y**2 + _SSIM_C1) * (var_x + var_y + _SSIM_C2)
+    )
+    return float(1 - ssim.mean())
+
+
+def heatmap(baseline: np.ndarray, diff: np.ndarray) -> Image.Image:
+    """The baseline in dimmed gray with each pixel's largest channel difference in red."""
+    gray = (_luminance(baseline.astype(np.float32)) * 0.4).astype(np.uint8)
+    out = np.stack([gray, gray, gray], axis=2)
+    out[..., 0] = np.maximum(gray, diff)
+    return Image.fromarray(out, "RGB")
+
+
+def _load(path: Path) -> np.ndarray:
+    with Image.open(path) as image:
+        return np.asarray(image.convert("RGB"))
+
+
+def compare_pair(job: tuple[str, str, str, str, float]) -> StillDiff:
+    """Diff one current/baseline pair (runs in a worker process).
+
+    Args:
+        job: (relative path, current file, baseline file, heatmap file,
+            threshold in %); the heatmap is only written for changed pairs
+    """
+    relative, current_file, baseline_file, heatmap_file, threshold = job
+    current, baseline = _load(Path(current_file)), _load(Path(baseline_file))
+    if current.shape != baseline.shape:
+        return StillDiff(relative, "resized", score=1.0)
+    # |a - b| per pixel, largest channel, in uint8 (max - min never wraps)
+    diff = (np.maximum(current, baseline) - np.minimum(current, baseline)).max(axis=2)
+    changed = int(np.count_nonzero(diff > PIXEL_TOLERANCE))
+    percent = 100 * changed / diff.size
+    score = round(perceptual_score(current, baseline), 5)
+    if percent <= threshold:
+        return StillDiff(relative, "unchanged", changed, round(percent, 4), score)
+    Path(heatmap_file).parent.mkdir(parents=True, exist_ok=True)
+    heatmap(baseline, diff).save(heatmap_file)
+    return StillDiff(
+        relative, "changed", changed, round(percent, 4), score, f"{HEATMAP_DIR}/{relative}"
+    )
+
+
+def _stills(root: Path) -> set[str]:
+    """Relative paths of the PNGs under ``root``, leaving out compare output."""
+    return {
+        p.relative_to(root).as_posix()
+        for p in root.rglob("*.png")
+        if COMPARE_DIR not in p.relative_to(root).parts
+    }
+
+
+def compare_dirs(
+    current: Path, baseline: Path, threshold: float = DEFAULT_THRESHOLD, workers: int | None = None
+) -> list[StillDiff]:
+    """Compare every still of ``current`` with ``baseline``, sorted by path.
+
+    Heatmaps go to ``<current>/_compare/heatmaps/``; the pairs are diffed in
+    ``workers`` processes (default: one per CPU).
+    """
+    out_dir = current / COMPARE_DIR
+    current_stills, baseline_stills = _stills(current), _stills(baseline)
+    jobs = [
+        (
+            rel,
+            str(current / rel),
+            str(baseline / rel),
+            str(out_dir / HEATMAP_DIR / rel),
+            threshold,
+        )
+        for rel in sorted(current_stills & baseline_stills)
+    ]
+    results = [StillDiff(rel, "missing") for rel in baseline_stills - current_stills]
+    results += [StillDiff(rel, "new") for rel in current_stills - baseline_stills]
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results += pool.map(compare_pair, jobs, chunksize=_CHUNK)
+    return sorted(results, key=lambda r: r.path)
+
+
+def write_summary(
+    results: list[StillDiff], current: Path, baseline: Path, threshold: float
+) -> tuple[Path, Path]:
+    """Write ``compare.json`` and ``compare.html`` to ``<current>/_compare/``.
+
+    Returns:
+        The two file paths.
+    """
+    out_dir = current / COMPARE_DIR
+    out_dir.mkdir(parents=True, exist_ok=True)
+    counts: dict[str, int] = {}
+    for result in results:
+        counts[result.status] = counts.get(result.status, 0) + 1
+    json_path = out_dir / "compare.json"
+    json_path.write_text(
+        json.dumps(
+            {
+                "current": str(current),
+                "baseline": str(baseline),
+                "threshold_percent": threshold,
+                "counts": counts,
+                "stills": [asdict(result) for result in results],
+            },
+            indent=2,
+        ),
+        encoding="utf-8",
+    )
+
+    def link(path: Path) -> str:
+        try:
+            url = Path(os.path.relpath(path, out_dir)).as_posix()
+        except ValueError:  # another drive (Windows): no relative path
+            url = path.resolve().as_uri()
+        return f'<a href="{html.escape(url)}"><img src="{html.escape(url)}" width="240"></a>'
+
+    rows = []
+    for r in results:
+        if r.status == "unchanged":
+            continue
+        cells = [
+            html.escape(r.path),
+            r.status,
+            f"{r.changed_percent:.2f}%",
+            f"{r.score:.4f}",
+            link(current / r.path) if r.status != "missing" else "",
+            link(baseline / r.path) if r.status != "new" else "",
+            link(out_dir / r.heatmap) if r.heatmap else "",
+        ]
+        rows.append("<tr>" + "".join(f"<td>{cell}</td>" for cell in cells) + "</tr>")
+    summary = ", ".join(f"{n} {status}" for status, n in sorted(counts.items()))
+    html_path = out_dir / "compare.html"
+    html_path.write_text(
+        "<!doctype html>\n<meta charset=utf-8>\n<title>Still comparison</title>\n"
+        "<style>body{font-family:sans-serif}td{vertical-align:top;padding:4px}</style>\n"
+        f"<h1>Still comparison</h1>\n<p>{html.escape(str(current))} vs "
+        f"{html.escape(str(baseline))}, threshold {threshold}% changed pixels: "
+        f"{html.escape(summary)}</p>\n<table>\n<tr><th>Still</th><th>Status</th>"
+        "<th>Changed</th><th>Score</th><th>Current</th><th>Baseline</th><th>Diff</th></tr>\n"
+        + "\n".join(rows)
+        + "\n</table>\n",
+        encoding="utf-8",
+    )
+    return json_path, html_path
+
+
+def run_compare(
+    current: Path, baseline: Path, threshold: float = DEFAULT_THRESHOLD, workers: int | None = None
+) -> int:
+    """Compare, write the summaries, and log the stills that changed.
+
+    Returns:
+        Exit code: 0 when every still matches the baseline, 1 otherwise.
+    """
+    for root in (current, baseline):
+        if not root.is_dir():
+            AppLogger.error(f"Not a directory: {root}")
+            return 1
+    AppLogger.info(f"Comparing stills in {current} with {baseline}...")
+    results = compare_dirs(current, baseline, threshold, workers)
+    json_path, html_path = write_summary(results, current, baseline, threshold)
+    differing = [r for r in results if r.status != "unchanged"]
+    for r in differing:
+        detail = f" ({r.changed_percent:.2f}% pixels, score {r.score:.4f})" if r.heatmap else ""
+        AppLogger.info(f"  {r.status:9} {r.path}{detail}")
+    AppLogger.metric(
+        "compare",
+        stills=len(results),
+        differing=len(differing),
+        threshold_percent=threshold,
+    )
+    AppLogger.info(f"\n{len(results) - len(differing)} of {len(results)} stills match the baseline")
+    AppLogger.info(f"  {json_path}")
+    AppLogger.info(f"  {html_path}")
+    return 1 if differing else 0
@@ -2,18 +2,36 @@
 
 A config may define a language-screenshot flow (``languages`` + dropdown keys),
 animated demos (``launch`` + ``demos``), or both.
+
+``settings`` is loaded on first access (from DEFAULT_CONFIG_PATH unless
+``load_config`` ran first), so importing this module reads no file and a
+``--config`` run never parses the default config.
 """
 
 import json
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import NoReturn
+from typing import Any, NoReturn
 
 DEFAULT_CONFIG_PATH = Path(__file__).parent.parent / "config" / "keyboard-layout-watcher.json"
 
 _ALWAYS_REQUIRED = ["process_name", "title_substring", "output_dir"]
 _LANGUAGE_KEYS = ["dropdown_relative_pos", "screenshot_filename", "delay_after_change", "languages"]
 _VALID_FORMATS = ("gif", "mp4")
+_CAPTURE_MODES = ("timer", "dirty")
+MEMORY_POLICIES = ("spill", "downscale", "reduce_fps", "stop")
+_X264_PRESETS = (
+    "ultrafast",
+    "superfast",
+    "veryfast",
+    "faster",
+    "fast",
+    "medium",
+    "slow",
+    "slower",
+    "veryslow",
+)
+_X264_TUNES = ("film", "animation", "grain", "stillimage", "fastdecode", "zerolatency")
 
 
 @dataclass(frozen=True)
@@ -24,6 +42,16 @@ class LaunchSettings:
     cwd: str | None
 
 
+@dataclass(frozen=True)
+class Mp4Settings:
+    """MP4 encoding of a demo: parallel segments and x264 tuning (None = x264 default)."""
+
+    segments: int = 1
+    crf: int | None = None
+    preset: str | None = None
+    tune: str | None = None
+
+
 @dataclass(frozen=True)
 class DemoSpec:
     """One recordable demo the target application can play."""
@@ -42,6 +70,25 @@ class DemoSpec:
     # Pixels removed from each captured frame, (top, right, bottom, left).
     # For residual edge cleanup after the DWM/work-area capture bounds.
     crop: tuple[int, int, int, int] = (0, 0, 0, 0)
+    # Detect edges that never change after recording and trim them from the export
+    auto_crop: bool = False
+    # Seconds of unchanged picture kept before the first and after the last
+    # change; longer idle head/tail is trimmed from the export. None = keep all
+    max_idle: float | None = None
+    # Drop GIF frames differing from the last kept one in at most this many
+    # pixels (caret blink, antialiasing); their time goes to the kept frame
+    gif_prune_pixels: int | None = None
+    # Upper bound (s) for the window to settle after it is raised and moved
+    settle_timeout: float = 0.3
+    # Seconds kept in the recording after demo_ended (shows the final state)
+    tail: float = 0.5
+    # "timer": capture at a fixed fps; "dirty": capture after each frame_dirty
+    # event from the app, at most fps times per second
+    capture: str = "timer"
+    # Cap (MiB) on the frames held in memory, and what to do when reached
+    memory_budget_mb: float | None = None
+    memory_policy: str = "stop"
+    mp4: Mp4Settings = field(default_factory=Mp4Settings)
 
 
 @dataclass(frozen=True)
@@ -80,6 +127,35 @@ def _parse_launch(config_path: Path, data: dict) -> LaunchSettings:
     return LaunchSettings(command=tuple(command), cwd=data.get("cwd"))
 
 
+def _parse_seconds(config_path: Path, data: dict, key: str, default: float) -> float:
+    value = data.get(key, default)
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+        _fail(config_path, f"demo '{data['name']}' {key} must be a number >= 0")
+    return float(value)
+
+
+def _parse_mp4(config_path: Path, data: dict) -> Mp4Settings:
+    raw = data.get("mp4", {})
+    prefix = f"demo '{data['name']}' mp4"
+    if not isinstance(raw, dict):
+        _fail(config_path, f"{prefix} must be an object with segments/crf/preset/tune")
+    segments = raw.get("segments", 1)
+    if isinstance(segments, bool) or not isinstance(segments, int) or segments < 1:
+        _fail(config_path, f"{prefix}.segments must be an integer >= 1")
+    crf = raw.get("crf")
+    if crf is not None and (
+        isinstance(crf, bool) or not isinstance(crf, int) or not 0 <= crf <= 51
+    ):
+        _fail(config_path, f"{prefix}.crf must be an integer from 0 to 51")
+    preset = raw.get("preset")
+    if preset is not None and preset not in _X264_PRESETS:
+        _fail(config_path, f"{prefix}.preset must be one of: {', '.join(_X264_PRESETS)}")
+    tune = raw.get("tune")
+    if tune is not None and tune not in _X264_TUNES:
+        _fail(config_path, f"{prefix}.tune must be one of: {', '.join(_X264_TUNES)}")
+    return Mp4Settings(segments=segments, crf=crf, preset=preset, tune=tune)
+
+
 def _parse_demo(config_path: Path, data: dict) -> DemoSpec:
     if not isinstance(data.get("id"), int):
         _fail(config_path, "each demo needs an integer 'id'")
@@ -102,6 +178,29 @@ def _parse_demo(config_path: Path, data: dict) -> DemoSpec:
         _fail(
             config_path, f"demo '{data['name']}' crop must be an object with top/right/bottom/left"
         )
+    prune = data.get("gif_prune_pixels")
+    if prune is not None and (isinstance(prune, bool) or not isinstance(prune, int) or prune < 0):
+        _fail(config_path, f"demo '{data['name']}' gif_prune_pixels must be an integer >= 0")
+    auto_crop = data.get("auto_crop", False)
+    if not isinstance(auto_crop, bool):
+        _fail(config_path, f"demo '{data['name']}' auto_crop must be true or false")
+    capture = data.get("capture", "timer")
+    if capture not in _CAPTURE_MODES:
+        _fail(
+            config_path,
+            f"demo '{data['name']}' capture must be one of: {', '.join(_CAPTURE_MODES)}",
+        )
+    budget = data.get("memory_budget_mb")
+    if budget is not None and (
+        isinstance(budget, bool) or not isinstance(budget, (int, float)) or budget <= 0
+    ):
+        _fail(config_path, f"demo '{data['name']}' memory_budget_mb must be a number > 0")
+    policy = data.get("memory_policy", "stop")
+    if policy not in MEMORY_POLICIES:
+        _fail(
+            config_path,
+            f"demo '{data['name']}' memory_policy must be one of: {', '.join(MEMORY_POLICIES)}",
+        )
     crop = (
         max(0, int(raw_crop.get("top", 0))),
         max(0, int(raw_crop.get("right", 0))),
@@ -118,6 +217,17 @@ def _parse_demo(config_path: Path, data: dict) -> DemoSpec:
         app_settings=tuple((str(k), str(v)) for k, v in raw_settings.items()),
         languages=tuple(raw_languages),
         crop=crop,
+        auto_crop=auto_crop,
+        max_idle=(
+            _parse_seconds(config_path, data, "max_idle", 0.0) if "max_idle" in data else None
+        ),
+        settle_timeout=_parse_seconds(config_path, data, "settle_timeout", 0.3),
+        tail=_parse_seconds(config_path, data, "tail", 0.5),
+        gif_prune_pixels=prune,
+        capture=capture,
+        memory_budget_mb=float(budget) if budget is not None else None,
+        memory_policy=policy,
+        mp4=_parse_mp4(config_path, data),
     )
 
 
@@ -204,7 +314,9 @@ def load_config(path: str | Path | None = None) -> Settings:
         raise SystemExit(f"ERROR: Invalid JSON in {config_path}: {e}")
 
     required = list(_ALWAYS_REQUIRED)
-    if "languages" in data:
+    if "languages" in data and "demos" not in data:
+        # With demos, languages can be captured through a demo (--language-demo),
+        # which needs none of the dropdown keys
         required += _LANGUAGE_KEYS
     missing = [key for key in required if key not in data]
     if missing:
@@ -222,9 +334,13 @@ def load_config(path: str | Path | None = None) -> Settings:
         process_name=data["process_name"],
         title_substring=data["title_substring"],
         output_dir=data["output_dir"],
-        dropdown_relative_pos=(int(pos[0]), int(pos[1])) if has_languages else None,
+        dropdown_relative_pos=(int(pos[0]), int(pos[1])) if has_languages and pos else None,
         screenshot_filename=data.get("screenshot_filename"),
-        delay_after_change=float(data["delay_after_change"]) if has_languages else None,
+        delay_after_change=(
+            float(data["delay_after_change"])
+            if has_languages and "delay_after_change" in data
+            else None
+        ),
         language_names=data.get("languages"),
         launch=launch,
         demos=demos,
@@ -233,4 +349,12 @@ def load_config(path: str | Path | None = None) -> Settings:
     return settings
 
 
-settings: Settings = load_config()
+# Bound by load_config; until then module __getattr__ loads the default
+settings: Settings
+
+
+def __getattr__(name: str) -> Any:
+    # PEP 562: only reached while ``settings`` is still unbound
+    if name == "settings":
+        return load_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
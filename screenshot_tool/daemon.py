@@ -0,0 +1,298 @@
+"""Recording daemon: ``--serve`` keeps the tool loaded, ``--submit`` sends it jobs.
+
+A one-off ``--demo`` run pays interpreter startup, the imaging/automation
+imports and config parsing before it records anything. The daemon pays that
+once, then takes recording jobs over a localhost TCP socket and runs them one
+after another (recordings share the screen) with the same ``DemoCLI`` logic.
+
+Protocol: newline-terminated UTF-8 JSON, one job per connection.
+
+- client -> daemon, one line: ``{"demo": "1" | "all", "config": path | null,
+  "cwd": path | null, "skip_unchanged": bool, "profile": bool,
+  "memory_budget_mb": number | null, "memory_policy": str | null,
+  "metrics": path | null}`` (everything but ``demo`` optional)
+- daemon -> client: ``{"type": "queued", "job": n, "ahead": k}``, then
+  ``{"type": "started", "job": n}``, every log line of the job as
+  ``{"type": "log", "level": "INFO", "message": ...}``, and finally
+  ``{"type": "done", "job": n, "exit_code": c}``; a malformed job gets
+  ``{"type": "error", "message": ...}`` and the connection is closed.
+
+A job runs in the client's working directory (``cwd``), so relative paths in
+its config resolve as they would for a local run.
+"""
+
+import itertools
+import json
+import logging
+import os
+import queue
+import socket
+import socketserver
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from . import config
+from .app_logger import AppLogger
+
+DEFAULT_DAEMON_PORT = 47310
+_MAX_REQUEST_BYTES = 64 * 1024
+# How long --submit waits to reach the daemon
+_CONNECT_TIMEOUT_S = 5.0
+
+# Log level of a relayed job line -> how --submit logs it
+_RELAY_LOG: dict[str | None, Callable[[str], None]] = {
+    "DEBUG": AppLogger.debug,
+    "WARNING": AppLogger.warning,
+    "ERROR": AppLogger.error,
+    "CRITICAL": AppLogger.error,
+}
+
+# Request key -> accepted types (None: the key may be null)
+_JOB_KEYS: dict[str, tuple[type, ...]] = {
+    "demo": (str,),
+    "config": (str, type(None)),
+    "cwd": (str, type(None)),
+    "skip_unchanged": (bool,),
+    "profile": (bool,),
+    "memory_budget_mb": (int, float, type(None)),
+    "memory_policy": (str, type(None)),
+    "metrics": (str, type(None)),
+}
+
+
+def parse_job(line: bytes) -> dict[str, Any]:
+    """Decode and validate one job request line.
+
+    Raises:
+        ValueError: Not a JSON object, no ``demo``, an unknown or mistyped key,
+            or an out-of-range value.
+    """
+    try:
+        request = json.loads(line)
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"job is not valid JSON: {e}") from None
+    if not isinstance(request, dict) or "demo" not in request:
+        raise ValueError('job must be a JSON object with a "demo" selector')
+    for key, value in request.items():
+        types = _JOB_KEYS.get(key)
+        if types is None:
+            raise ValueError(f"unknown job key '{key}'")
+        if not isinstance(value, types) or (isinstance(value, bool) and bool not in types):
+            raise ValueError(f"job key '{key}' has the wrong type")
+    budget = request.get("memory_budget_mb")
+    if budget is not None and budget <= 0:
+        raise ValueError("memory_budget_mb must be greater than 0")
+    policy = request.get("memory_policy")
+    if policy is not None and policy not in config.MEMORY_POLICIES:
+        raise ValueError(f"memory_policy must be one of: {', '.join(config.MEMORY_POLICIES)}")
+    return request
+
+
+@dataclass
+class DaemonJob:
+    """One queued recording job and the progress stream of its client."""
+
+    id: int
+    request: dict[str, Any]
+    # Progress messages for the client; None ends the stream
+    messages: queue.Queue[dict | None] = field(default_factory=queue.Queue)
+
+
+# Set in the threads that talk to clients, whose log lines belong to no job
+_client_thread = threading.local()
+
+
+class _JobLogHandler(logging.Handler):
+    """Forwards the log lines of a running job to its client."""
+
+    def __init__(self, job: DaemonJob) -> None:
+        super().__init__()
+        self.job = job
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if getattr(_client_thread, "serving", False):
+            return  # the daemon's own note about another client's job
+        self.job.messages.put(
+            {"type": "log", "level": record.levelname, "message": record.getMessage()}
+        )
+
+
+def run_demo_job(request: dict[str, Any], default_config: str | None) -> int:
+    """Run one job with ``DemoCLI``, as ``--demo`` would.
+
+    Returns:
+        The run's exit code.
+    """
+    from .demo_cli import DemoCLI
+
+    config.load_config(request.get("config") or default_config)
+    return DemoCLI(
+        skip_unchanged=request.get("skip_unchanged", False),
+        profile=request.get("profile", False),
+        memory_budget_mb=request.get("memory_budget_mb"),
+        memory_policy=request.get("memory_policy"),
+    ).run(request["demo"])
+
+
+class RecordingDaemon:
+    """Localhost job server; one worker thread runs the queued jobs in order."""
+
+    def __init__(
+        self,
+        port: int = DEFAULT_DAEMON_PORT,
+        default_config: str | None = None,
+        runner: Callable[[dict[str, Any], str | None], int] = run_demo_job,
+    ) -> None:
+        """Create the daemon; it listens once ``start`` or ``serve_forever`` runs.
+
+        Args:
+            port: TCP port on 127.0.0.1 (0 = any free port; see ``port`` after ``start``)
+            default_config: Config for jobs that name none (DEFAULT_CONFIG_PATH if None)
+            runner: Runs one job and returns its exit code
+        """
+        self.port = port
+        self.default_config = default_config
+        self._runner = runner
+        self._jobs: queue.Queue[DaemonJob] = queue.Queue()
+        self._job_ids = itertools.count(1)
+        self._running: DaemonJob | None = None
+        self._server: socketserver.ThreadingTCPServer | None = None
+
+    def start(self) -> None:
+        """Bind the socket and start serving and working in background threads."""
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                daemon._serve_client(self.rfile, self.wfile)
+
+        server = socketserver.ThreadingTCPServer(("127.0.0.1", self.port), Handler)
+        server.daemon_threads = True  # a client waiting on its job never blocks exit
+        self._server = server
+        self.port = server.server_address[1]
+        threading.Thread(target=server.serve_forever, daemon=True, name="daemon-server").start()
+        threading.Thread(target=self._work, daemon=True, name="daemon-worker").start()
+
+    def shutdown(self) -> None:
+        """Stop accepting jobs (a running job is not interrupted)."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def serve_forever(self) -> int:
+        """``--serve``: preload the recording modules, serve until Ctrl+C.
+
+        Returns:
+            Exit code (0).
+        """
+        from . import demo_cli  # noqa: F401 - pay the heavy imports once, up front
+
+        self.start()
+        AppLogger.info(
+            f"Recording daemon listening on 127.0.0.1:{self.port} "
+            "(submit with --demo ID --submit; Ctrl+C stops)"
+        )
+        try:
+            while True:
+                time.sleep(1)  # unlike a bare Event.wait, wakes for Ctrl+C on Windows
+        except KeyboardInterrupt:
+            AppLogger.info("Recording daemon stopped.")
+        finally:
+            self.shutdown()
+        return 0
+
+    def _serve_client(self, rfile: Any, wfile: Any) -> None:
+        """Queue the client's job and stream its progress back."""
+        _client_thread.serving = True
+
+        def send(message: dict) -> None:
+            wfile.write((json.dumps(message) + "\n").encode("utf-8"))
+            wfile.flush()
+
+        try:
+            request = parse_job(rfile.readline(_MAX_REQUEST_BYTES))
+        except ValueError as e:
+            send({"type": "error", "message": str(e)})
+            return
+        job = DaemonJob(next(self._job_ids), request)
+        ahead = self._jobs.qsize() + (self._running is not None)
+        self._jobs.put(job)
+        AppLogger.info(f"Job {job.id} queued: demo {request['demo']} ({ahead} ahead)")
+        try:
+            send({"type": "queued", "job": job.id, "ahead": ahead})
+            while (message := job.messages.get()) is not None:
+                send(message)
+        except OSError:
+            pass  # the client went away; the job still runs to completion
+
+    def _work(self) -> None:
+        while True:
+            job = self._jobs.get()
+            self._running = job
+            try:
+                self._run(job)
+            finally:
+                self._running = None
+
+    def _run(self, job: DaemonJob) -> None:
+        request = job.request
+        job.messages.put({"type": "started", "job": job.id})
+        handler = _JobLogHandler(job)
+        AppLogger.add_handler(handler)
+        previous_cwd = os.getcwd()
+        exit_code = 1
+        # The working directory and the metrics sink are process-global; this
+        # is only safe because one worker thread runs the jobs, one at a time
+        try:
+            if request.get("cwd"):
+                os.chdir(request["cwd"])
+            if request.get("metrics"):
+                AppLogger.enable_metrics(Path(request["metrics"]))
+            exit_code = self._runner(request, self.default_config)
+        except SystemExit as e:  # config errors
+            AppLogger.error(str(e))
+        except Exception as e:  # a broken job must not take the daemon down
+            AppLogger.error(f"Job {job.id} failed: {e!r}")
+        finally:
+            if request.get("metrics"):
+                AppLogger.close_metrics()
+            os.chdir(previous_cwd)
+            AppLogger.remove_handler(handler)
+            AppLogger.info(f"Job {job.id} finished with exit code {exit_code}")
+            job.messages.put({"type": "done", "job": job.id, "exit_code": exit_code})
+            job.messages.put(None)
+
+
+def submit_job(request: dict[str, Any], port: int = DEFAULT_DAEMON_PORT) -> int:
+    """``--submit``: send a job to the daemon and print its progress as it arrives.
+
+    Returns:
+        The job's exit code; 1 if the daemon is unreachable or rejects the job.
+    """
+    try:
+        connection = socket.create_connection(("127.0.0.1", port), timeout=_CONNECT_TIMEOUT_S)
+    except OSError:
+        AppLogger.error(f"No recording daemon on port {port} (start one with --serve).")
+        return 1
+    with connection:
+        connection.settimeout(None)  # a queued job may wait for minutes
+        connection.sendall((json.dumps(request) + "\n").encode("utf-8"))
+        for line in connection.makefile("rb"):
+            message = json.loads(line)
+            kind = message.get("type")
+            if kind == "log":
+                _RELAY_LOG.get(message.get("level"), AppLogger.info)(message["message"])
+            elif kind == "queued":
+                AppLogger.info(f"Job {message['job']} queued ({message['ahead']} ahead)")
+            elif kind == "error":
+                AppLogger.error(f"Daemon rejected the job: {message['message']}")
+                return 1
+            elif kind == "done":
+                return int(message["exit_code"])
+    AppLogger.error("Connection to the recording daemon closed before the job finished.")
+    return 1
@@ -2,31 +2,65 @@
 
 Flow per demo: start event server -> launch the app with the demo id and
 server port -> find its window -> record frames from ``demo_started`` to
-``demo_ended`` (saving stills on ``screenshot`` events) -> export.
+``demo_ended`` (saving stills on ``screenshot`` events) -> export. Apps that
+announce a shared-memory ``frame_buffer`` push their own frames instead of the
+window being screen-captured (``shared_frames``).
+
+Language screenshots can use the same path (``run_languages``): one app run
+per language, each still taken on the app's ``screenshot`` event - unattended,
+and with several instances running at once.
+
+Every phase of every run is timed (``PhaseTimer``); the summary ends with a
+per-run breakdown table, and the spans are written as a Chrome trace to
+``<output_dir>/demos/trace.json``.
 """
 
+import json
 import subprocess
 import tempfile
+import threading
 import time
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 
+import numpy as np
 import psutil
 
 from . import config
 from .app_logger import AppLogger
+from .capture import WindowCapture
 from .config import DemoSpec, build_launch_command, write_app_settings_file
-from .demo_server import DemoServer
-from .exporter import export_gif, export_mp4
-from .recorder import Recorder
+from .demo_server import AppExitedError, DemoEvent, DemoServer
+from .exporter import constant_rate_indices, export_gif, export_mp4_segmented
+from .frame_analysis import (
+    BORDER_SAMPLES,
+    change_index,
+    detect_static_border,
+    idle_trim,
+    prune_near_duplicates,
+    sample_indices,
+)
+from .profiling import RunProfiler
+from .recorder import FrameRecorder, MemoryBudget, Recorder
+from .report import RunReport
+from .resource_sampler import ResourceSampler
+from .shared_frames import FrameRing, SharedFrameRecorder
+from .timing import PhaseTimer
 from .window_finder import WindowFinder
 
 WINDOW_TIMEOUT_S = 30.0
 ACCEPT_TIMEOUT_S = 30.0
 EVENT_TIMEOUT_S = 60.0
 DEMO_CAP_S = 300.0
-TAIL_S = 0.5
+SHUTDOWN_ACK_S = 2.0
 EXIT_GRACE_S = 10.0
 
+# Parallel language runs share one screen: one window at a time is raised
+# and grabbed
+_capture_lock = threading.Lock()
+
 
 def _run_label(demo: DemoSpec, language: str | None) -> str:
     """Display name of one run: 'basic-math [de]', or just the name."""
@@ -36,6 +70,32 @@ def _run_label(demo: DemoSpec, language: str | None) -> str:
 class DemoCLI:
     """Runs the demos of the loaded config and reports a summary."""
 
+    def __init__(
+        self,
+        skip_unchanged: bool = False,
+        profile: bool = False,
+        memory_budget_mb: float | None = None,
+        memory_policy: str | None = None,
+    ) -> None:
+        """Initialize the runner.
+
+        Args:
+            skip_unchanged: Leave still files whose pixels did not change untouched
+            profile: Profile each demo run (cProfile + tracemalloc, recorder
+                thread included) into ``<output>/demos/profile``
+            memory_budget_mb: Frame memory cap for every demo, overriding the
+                config's ``memory_budget_mb``
+            memory_policy: What to do at the cap, overriding ``memory_policy``
+        """
+        self.timer = PhaseTimer()
+        self.skip_unchanged = skip_unchanged
+        self.profile = profile
+        self.memory_budget_mb = memory_budget_mb
+        self.memory_policy = memory_policy
+        self._profiler: RunProfiler | None = None  # of the demo run in progress
+        # save_screenshot result of every still written by any run
+        self.file_results: list[str] = []
+
     def run(self, selector: str) -> int:
         """Run one demo (by id) or all of them.
 
@@ -66,91 +126,519 @@ class DemoCLI:
 
         # A demo without languages is one run; with languages, one run per language
         runs = [(demo, lang) for demo in demos for lang in (demo.languages or (None,))]
-        failed = [_run_label(demo, lang) for demo, lang in runs if not self._run_demo(demo, lang)]
+        start = time.monotonic()
+        failed = [
+            _run_label(demo, lang) for demo, lang in runs if not self._run_profiled(demo, lang)
+        ]
+        AppLogger.metric(
+            "summary",
+            mode="demo",
+            runs=len(runs),
+            succeeded=len(runs) - len(failed),
+            failed=failed,
+            seconds=round(time.monotonic() - start, 3),
+        )
         AppLogger.info(f"\n{'=' * 50}")
         AppLogger.info(f"Demos complete: {len(runs) - len(failed)}/{len(runs)} succeeded")
         for name in failed:
             AppLogger.info(f"  FAILED: {name}")
+        if self.skip_unchanged:
+            AppLogger.info(f"  Stills: {WindowCapture.summarize_saves(self.file_results)}")
+        self._report_timing(Path(config.settings.output_dir) / "demos" / "trace.json")
         return 0 if not failed else 1
 
+    def run_languages(
+        self,
+        demo_id: int,
+        parallel: int = 1,
+        output_dir: str | None = None,
+        start_from: str | None = None,
+    ) -> int:
+        """Capture language screenshots through a demo, one app run per language.
+
+        Each run launches the demo with ``--automation-demo-language <code>``
+        and saves every ``screenshot`` event as ``<output>/<code>/<name>.png``.
+
+        Args:
+            demo_id: Demo that shows the screen(s) to capture.
+            parallel: Number of app instances running at once.
+            output_dir: Output root (defaults to the config's output_dir).
+            start_from: Optional language code to start from.
+
+        Returns:
+            Exit code (0 when every language succeeded).
+        """
+        settings = config.settings
+        codes = list(settings.language_codes)
+        if not codes:
+            AppLogger.error("Config has no 'languages' section - nothing to capture.")
+            return 1
+        demo = next((d for d in settings.demos if d.id == demo_id), None)
+        if demo is None:
+            available = ", ".join(str(d.id) for d in settings.demos) or "none"
+            AppLogger.error(f"No demo with id {demo_id} (available: {available})")
+            return 1
+        if start_from:
+            if start_from not in codes:
+                AppLogger.error(f"Unknown language code '{start_from}'")
+                AppLogger.error(f"Available codes: {', '.join(codes)}")
+                return 1
+            codes = codes[codes.index(start_from) :]
+
+        out_root = Path(output_dir or settings.output_dir)
+        AppLogger.info(
+            f"Capturing {len(codes)} languages via demo '{demo.name}' ({parallel} at a time)"
+        )
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=parallel) as pool:
+            results = list(pool.map(lambda code: self._run_language(demo, code, out_root), codes))
+        failed = [code for code, ok in zip(codes, results) if not ok]
+        AppLogger.metric(
+            "summary",
+            mode="language_demo",
+            runs=len(codes),
+            succeeded=len(codes) - len(failed),
+            failed=failed,
+            seconds=round(time.monotonic() - start, 3),
+            **WindowCapture.count_saves(self.file_results),
+        )
+        AppLogger.info(f"\n{'=' * 50}")
+        AppLogger.info(f"Languages complete: {len(codes) - len(failed)}/{len(codes)} succeeded")
+        for code in failed:
+            AppLogger.info(f"  FAILED: {code}")
+        AppLogger.info(f"  {WindowCapture.summarize_saves(self.file_results)}")
+        AppLogger.info(f"  Output: {out_root.absolute()}")
+        self._report_timing(out_root / "trace.json")
+        return 0 if not failed else 1
+
+    def _report_timing(self, trace_path: Path) -> None:
+        """Log the per-run phase table and write the Chrome trace file."""
+        lines = self.timer.breakdown_lines()
+        if not lines:
+            return
+        AppLogger.info("\nPhase timing (s):")
+        for line in lines:
+            AppLogger.info(f"  {line}")
+        self.timer.write_chrome_trace(trace_path)
+        AppLogger.info(f"  Trace: {trace_path}")
+
+    def _run_profiled(self, demo: DemoSpec, language: str | None) -> bool:
+        """``_run_demo``, under a RunProfiler when profiling is on."""
+        if not self.profile:
+            return self._run_demo(demo, language)
+        self._profiler = RunProfiler(_run_label(demo, language))
+        try:
+            return self._run_demo(demo, language)
+        finally:
+            self._profiler.save(Path(config.settings.output_dir) / "demos" / "profile")
+            self._profiler = None
+
+    @contextmanager
+    def _phase(self, label: str, phase: str) -> Iterator[None]:
+        """Time a phase of a demo run, and profile it when profiling is on."""
+        with self.timer.span(label, phase):
+            if self._profiler is None:
+                yield
+            else:
+                with self._profiler.phase(phase):
+                    yield
+
     def _run_demo(self, demo: DemoSpec, language: str | None = None) -> bool:
-        launch = config.settings.launch
-        assert launch is not None  # config validation guarantees this
         out_dir = Path(config.settings.output_dir) / "demos" / demo.name
         if language:
             out_dir = out_dir / language
-        AppLogger.info(f"\n--- Demo {demo.id} '{_run_label(demo, language)}' ---")
+        label = _run_label(demo, language)
+        AppLogger.info(f"\n--- Demo {demo.id} '{label}' ---")
 
-        texts_file: Path | None = None
-        if language and config.settings.texts_dir:
-            # Absolute: the app may run with a different cwd (launch.cwd)
-            texts_file = (Path(config.settings.texts_dir) / f"{language}.json").resolve()
-            if not texts_file.is_file():
-                AppLogger.error(
-                    f"Texts file missing for '{_run_label(demo, language)}': {texts_file}"
+        texts_file = self._texts_file(language)
+        if texts_file is not None and not texts_file.is_file():
+            AppLogger.error(f"Texts file missing for '{label}': {texts_file}")
+            return False
+
+        with self._phase(label, "launch"):
+            server, proc, settings_file = self._launch(demo, language, texts_file)
+        recorder: FrameRecorder | None = None
+        # The app's CPU/memory/threads/handles, sampled from launch to the end of the tail
+        sampler = ResourceSampler(proc.pid)
+        sampler.start()
+        try:
+            with self._phase(label, "connect"):
+                connected = self._accept_connection(server)
+            if not connected:
+                return False
+            sampler.mark("connected")
+
+            # The app reports its own native window handle (or the frame ring
+            # it pushes frames through) in demo_started - no window-finding
+            # heuristics, no ambiguity
+            with self._phase(label, "wait_started"):
+                started = self._wait_for_started(server)
+            if started is None:
+                return False
+            sampler.mark("demo_started")
+            if started.frame_buffer is not None:
+                recorder = self._attach_frame_buffer(started, demo, out_dir)
+                if recorder is None:
+                    return False
+            else:
+                assert started.hwnd is not None  # checked by _wait_for_started
+                recorder = self._prepare_window(started.hwnd, demo, label, out_dir)
+
+            with self._phase(label, "record"):
+                if self._profiler is not None:
+                    self._profiler.profile_thread(recorder)
+                # Tool-side clock: frames pushed by the app carry the app's timestamps
+                recording_started = time.perf_counter()
+                recorder.start()
+                active = recorder
+                ok = self._event_loop(
+                    server, lambda event: self._handle_event(event, active, sampler)
                 )
+                sampler.mark("demo_ended" if ok else "aborted")
+
+            with self._phase(label, "tail"):
+                # Keep the final state in the recording
+                self._record_tail(server, recorder, demo.tail)
+                recorder.stop()
+                recorder.join(timeout=5)
+            sampler.stop()
+            # Right after the tail, while a cooperating app still waits for the
+            # command; the app exits while the recording is analyzed and exported
+            with self._phase(label, "shutdown"):
+                self._shutdown(server, proc)
+            self.file_results.extend(recorder.still_results.elements())
+            report = RunReport(label)
+            if demo.auto_crop:
+                with self._phase(label, "auto_crop"):
+                    self._auto_crop(recorder, report)
+            if demo.max_idle is not None:
+                with self._phase(label, "idle_trim"):
+                    self._trim_idle(demo.max_idle, recorder, report)
+            # Export even after an abnormal end - partial recordings help debugging
+            with self._phase(label, "export"):
+                try:
+                    written = self._export(demo, recorder, out_dir, report)
+                except RuntimeError as e:  # ffmpeg failed, or the MP4 did not verify
+                    AppLogger.error(f"Export of '{label}' failed: {e}")
+                    ok, written = False, 0
+            sampler.join(timeout=5)
+            self._report_resources(label, sampler, recording_started, report)
+            stats = {
+                "ok": ok and bool(recorder.frames),
+                "frames": len(recorder.frames),
+                "dropped": recorder.dropped if isinstance(recorder, SharedFrameRecorder) else 0,
+                "stills": len(recorder.saved_stills),
+                "fps": recorder.export_fps(),
+                "bytes_written": written,
+            }
+            if isinstance(recorder, Recorder):
+                stats["bytes_not_captured"] = recorder.capture_report()["bytes_skipped"]
+            AppLogger.metric("recording", run=label, **stats)
+            self._write_report(report, recorder, stats, out_dir)
+            return ok and bool(recorder.frames)
+        finally:
+            sampler.stop()
+            if recorder is not None:
+                recorder.frames.close()  # deletes a spill file
+            self._finish(label, server, proc, settings_file)
+
+    @staticmethod
+    def _report_resources(
+        label: str, sampler: ResourceSampler, recording_started: float, report: RunReport
+    ) -> None:
+        """Add the app's resource usage to the report, aligned with the video.
+
+        Args:
+            recording_started: ``perf_counter`` time the recorder was started at
+        """
+        resources = sampler.report(recording_started)
+        report.add("resources", resources)
+        peak = resources["peak"]
+        AppLogger.metric(
+            "resources", run=label, mean_cpu_percent=resources["mean_cpu_percent"], **peak
+        )
+        AppLogger.info(
+            f"App resources: peak {peak['rss_bytes'] / (1024 * 1024):.0f} MiB RSS, "
+            f"{peak['cpu_percent']:.0f}% CPU (mean {resources['mean_cpu_percent']:.0f}%), "
+            f"{peak['threads']} threads, {peak['handles']} handles"
+        )
+
+    @staticmethod
+    def _auto_crop(recorder: FrameRecorder, report: RunReport) -> None:
+        """Trim edges that never changed from the whole recording before export.
+
+        The inset is detected once, on frames sampled over the recording, and
+        applied to every frame; stills are already saved and keep their size.
+        A recording whose frames changed size is left uncropped.
+        """
+        frames = recorder.frames
+        indices = sample_indices(len(frames), BORDER_SAMPLES)
+        shapes: set[tuple[int, ...]] = set()
+
+        def arrays() -> Iterator[np.ndarray]:
+            for pixels in frames.arrays(indices):
+                shapes.add(pixels.shape)
+                yield pixels
+
+        inset = detect_static_border(arrays())
+        frames.crop(inset)
+        # What to pin as the demo's "crop": recorder crops add to the one in
+        # effect (the configured crop, unless it did not fit the window)
+        configured = recorder.crop if isinstance(recorder, Recorder) else (0, 0, 0, 0)
+        pinned = dict(
+            zip(("top", "right", "bottom", "left"), (a + b for a, b in zip(configured, inset)))
+        )
+        report.add(
+            "auto_crop", {"detected": list(inset), "sampled_frames": len(indices), "crop": pinned}
+        )
+        if any(inset):
+            AppLogger.info(
+                f"Auto-crop: trimmed {inset} (top, right, bottom, left) from {len(frames)} "
+                f'frames; pin it with "crop": {json.dumps(pinned)}'
+            )
+        elif len(shapes) > 1:
+            AppLogger.info("Auto-crop: skipped, the frame size changed during the recording")
+        else:
+            AppLogger.info(f"Auto-crop: no static border found in {len(indices)} sampled frames")
+
+    @staticmethod
+    def _trim_idle(max_idle: float, recorder: FrameRecorder, report: RunReport) -> None:
+        """Cut still picture beyond ``max_idle`` seconds before the first and
+        after the last change from the export.
+
+        The change index it is based on (one value per recorded frame, before
+        trimming) goes to the report.
+        """
+        frames = recorder.frames
+        index = change_index(frames.arrays())
+        timestamps = frames.timestamps
+        section: dict = {"values": [round(value, 4) for value in index], "trimmed": None}
+        if index:
+            start, stop = idle_trim(index, timestamps, max_idle)
+            if (start, stop) != (0, len(index)):
+                head_s = timestamps[start] - timestamps[0]
+                tail_s = timestamps[-1] - timestamps[stop - 1]
+                section["trimmed"] = {
+                    "head_frames": start,
+                    "head_seconds": round(head_s, 3),
+                    "tail_frames": len(index) - stop,
+                    "tail_seconds": round(tail_s, 3),
+                }
+                frames.trim(start, stop)
+                AppLogger.info(
+                    f"Idle trim: cut {head_s:.1f}s ({start} frames) before the first change "
+                    f"and {tail_s:.1f}s ({len(index) - stop} frames) after the last"
+                )
+        report.add("change_index", section)
+
+    @staticmethod
+    def _write_report(
+        report: RunReport, recorder: FrameRecorder, stats: dict, out_dir: Path
+    ) -> None:
+        """Write the run's report.json and log the memory budget outcome."""
+        report.add("recording", stats)
+        report.add("memory", recorder.memory_report())
+        if isinstance(recorder, Recorder):
+            capture = recorder.capture_report()
+            report.add("capture", capture)
+            if capture["pixels_skipped_per_frame"]:
+                AppLogger.info(
+                    f"Crop kept {capture['pixels_skipped_per_frame']} px per frame out of the "
+                    f"grab ({capture['bytes_skipped'] / (1024 * 1024):.1f} MiB over "
+                    f"{recorder.frames_captured} frames)"
+                )
+        path = report.write(out_dir)
+        if recorder.budget is not None:
+            mib = recorder.peak_bytes / (1024 * 1024)
+            AppLogger.info(
+                f"Memory: peak {mib:.1f} MiB of {recorder.budget.limit_bytes / (1024 * 1024):.0f}"
+                f" MiB budget, policy '{recorder.budget.policy}'"
+            )
+            for event in recorder.budget_events:
+                AppLogger.info(f"  {event.describe()}")
+        AppLogger.info(f"  {path}")
+
+    def _budget(self, demo: DemoSpec) -> MemoryBudget | None:
+        """The demo's memory budget, with command-line overrides applied."""
+        limit_mb = self.memory_budget_mb or demo.memory_budget_mb
+        if limit_mb is None:
+            return None
+        return MemoryBudget(
+            limit_bytes=int(limit_mb * 1024 * 1024),
+            policy=self.memory_policy or demo.memory_policy,
+        )
+
+    def _run_language(self, demo: DemoSpec, language: str, out_root: Path) -> bool:
+        """One language-screenshot run: launch, save each requested still, quit."""
+        label = _run_label(demo, language)
+        texts_file = self._texts_file(language)
+        if texts_file is not None and not texts_file.is_file():
+            AppLogger.error(f"Texts file missing for '{label}': {texts_file}")
+            return False
+
+        with self.timer.span(label, "launch"):
+            server, proc, settings_file = self._launch(demo, language, texts_file)
+        try:
+            with self.timer.span(label, "connect"):
+                connected = self._accept_connection(server)
+            if not connected:
+                return False
+            with self.timer.span(label, "wait_started"):
+                started = self._wait_for_started(server)
+            if started is None:
+                return False
+            if started.hwnd is None:
+                AppLogger.error(f"'{label}': language screenshots need 'hwnd' in demo_started.")
                 return False
+            hwnd = started.hwnd
+            WindowFinder.move_into_work_area(hwnd)
+
+            saved: list[str] = []
+
+            def save_still(event: DemoEvent) -> None:
+                if event.event != "screenshot" or not event.name:
+                    return
+                path = out_root / language / f"{event.name}.png"
+                try:
+                    self._save_language_still(hwnd, demo, path)
+                except RuntimeError as e:
+                    AppLogger.error(f"'{label}': capturing '{event.name}' failed: {e}")
+                    return
+                saved.append(event.name)
+
+            with self.timer.span(label, "capture"):
+                ok = self._event_loop(server, save_still)
+            with self.timer.span(label, "shutdown"):
+                self._shutdown(server, proc)
+            if not saved:
+                AppLogger.error(f"'{label}': the app requested no screenshot.")
+            return ok and bool(saved)
+        finally:
+            self._finish(label, server, proc, settings_file)
+
+    def _save_language_still(self, hwnd: int, demo: DemoSpec, path: Path) -> None:
+        """Raise the window above any parallel instance, grab it, and save it."""
+        with _capture_lock:
+            WindowFinder.set_topmost(hwnd)
+            WindowFinder.wait_for_composition(hwnd, timeout=demo.settle_timeout)
+            image = WindowCapture.capture_window(hwnd)
+        # Comparing/encoding the PNG does not need the screen
+        result = WindowCapture.save_screenshot(image, path, self.skip_unchanged)
+        self.file_results.append(result)  # list.append is thread-safe
+        AppLogger.info(f"  {path} ({result})")
+        AppLogger.metric(
+            "still",
+            path=str(path),
+            result=result,
+            bytes_written=0 if result == "unchanged" else path.stat().st_size,
+        )
+
+    @staticmethod
+    def _texts_file(language: str | None) -> Path | None:
+        """The language's demo-texts file, if the config has a texts_dir."""
+        if not language or not config.settings.texts_dir:
+            return None
+        # Absolute: the app may run with a different cwd (launch.cwd)
+        return (Path(config.settings.texts_dir) / f"{language}.json").resolve()
 
+    @staticmethod
+    def _launch(
+        demo: DemoSpec, language: str | None, texts_file: Path | None
+    ) -> tuple[DemoServer, subprocess.Popen, Path | None]:
+        """Start the event server and the app; the server watches the process."""
+        launch = config.settings.launch
+        assert launch is not None  # config validation guarantees this
         server = DemoServer()
         settings_file = write_app_settings_file(demo, Path(tempfile.gettempdir()))
         cmd = build_launch_command(launch, demo, server.port, settings_file, language, texts_file)
         AppLogger.info(f"Launching: {' '.join(cmd)}")
         proc = subprocess.Popen(cmd, cwd=launch.cwd)
-        recorder: Recorder | None = None
-        try:
-            if not self._accept_connection(server, proc):
-                return False
+        server.watch_process(proc)
+        return server, proc, settings_file
 
-            # The app reports its own native window handle in demo_started -
-            # no window-finding heuristics, no ambiguity
-            hwnd = self._wait_for_started_hwnd(server, proc)
-            if hwnd is None:
-                return False
+    def _finish(
+        self,
+        label: str,
+        server: DemoServer,
+        proc: subprocess.Popen,
+        settings_file: Path | None,
+    ) -> None:
+        """Kill the app if it is still running (a failed run, or one ignoring
+        ``shutdown``) and release the run's socket and settings file."""
+        self._kill(proc)
+        server.close()
+        if settings_file is not None:
+            settings_file.unlink(missing_ok=True)
+
+    def _prepare_window(self, hwnd: int, demo: DemoSpec, label: str, out_dir: Path) -> Recorder:
+        """Raise and settle the app window; return a screen recorder for it."""
+        with self._phase(label, "prepare"):
             AppLogger.info(f"Recording window '{WindowFinder.get_window_title(hwnd)}'")
             WindowFinder.bring_to_foreground(hwnd)
             WindowFinder.move_into_work_area(hwnd)
-            # Screen-region capture grabs whatever is drawn at the window's rect, so a
-            # previous run's still-closing window (same app, same position) could bleed
-            # in. Pin the target on top — SetForegroundWindow is unreliable, HWND_TOPMOST
-            # via SetWindowPos is not — so it always sits above any leftover window.
+            # Screen-region capture grabs whatever is drawn at the window's rect, so
+            # a previous run's still-closing window (same app, same position) could
+            # bleed in. Pin the target on top — SetForegroundWindow is unreliable,
+            # HWND_TOPMOST via SetWindowPos is not — so it always sits above any
+            # leftover window.
             WindowFinder.set_topmost(hwnd)
-            time.sleep(0.3)
+            settled = WindowFinder.wait_for_composition(hwnd, timeout=demo.settle_timeout)
+            AppLogger.info(f"Window settled in {settled * 1000:.0f} ms")
+        return Recorder(
+            hwnd,
+            demo.fps,
+            stills_dir=out_dir,
+            crop=demo.crop,
+            mode=demo.capture,
+            skip_unchanged=self.skip_unchanged,
+            budget=self._budget(demo),
+        )
 
-            recorder = Recorder(hwnd, demo.fps, stills_dir=out_dir, crop=demo.crop)
-            recorder.start()
-            ok = self._event_loop(server, proc, recorder)
-
-            if recorder.is_alive():
-                time.sleep(TAIL_S)  # keep the final state in the recording
-            recorder.stop()
-            recorder.join(timeout=5)
-            # Export even after an abnormal end - partial recordings help debugging
-            self._export(demo, recorder, out_dir)
-            return ok and bool(recorder.frames)
-        finally:
-            server.close()
-            self._shutdown(proc)
-            if settings_file is not None:
-                settings_file.unlink(missing_ok=True)
+    def _attach_frame_buffer(
+        self, started: DemoEvent, demo: DemoSpec, out_dir: Path
+    ) -> SharedFrameRecorder | None:
+        """Attach to the app's frame ring; None (logged) if it cannot be opened."""
+        spec = started.frame_buffer
+        assert spec is not None
+        try:
+            ring = FrameRing(spec)
+        except (OSError, ValueError) as e:
+            AppLogger.error(f"Cannot attach to frame buffer '{spec.shm}': {e}")
+            return None
+        AppLogger.info(
+            f"Recording frames pushed by the app ({spec.width}x{spec.height}, {spec.slots} slots)"
+        )
+        return SharedFrameRecorder(
+            ring,
+            demo.fps,
+            stills_dir=out_dir,
+            skip_unchanged=self.skip_unchanged,
+            budget=self._budget(demo),
+        )
 
     @staticmethod
-    def _wait_for_started_hwnd(server: DemoServer, proc: subprocess.Popen) -> int | None:
-        """Wait for demo_started and return the window handle it reports."""
+    def _wait_for_started(server: DemoServer) -> DemoEvent | None:
+        """Wait for a usable demo_started: a valid hwnd, or a frame buffer."""
         deadline = time.monotonic() + WINDOW_TIMEOUT_S
-        while time.monotonic() < deadline:
-            if proc.poll() is not None:
+        while (remaining := deadline - time.monotonic()) > 0:
+            try:
+                event = server.next_event(timeout=remaining)
+            except AppExitedError:
                 AppLogger.error("App exited before sending demo_started.")
                 return None
-            try:
-                event = server.next_event(timeout=1.0)
             except ConnectionError as e:
                 AppLogger.error(str(e))
                 return None
             if event is None:
-                continue
+                break
             if event.event != "demo_started":
                 AppLogger.info(f"Ignoring '{event.event}' before demo_started")
                 continue
+            if event.frame_buffer is not None:
+                AppLogger.info(
+                    f"Demo {event.demo} started; frame buffer '{event.frame_buffer.shm}'"
+                )
+                return event
             if event.hwnd is None:
                 AppLogger.error(
                     "demo_started carries no 'hwnd' - the app must report its window handle "
@@ -161,79 +649,221 @@ class DemoCLI:
                 AppLogger.error(f"Reported hwnd {event.hwnd} is not a valid window.")
                 return None
             AppLogger.info(f"Demo {event.demo} started; window hwnd {event.hwnd}")
-            return event.hwnd
+            return event
         AppLogger.error("Timed out waiting for demo_started.")
         return None
 
     @staticmethod
-    def _accept_connection(server: DemoServer, proc: subprocess.Popen) -> bool:
-        deadline = time.monotonic() + ACCEPT_TIMEOUT_S
-        while time.monotonic() < deadline:
-            if proc.poll() is not None:
-                AppLogger.error("App exited before connecting to the demo port.")
-                return False
-            if server.accept(timeout=1.0):
+    def _accept_connection(server: DemoServer) -> bool:
+        try:
+            if server.accept(timeout=ACCEPT_TIMEOUT_S):
                 return True
+        except AppExitedError:
+            AppLogger.error("App exited before connecting to the demo port.")
+            return False
         AppLogger.error("App never connected to the demo port.")
         return False
 
     @staticmethod
-    def _event_loop(server: DemoServer, proc: subprocess.Popen, recorder: Recorder) -> bool:
-        """Handle events until demo_ended; True on a clean end."""
+    def _event_loop(server: DemoServer, handle: Callable[[DemoEvent], None]) -> bool:
+        """Pass events to ``handle`` until demo_ended; True on a clean end."""
         cap = time.monotonic() + DEMO_CAP_S
         last_event = time.monotonic()
         while True:
+            # Wake at whichever limit comes first; the server itself wakes on
+            # every event and on app exit
             now = time.monotonic()
-            if now > cap:
+            if now >= cap:
                 AppLogger.error(f"Demo exceeded {DEMO_CAP_S:.0f}s cap; aborting.")
                 return False
-            if now - last_event > EVENT_TIMEOUT_S:
+            if now - last_event >= EVENT_TIMEOUT_S:
                 AppLogger.error(f"No demo event for {EVENT_TIMEOUT_S:.0f}s; aborting.")
                 return False
-            if proc.poll() is not None:
+            try:
+                event = server.next_event(timeout=min(cap, last_event + EVENT_TIMEOUT_S) - now)
+            except AppExitedError:
                 AppLogger.error("App exited before sending demo_ended.")
                 return False
-            try:
-                event = server.next_event(timeout=1.0)
             except ConnectionError as e:
                 AppLogger.error(str(e))
                 return False
             if event is None:
                 continue
             last_event = time.monotonic()
-            if event.event == "screenshot" and event.name:
-                recorder.request_still(event.name)
-            elif event.event == "demo_ended":
+            if event.event == "demo_ended":
                 AppLogger.info("Demo ended.")
                 return True
+            handle(event)
+
+    @staticmethod
+    def _handle_event(
+        event: DemoEvent, recorder: FrameRecorder, sampler: ResourceSampler | None = None
+    ) -> None:
+        """Apply a mid-recording event (still request, pushed frame) to the recorder,
+        and put still requests on the resource sampler's timeline."""
+        if event.event == "screenshot" and event.name:
+            recorder.request_still(event.name)
+            if sampler is not None:
+                sampler.mark(f"screenshot:{event.name}")
+        elif event.event == "frame_dirty" and isinstance(recorder, Recorder):
+            recorder.notify_dirty()
+        elif event.event == "frame" and isinstance(recorder, SharedFrameRecorder):
+            assert event.index is not None  # parse_event_line guarantees this
+            recorder.push_frame(event.index, event.timestamp)
+
+    @staticmethod
+    def _record_tail(server: DemoServer, recorder: FrameRecorder, seconds: float) -> None:
+        """Keep recording ``seconds`` past demo_ended, still handling the app's events.
+
+        Ends early if the recorder stops on its own (e.g. the window closed) or
+        the app disconnects - nothing more can arrive then.
+        """
+        deadline = time.monotonic() + seconds
+        while recorder.is_alive() and (remaining := deadline - time.monotonic()) > 0:
+            try:
+                event = server.next_event(timeout=remaining)
+            except ConnectionError:
+                return
+            if event is not None:
+                DemoCLI._handle_event(event, recorder)
 
     @staticmethod
-    def _export(demo: DemoSpec, recorder: Recorder, out_dir: Path) -> None:
+    def _export(demo: DemoSpec, recorder: FrameRecorder, out_dir: Path, report: RunReport) -> int:
+        """Export the recording in the demo's formats.
+
+        Returns:
+            Bytes written: exported files plus the stills saved while recording.
+        """
+        stills = [out_dir / f"{name}.png" for name in recorder.saved_stills]
+        written = sum(path.stat().st_size for path in stills if path.is_file())
         if not recorder.frames:
             AppLogger.error("No frames captured; nothing to export.")
-            return
-        timestamps = [t for t, _ in recorder.frames]
-        images = [img for _, img in recorder.frames]
-        AppLogger.info(f"Captured {len(images)} frames; exporting {', '.join(demo.formats)}...")
+            return written
+        frames = recorder.frames
+        timestamps = frames.timestamps
+        AppLogger.info(f"Captured {len(frames)} frames; exporting {', '.join(demo.formats)}...")
+        # Frames are streamed from the store: a spilled recording is read back
+        # one frame at a time instead of being loaded whole. MP4 takes the pixel
+        # arrays as they are; only the GIF encoder needs PIL images
         if "gif" in demo.formats:
-            export_gif(images, timestamps, out_dir / "demo.gif")
+            keep = None
+            if demo.gif_prune_pixels is not None:
+                keep = DemoCLI._prune_gif_frames(demo.gif_prune_pixels, recorder, report)
+            export_gif(frames.images(keep), timestamps, out_dir / "demo.gif", keep)
+            written += (out_dir / "demo.gif").stat().st_size
             AppLogger.info(f"  {out_dir / 'demo.gif'}")
         if "mp4" in demo.formats:
-            export_mp4(images, demo.fps, out_dir / "demo.mp4")
-            AppLogger.info(f"  {out_dir / 'demo.mp4'}")
-        for name in recorder.saved_stills:
-            AppLogger.info(f"  {out_dir / f'{name}.png'}")
+            fps = recorder.export_fps()
+            indices: Sequence[int] = range(len(frames))
+            if isinstance(recorder, Recorder) and recorder.mode == "dirty":
+                # Variable-rate capture: hold each frame for its real duration
+                indices = constant_rate_indices(timestamps, fps)
+            mp4 = demo.mp4
+            started = time.monotonic()
+            segments = export_mp4_segmented(
+                frames.arrays,
+                indices,
+                fps,
+                out_dir / "demo.mp4",
+                mp4.segments,
+                crf=mp4.crf,
+                preset=mp4.preset,
+                tune=mp4.tune,
+            )
+            report.add(
+                "mp4",
+                {
+                    "segments": segments,
+                    "frames": len(indices),
+                    "encode_seconds": round(time.monotonic() - started, 3),
+                    "crf": mp4.crf,
+                    "preset": mp4.preset,
+                    "tune": mp4.tune,
+                },
+            )
+            written += (out_dir / "demo.mp4").stat().st_size
+            AppLogger.info(f"  {out_dir / 'demo.mp4'} ({len(indices)} frames verified)")
+        for path in stills:
+            AppLogger.info(f"  {path}")
+        return written
 
     @staticmethod
-    def _shutdown(proc: subprocess.Popen) -> None:
+    def _prune_gif_frames(
+        max_changed_px: int, recorder: FrameRecorder, report: RunReport
+    ) -> list[int]:
+        """Pick the GIF frames to keep (near-duplicates merged into their
+        predecessor) and report how much was left out."""
+        frames = recorder.frames
+        sizes: list[int] = []
+
+        def arrays() -> Iterator[np.ndarray]:
+            for pixels in frames.arrays():
+                sizes.append(pixels.nbytes)
+                yield pixels
+
+        keep = prune_near_duplicates(arrays(), max_changed_px)
+        removed = len(frames) - len(keep)
+        # Raw RGB of the dropped frames: what the encoder did not process, not
+        # the (much smaller, compressed) difference in GIF size
+        skipped = sum(sizes) - sum(sizes[i] for i in keep)
+        report.add(
+            "gif_prune",
+            {
+                "max_changed_px": max_changed_px,
+                "frames_kept": len(keep),
+                "frames_removed": removed,
+                "pixel_bytes_skipped": skipped,
+            },
+        )
+        AppLogger.info(
+            f"GIF pruning: {removed} of {len(frames)} frames merged into their predecessor "
+            f"({skipped / (1024 * 1024):.1f} MiB of raw pixels skipped)"
+        )
+        return keep
+
+    @staticmethod
+    def _shutdown(server: DemoServer, proc: subprocess.Popen) -> None:
+        """Ask the app to quit and wait for it; log how long it took.
+
+        An app still running after ``EXIT_GRACE_S`` is left to ``_finish``, which
+        kills it.
+        """
+        if proc.poll() is not None:
+            AppLogger.info("App had already exited.")
+            return
+        start = time.monotonic()
+        acknowledged = server.send_command("shutdown") and DemoCLI._wait_for_exiting(server)
         try:
             proc.wait(timeout=EXIT_GRACE_S)
-            return
+            how = "after acknowledging shutdown" if acknowledged else "on its own"
+            AppLogger.info(f"App exited {how} in {(time.monotonic() - start) * 1000:.0f} ms")
         except subprocess.TimeoutExpired:
-            AppLogger.info("App did not exit on its own; killing it.")
+            AppLogger.info(f"App did not exit within {EXIT_GRACE_S:.0f}s.")
+
+    @staticmethod
+    def _kill(proc: subprocess.Popen) -> None:
+        """Kill the app and its children if it is still running."""
+        if proc.poll() is not None:
+            return
+        AppLogger.info("Killing the app.")
         try:
             for child in psutil.Process(proc.pid).children(recursive=True):
                 child.kill()
         except psutil.NoSuchProcess:
             pass
         proc.kill()
+
+    @staticmethod
+    def _wait_for_exiting(server: DemoServer) -> bool:
+        """Wait briefly for the app's ``exiting`` ack; False for apps without the handshake."""
+        deadline = time.monotonic() + SHUTDOWN_ACK_S
+        while (remaining := deadline - time.monotonic()) > 0:
+            try:
+                event = server.next_event(timeout=remaining)
+            except ConnectionError:
+                return False  # includes AppExitedError: gone without acknowledging
+            if event is None:
+                return False
+            if event.event == "exiting":
+                return True
+        return False
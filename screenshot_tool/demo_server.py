@@ -1,17 +1,56 @@
 """Localhost TCP server receiving demo lifecycle events from the target app.
 
 Protocol (see docs/AUTOMATION_INTERFACE.md): the app connects and sends one
-JSON object per newline-terminated UTF-8 line, client -> server only:
-``demo_started``, ``screenshot`` (named still request), ``demo_ended``.
+JSON object per newline-terminated UTF-8 line: ``demo_started``, ``screenshot``
+(named still request), ``demo_ended``, ``frame`` (a frame the app wrote into
+its shared-memory ring, see ``shared_frames``), ``frame_dirty`` (the app
+repainted; drives the ``dirty`` capture mode), and ``exiting`` (acknowledges
+a ``shutdown`` command, the one server -> client line).
+
+``AsyncDemoServer`` is the asyncio core: it multiplexes any number of app
+connections (parallel runs, multi-window apps), reads each one with its own
+stream reader, and routes events per connection and per demo id to
+``next_event`` / ``events()`` consumers. ``DemoServer`` is the blocking facade
+``DemoCLI`` uses: it runs the core on a private event-loop thread, serves one
+app connection, and wakes the moment an event arrives or the app exits.
 """
 
+import asyncio
 import json
-import socket
+import subprocess
+import threading
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Coroutine
 from dataclasses import dataclass
+from typing import Any, TypeVar
 
 from .app_logger import AppLogger
 
-KNOWN_EVENTS = ("demo_started", "screenshot", "demo_ended")
+KNOWN_EVENTS = (
+    "demo_started",
+    "screenshot",
+    "demo_ended",
+    "frame",
+    "frame_dirty",
+    "exiting",
+)
+# Longest accepted protocol line; a longer one drops that connection
+_MAX_LINE_BYTES = 1024 * 1024
+_READ_CHUNK_BYTES = 64 * 1024
+# After the app exits, how long its last lines may take to arrive
+_EXIT_DRAIN_S = 0.5
+
+_T = TypeVar("_T")
+
+
+@dataclass(frozen=True)
+class FrameBufferSpec:
+    """Shared-memory frame ring an app announces in ``demo_started``."""
+
+    shm: str
+    width: int
+    height: int
+    slots: int
 
 
 @dataclass(frozen=True)
@@ -22,13 +61,32 @@ class DemoEvent:
     demo: int | None
     name: str | None
     hwnd: int | None
+    # demo_started only: the app pushes its own frames through this ring
+    frame_buffer: FrameBufferSpec | None = None
+    # frame only: running frame number and the app's capture time in seconds
+    index: int | None = None
+    timestamp: float | None = None
+
+
+def _parse_frame_buffer(data: object, line: str) -> FrameBufferSpec | None:
+    if data is None:
+        return None
+    keys = ("width", "height", "slots")
+    if (
+        not isinstance(data, dict)
+        or not isinstance(data.get("shm"), str)
+        or not all(isinstance(data.get(k), int) and data[k] > 0 for k in keys)
+    ):
+        raise ValueError(f"invalid frame_buffer: {line!r}")
+    return FrameBufferSpec(data["shm"], data["width"], data["height"], data["slots"])
 
 
 def parse_event_line(line: str) -> DemoEvent:
     """Parse one protocol line into a DemoEvent.
 
     Raises:
-        ValueError: If the line is not JSON or lacks a known 'event' key.
+        ValueError: If the line is not JSON, lacks a known 'event' key, or
+            carries a malformed frame payload.
     """
     try:
         data = json.loads(line)
@@ -36,72 +94,371 @@ def parse_event_line(line: str) -> DemoEvent:
         raise ValueError(f"not JSON: {line!r}") from e
     if not isinstance(data, dict) or data.get("event") not in KNOWN_EVENTS:
         raise ValueError(f"unknown demo event: {line!r}")
+    if data["event"] == "frame" and not isinstance(data.get("index"), int):
+        raise ValueError(f"frame event without integer 'index': {line!r}")
+    timestamp = data.get("timestamp")
     return DemoEvent(
         event=data["event"],
         demo=data.get("demo"),
         name=data.get("name"),
         hwnd=data.get("hwnd"),
+        frame_buffer=_parse_frame_buffer(data.get("frame_buffer"), line),
+        index=data.get("index"),
+        timestamp=float(timestamp) if isinstance(timestamp, (int, float)) else None,
     )
 
 
+class AppExitedError(ConnectionError):
+    """The watched app process exited while the server was waiting on it."""
+
+
+@dataclass(frozen=True)
+class RoutedEvent:
+    """An event plus the connection it arrived on and that connection's demo id."""
+
+    connection: int
+    demo: int | None
+    event: DemoEvent
+
+
+class _Connection:
+    """One app connection: its writer and its not yet consumed events."""
+
+    def __init__(self, connection_id: int, writer: asyncio.StreamWriter) -> None:
+        self.id = connection_id
+        self.writer = writer
+        # Set from the connection's demo_started; routes all its later events
+        self.demo: int | None = None
+        # (arrival sequence number, event): the number orders events across connections
+        self.pending: deque[tuple[int, RoutedEvent]] = deque()
+        self.closed = False
+
+
+class AsyncDemoServer:
+    """asyncio server multiplexing any number of app connections.
+
+    Events stay queued per connection until a consumer takes them, so nothing
+    is lost between a connection being made and someone asking for its events.
+    Each event is delivered once, to the first matching consumer.
+    """
+
+    def __init__(self, host: str = "127.0.0.1") -> None:
+        self._host = host
+        self._server: asyncio.Server | None = None
+        self._connections: dict[int, _Connection] = {}
+        self._new_connections: deque[int] = deque()
+        self._changed = asyncio.Condition()
+        self._handlers: set[asyncio.Task] = set()
+        self._seq = 0
+        self._closed = False
+
+    async def start(self) -> None:
+        """Start listening on an ephemeral localhost port."""
+        self._server = await asyncio.start_server(self._handle, self._host, 0)
+
+    @property
+    def port(self) -> int:
+        assert self._server is not None, "port before start()"
+        return int(self._server.sockets[0].getsockname()[1])
+
+    async def _notify(self) -> None:
+        async with self._changed:
+            self._changed.notify_all()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        conn = _Connection(len(self._connections) + 1, writer)
+        self._connections[conn.id] = conn
+        self._new_connections.append(conn.id)
+        task = asyncio.current_task()
+        assert task is not None
+        self._handlers.add(task)
+        await self._notify()
+        # Chunked reads, split into lines per chunk: the bytearray only ever holds
+        # one partial line plus one chunk, so large bursts parse in linear time and
+        # consumers are woken once per chunk rather than once per line.
+        buffer = bytearray()
+        try:
+            while chunk := await reader.read(_READ_CHUNK_BYTES):
+                buffer += chunk
+                *lines, partial = buffer.split(b"\n")
+                buffer = bytearray(partial)
+                queued = [self._route(conn, line) for line in lines]
+                if any(queued):
+                    await self._notify()
+                if len(buffer) > _MAX_LINE_BYTES:
+                    AppLogger.info(f"Closing demo connection {conn.id}: line too long")
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            conn.closed = True
+            writer.close()
+            self._handlers.discard(task)
+            await self._notify()
+
+    def _route(self, conn: _Connection, raw: bytearray) -> bool:
+        """Queue one protocol line on its connection; False if it was skipped."""
+        line = raw.decode("utf-8", errors="replace").strip()
+        if not line:
+            return False
+        try:
+            event = parse_event_line(line)
+        except ValueError as e:
+            AppLogger.info(f"Ignoring malformed demo event: {e}")
+            return False
+        if event.event == "demo_started" and event.demo is not None:
+            conn.demo = event.demo
+        self._seq += 1
+        conn.pending.append((self._seq, RoutedEvent(conn.id, conn.demo, event)))
+        return True
+
+    def _take(
+        self, connection: int | None, demo: int | None, limit: int | None
+    ) -> list[RoutedEvent]:
+        """Up to ``limit`` (None: all) oldest pending events matching the filters.
+
+        Raises:
+            ConnectionError: If the server is closed, or every matching
+                connection is closed with nothing left to deliver.
+        """
+        matching = [
+            c
+            for c in self._connections.values()
+            if (connection is None or c.id == connection) and (demo is None or c.demo == demo)
+        ]
+        taken: list[RoutedEvent] = []
+        while limit is None or len(taken) < limit:
+            ready = [c for c in matching if c.pending]
+            if not ready:
+                break
+            taken.append(min(ready, key=lambda c: c.pending[0][0]).pending.popleft()[1])
+        if taken:
+            return taken
+        if self._closed:
+            raise ConnectionError("demo server closed")
+        if (
+            (connection is not None or demo is not None)
+            and matching
+            and all(c.closed for c in matching)
+        ):
+            raise ConnectionError("demo app closed the event connection")
+        return taken
+
+    async def next_event(
+        self,
+        connection: int | None = None,
+        demo: int | None = None,
+        timeout: float | None = None,
+    ) -> RoutedEvent | None:
+        """Next event in arrival order, optionally only from one connection or demo.
+
+        Returns:
+            The event, or None on timeout.
+
+        Raises:
+            ConnectionError: If the matching connection(s) closed with nothing
+                pending, or the server was closed.
+        """
+        taken = await self._wait_take(connection, demo, 1, timeout)
+        return taken[0] if taken else None
+
+    async def next_events(
+        self,
+        connection: int | None = None,
+        demo: int | None = None,
+        timeout: float | None = None,
+    ) -> list[RoutedEvent]:
+        """Wait for at least one matching event, then take every pending one.
+
+        The batch form of ``next_event``: one wake-up drains a whole burst.
+
+        Returns:
+            The events in arrival order; empty on timeout.
+
+        Raises:
+            ConnectionError: If the matching connection(s) closed with nothing
+                pending, or the server was closed.
+        """
+        return await self._wait_take(connection, demo, None, timeout)
+
+    async def _wait_take(
+        self,
+        connection: int | None,
+        demo: int | None,
+        limit: int | None,
+        timeout: float | None,
+    ) -> list[RoutedEvent]:
+        async def wait() -> list[RoutedEvent]:
+            async with self._changed:
+                while not (taken := self._take(connection, demo, limit)):
+                    await self._changed.wait()
+                return taken
+
+        try:
+            return await asyncio.wait_for(wait(), timeout)
+        except asyncio.TimeoutError:
+            return []
+
+    async def events(
+        self, connection: int | None = None, demo: int | None = None
+    ) -> AsyncIterator[RoutedEvent]:
+        """Iterate matching events; ends when the matching connection(s) close
+        (or, unfiltered, when the server closes)."""
+        while True:
+            try:
+                batch = await self.next_events(connection, demo)
+            except ConnectionError:
+                return
+            for routed in batch:
+                yield routed
+
+    async def accept(self, timeout: float | None = None) -> int | None:
+        """Wait for the next new app connection.
+
+        Returns:
+            Its connection id, or None on timeout.
+        """
+
+        async def wait() -> int:
+            async with self._changed:
+                await self._changed.wait_for(lambda: bool(self._new_connections))
+                return self._new_connections.popleft()
+
+        try:
+            return await asyncio.wait_for(wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def send_command(self, connection: int, command: str) -> bool:
+        """Send a ``{"command": ...}`` line to one app connection.
+
+        Returns:
+            True if it was sent; False for an unknown or closed connection.
+        """
+        conn = self._connections.get(connection)
+        if conn is None or conn.closed:
+            return False
+        conn.writer.write(json.dumps({"command": command}).encode("utf-8") + b"\n")
+        try:
+            await conn.writer.drain()
+        except ConnectionError:
+            return False
+        return True
+
+    async def close(self) -> None:
+        """Stop listening, close every connection and wake all consumers."""
+        self._closed = True
+        if self._server is not None:
+            self._server.close()
+        for conn in self._connections.values():
+            conn.writer.close()
+        await self._notify()
+        # Closed writers end every reader; let the handlers finish cleanly
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+
+
 class DemoServer:
-    """Accepts one app connection and yields its events with timeouts."""
+    """Blocking facade over ``AsyncDemoServer`` serving one app connection.
+
+    Runs the asyncio core on a private event-loop thread; every wait returns as
+    soon as an event arrives, the timeout passes, or the watched app exits.
+    """
 
     def __init__(self) -> None:
-        self._server = socket.create_server(("127.0.0.1", 0))
-        self._conn: socket.socket | None = None
-        self._buffer = b""
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        self._server = AsyncDemoServer()
+        self._exited = asyncio.Event()
+        self._conn: int | None = None
+        # Events fetched in one batch but not yet handed out by next_event()
+        self._ready: deque[DemoEvent] = deque()
+        self._run(self._server.start())
+
+    def _run(self, coro: Coroutine[Any, Any, _T]) -> _T:
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
 
     @property
     def port(self) -> int:
-        return int(self._server.getsockname()[1])
+        return self._server.port
+
+    def watch_process(self, proc: subprocess.Popen) -> None:
+        """Wake any pending wait with ``AppExitedError`` as soon as ``proc`` exits."""
+
+        def watch() -> None:
+            proc.wait()
+            try:
+                self._loop.call_soon_threadsafe(self._exited.set)
+            except RuntimeError:
+                pass  # server already closed
+
+        threading.Thread(target=watch, daemon=True).start()
+
+    async def _until_exit(self, awaitable: Awaitable[_T], timeout: float) -> _T | None:
+        """Await with a timeout (None) that also ends when the app exits.
+
+        Raises:
+            AppExitedError: If the app exited and ``awaitable`` had nothing more.
+        """
+        task = asyncio.ensure_future(awaitable)
+        exited = asyncio.ensure_future(self._exited.wait())
+        try:
+            done, _ = await asyncio.wait(
+                {task, exited}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            if exited in done and task not in done:
+                # The app's last lines (e.g. demo_ended) may still be in flight
+                done, _ = await asyncio.wait({task}, timeout=_EXIT_DRAIN_S)
+                if task not in done or isinstance(task.exception(), ConnectionError):
+                    task.cancel()
+                    raise AppExitedError("demo app exited")
+            if task not in done:
+                task.cancel()
+                return None
+            return task.result()
+        finally:
+            exited.cancel()
 
     def accept(self, timeout: float) -> bool:
         """Wait for the app to connect.
 
         Returns:
             True once connected, False on timeout.
+
+        Raises:
+            AppExitedError: If the watched app process exited first.
         """
-        self._server.settimeout(timeout)
-        try:
-            self._conn, _ = self._server.accept()
-        except TimeoutError:
-            return False
-        return True
+        self._conn = self._run(self._until_exit(self._server.accept(), timeout))
+        return self._conn is not None
 
     def next_event(self, timeout: float) -> DemoEvent | None:
-        """Read the next event line.
+        """Read the next event of the app connection.
 
         Returns:
             The event, or None on timeout.
 
         Raises:
+            AppExitedError: If the watched app process exited.
             ConnectionError: If the app disconnected.
         """
         assert self._conn is not None, "next_event() before accept()"
-        self._conn.settimeout(timeout)
-        while True:
-            newline = self._buffer.find(b"\n")
-            if newline != -1:
-                line = self._buffer[:newline].decode("utf-8", errors="replace").strip()
-                self._buffer = self._buffer[newline + 1 :]
-                if not line:
-                    continue
-                try:
-                    return parse_event_line(line)
-                except ValueError as e:
-                    AppLogger.info(f"Ignoring malformed demo event: {e}")
-                    continue
-            try:
-                chunk = self._conn.recv(4096)
-            except TimeoutError:
-                return None
-            if not chunk:
-                raise ConnectionError("demo app closed the event connection")
-            self._buffer += chunk
+        if not self._ready:
+            batch = self._run(self._until_exit(self._server.next_events(self._conn), timeout))
+            self._ready.extend(routed.event for routed in batch or ())
+        return self._ready.popleft() if self._ready else None
+
+    def send_command(self, command: str) -> bool:
+        """Send a ``{"command": ...}`` line to the app.
+
+        Returns:
+            True if it was sent; False when not connected or the app is gone.
+        """
+        if self._conn is None:
+            return False
+        return self._run(self._server.send_command(self._conn, command))
 
     def close(self) -> None:
-        if self._conn is not None:
-            self._conn.close()
-            self._conn = None
-        self._server.close()
+        self._run(self._server.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._loop.close()
@@ -1,5 +1,10 @@
 """Export recorded window frames as animated GIF and MP4."""
 
+import itertools
+import subprocess
+import tempfile
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import numpy as np
@@ -8,6 +13,8 @@ from PIL import Image
 # GIF renderers commonly treat <20ms per frame as "unspecified"
 _MIN_FRAME_MS = 20
 _SINGLE_FRAME_MS = 100
+# Shortest MP4 segment (s of video) worth its own encoder process
+MIN_SEGMENT_S = 2
 
 
 def frame_durations_ms(timestamps: list[float]) -> list[int]:
@@ -21,32 +28,194 @@ def frame_durations_ms(timestamps: list[float]) -> list[int]:
     return deltas + [deltas[-1]]
 
 
-def export_gif(frames: list[Image.Image], timestamps: list[float], path: Path) -> None:
-    """Write frames as a looping GIF with real capture timing."""
+def constant_rate_indices(timestamps: list[float], fps: int) -> list[int]:
+    """Index of the frame on screen at each tick of a constant-rate video.
+
+    Each frame is held until the next one's timestamp, so variable-rate
+    recordings (dirty capture mode) play back at real speed.
+    """
+    if not timestamps:
+        return []
+    start = timestamps[0]
+    indices: list[int] = []
+    frame = 0
+    for tick in range(int((timestamps[-1] - start) * fps) + 1):
+        t = start + tick / fps
+        while frame + 1 < len(timestamps) and timestamps[frame + 1] <= t:
+            frame += 1
+        indices.append(frame)
+    if indices[-1] != len(timestamps) - 1:
+        indices.append(len(timestamps) - 1)
+    return indices
+
+
+def merged_durations_ms(durations: list[int], keep: Sequence[int]) -> list[int]:
+    """Durations of the kept frames, each absorbing the frames dropped after it.
+
+    ``keep`` is ascending and starts at 0, so every dropped frame has a kept
+    predecessor and the total play time is unchanged.
+    """
+    bounds = [*keep[1:], len(durations)]
+    return [sum(durations[start:end]) for start, end in zip(keep, bounds)]
+
+
+def export_gif(
+    frames: Iterable[Image.Image],
+    timestamps: list[float],
+    path: Path,
+    keep: Sequence[int] | None = None,
+) -> None:
+    """Write frames as a looping GIF with real capture timing.
+
+    ``frames`` may be a lazy iterator (e.g. frames read back from a spill).
+    With ``keep`` (indices into ``timestamps``, e.g. from near-duplicate
+    pruning) ``frames`` are only the kept frames, each shown for as long as the
+    frames it replaces.
+    """
+    durations = frame_durations_ms(timestamps)
+    if keep is not None:
+        durations = merged_durations_ms(durations, keep)
     path.parent.mkdir(parents=True, exist_ok=True)
-    frames[0].save(
+    frame_iter = iter(frames)
+    first = next(frame_iter)
+    first.save(
         path,
         save_all=True,
-        append_images=frames[1:],
-        duration=frame_durations_ms(timestamps),
+        append_images=frame_iter,
+        duration=durations,
         loop=0,
         optimize=True,
     )
 
 
-def export_mp4(frames: list[Image.Image], fps: int, path: Path) -> None:
-    """Write frames as an H.264 MP4 at the nominal capture fps."""
+def _x264_params(crf: int | None, preset: str | None, tune: str | None) -> dict:
+    """imageio writer arguments for the given x264 tuning (unset = defaults)."""
+    params: list[str] = []
+    for flag, value in (("-crf", crf), ("-preset", preset), ("-tune", tune)):
+        if value is not None:
+            params += [flag, str(value)]
+    # With an explicit CRF, imageio's quality (itself mapped to a CRF) must be off
+    return {"quality": None if crf is not None else 8, "ffmpeg_params": params}
+
+
+def export_mp4(
+    frames: Iterable[np.ndarray | Image.Image],
+    fps: int,
+    path: Path,
+    crf: int | None = None,
+    preset: str | None = None,
+    tune: str | None = None,
+) -> None:
+    """Write frames as an H.264 MP4 at the nominal capture fps.
+
+    Frames are ``(height, width, 3)`` uint8 RGB arrays (crop views are fine) or
+    PIL images. They are streamed to the encoder one at a time, so a lazy
+    iterator keeps memory flat however long the recording is. ``crf``,
+    ``preset`` and ``tune`` are passed to x264 as is.
+    """
     import imageio.v2 as imageio
 
     path.parent.mkdir(parents=True, exist_ok=True)
-    imageio.mimwrite(
+    with imageio.get_writer(
         path,
-        [np.asarray(frame.convert("RGB")) for frame in frames],
         fps=fps,
         codec="libx264",
-        quality=8,
         # x264 (4:2:0) needs even dimensions. macro_block_size=2 pads an odd
         # side by 1px instead of rescaling to a multiple of 16 (the default),
         # so captures/crops of any size export without failing.
         macro_block_size=2,
-    )
+        **_x264_params(crf, preset, tune),
+    ) as writer:
+        for frame in frames:
+            pixels = np.asarray(frame.convert("RGB")) if isinstance(frame, Image.Image) else frame
+            # The legacy (v2) writer has append_data; imageio types it as its base
+            writer.append_data(pixels)  # type: ignore[attr-defined]
+
+
+def split_segments(count: int, segments: int, min_length: int = 1) -> list[range]:
+    """Split ``range(count)`` into up to ``segments`` contiguous, near-equal
+    ranges of at least ``min_length`` (fewer when the recording is short)."""
+    segments = max(1, min(segments, count // max(1, min_length)))
+    bounds = [round(i * count / segments) for i in range(segments + 1)]
+    return [range(a, b) for a, b in itertools.pairwise(bounds) if b > a]
+
+
+def export_mp4_segmented(
+    read: Callable[[Sequence[int]], Iterable[np.ndarray]],
+    indices: Sequence[int],
+    fps: int,
+    path: Path,
+    segments: int,
+    crf: int | None = None,
+    preset: str | None = None,
+    tune: str | None = None,
+) -> int:
+    """Encode ``indices`` as time segments in parallel ffmpeg processes and
+    join them losslessly into one MP4.
+
+    Each segment is a complete H.264 stream written by its own ffmpeg (the
+    encoders run outside the GIL; one thread per segment only feeds frames).
+    The segments share every encoder setting, so ffmpeg's concat demuxer
+    joins them with ``-c copy`` - no re-encode. The result is verified by
+    decoding it and counting frames.
+
+    Args:
+        read: Returns the frames at the given indices, as ``FrameStore.arrays``
+            does; called once per segment, from worker threads
+        indices: Frames of the video in order (repeats hold a frame)
+        segments: Parallel encoders; at least ``MIN_SEGMENT_S`` of video each
+
+    Returns:
+        Number of segments encoded.
+
+    Raises:
+        RuntimeError: ffmpeg failed, or the file does not decode to
+            ``len(indices)`` frames.
+    """
+    parts = split_segments(len(indices), segments, min_length=MIN_SEGMENT_S * fps)
+    if len(parts) == 1:
+        export_mp4(read(indices), fps, path, crf, preset, tune)
+    else:
+        import imageio_ffmpeg
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory(prefix=".segments-", dir=path.parent) as tmp:
+            files = [Path(tmp) / f"{n:03d}.mp4" for n in range(len(parts))]
+            with ThreadPoolExecutor(max_workers=len(parts)) as pool:
+                futures = [
+                    pool.submit(
+                        export_mp4,
+                        read(indices[part.start : part.stop]),
+                        fps,
+                        file,
+                        crf,
+                        preset,
+                        tune,
+                    )
+                    for part, file in zip(parts, files)
+                ]
+                for future in futures:
+                    future.result()
+            listing = Path(tmp) / "segments.txt"
+            listing.write_text("".join(f"file '{f.name}'\n" for f in files), encoding="utf-8")
+            command = [imageio_ffmpeg.get_ffmpeg_exe(), "-y", "-v", "error", "-f", "concat"]
+            command += ["-safe", "0", "-i", str(listing), "-c", "copy"]
+            command += ["-movflags", "+faststart", str(path)]
+            result = subprocess.run(command, capture_output=True, text=True, check=False)
+            if result.returncode != 0:
+                raise RuntimeError(f"ffmpeg concat failed: {result.stderr.strip()}")
+    verify_mp4(path, len(indices))
+    return len(parts)
+
+
+def verify_mp4(path: Path, expected_frames: int) -> None:
+    """Decode ``path`` and check it has ``expected_frames`` frames.
+
+    Raises:
+        RuntimeError: It does not decode, or the frame count differs.
+    """
+    import imageio_ffmpeg
+
+    frames, _seconds = imageio_ffmpeg.count_frames_and_secs(path)
+    if frames != expected_frames:
+        raise RuntimeError(f"{path} plays {frames} frames, expected {expected_frames}")
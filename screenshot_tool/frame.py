@@ -0,0 +1,76 @@
+"""The recorder's frame type: one uint8 NumPy buffer plus timing metadata.
+
+A captured frame is copied exactly once, into a C-contiguous ``(height,
+width, 3)`` uint8 array. Everything after that works on the array: crops are
+slicing views over the same buffer, the MP4 encoder reads the array as is, and
+a PIL image is only built where an encoder or file writer needs one (GIF
+export, stills).
+"""
+
+import numpy as np
+from PIL import Image
+
+
+class Frame:
+    """One recorded frame; ``pixels`` may be a (crop) view into ``buffer``."""
+
+    __slots__ = ("pixels", "timestamp")
+
+    def __init__(self, pixels: np.ndarray, timestamp: float) -> None:
+        self.pixels = pixels
+        self.timestamp = timestamp
+
+    @classmethod
+    def from_image(cls, image: Image.Image, timestamp: float) -> "Frame":
+        """Copy a PIL image into a new RGB buffer - the frame's one copy."""
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        return cls(np.asarray(image), timestamp)
+
+    @classmethod
+    def from_buffer(
+        cls, data: memoryview | bytes, width: int, height: int, timestamp: float
+    ) -> "Frame":
+        """Copy top-down RGB bytes (e.g. a shared-memory slot) into a new buffer."""
+        pixels = np.frombuffer(data, dtype=np.uint8, count=width * height * 3)
+        return cls(pixels.reshape(height, width, 3).copy(), timestamp)
+
+    @property
+    def size(self) -> tuple[int, int]:
+        """(width, height), as in PIL."""
+        return self.pixels.shape[1], self.pixels.shape[0]
+
+    @property
+    def buffer(self) -> np.ndarray:
+        """The array owning the pixel memory (itself, unless this is a view)."""
+        pixels = self.pixels
+        while isinstance(pixels.base, np.ndarray):
+            pixels = pixels.base
+        return pixels
+
+    @property
+    def nbytes_held(self) -> int:
+        """Bytes this frame keeps alive: the whole buffer, even for a crop view."""
+        return self.buffer.nbytes
+
+    def crop(self, top: int, right: int, bottom: int, left: int) -> "Frame":
+        """View without the given inset; the frame itself if the inset is empty
+        or larger than the frame."""
+        if not (top or right or bottom or left):
+            return self
+        height, width = self.pixels.shape[:2]
+        if left >= width - right or top >= height - bottom:
+            return self  # inset larger than the frame; ignore rather than crash
+        return Frame(self.pixels[top : height - bottom, left : width - right], self.timestamp)
+
+    def reduce(self, factor: int) -> "Frame":
+        """A new, ``factor`` times smaller frame (box average); frees the old buffer."""
+        height, width = (n // factor for n in self.pixels.shape[:2])
+        blocks = self.pixels[: height * factor, : width * factor].reshape(
+            height, factor, width, factor, 3
+        )
+        return Frame(blocks.mean(axis=(1, 3), dtype=np.float32).astype(np.uint8), self.timestamp)
+
+    def to_image(self) -> Image.Image:
+        """PIL image for an encoder or file writer (copies the pixels)."""
+        return Image.fromarray(np.ascontiguousarray(self.pixels), "RGB")
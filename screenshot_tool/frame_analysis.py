@@ -0,0 +1,181 @@
+"""Whole-recording analyses on the recorded frame arrays (vectorized NumPy).
+
+``detect_static_border`` finds edges that never change and are a flat edge
+color (residual DWM borders, window frames) so ``auto_crop`` can trim them.
+``change_index`` measures how much each frame changed; ``idle_trim`` uses it
+to cut the still head and tail of a recording down to ``max_idle``.
+``prune_near_duplicates`` picks the frames GIF pruning keeps.
+"""
+
+from collections.abc import Iterable, Sequence
+
+import numpy as np
+
+# Frames sampled (evenly over the recording) for border detection
+BORDER_SAMPLES = 24
+# Per-channel difference still counted as "the same color" (compression/DWM noise)
+BORDER_TOLERANCE = 2
+# Longest side (px) frames are box-averaged to before diffing for the change index
+CHANGE_SIDE = 256
+# Change of a block's mean color (0-255) below which it counts as unchanged
+CHANGE_TOLERANCE = 3.0
+# Per-channel difference treated as antialiasing/compression noise by GIF pruning
+PRUNE_TOLERANCE = 8
+
+
+def sample_indices(count: int, samples: int) -> list[int]:
+    """Up to ``samples`` indices spread evenly over ``range(count)``, ends included."""
+    if count <= samples:
+        return list(range(count))
+    return sorted({round(i * (count - 1) / (samples - 1)) for i in range(samples)})
+
+
+def _leading_true(flags: np.ndarray) -> int:
+    """Number of leading True values in a 1-D bool array."""
+    return int(np.argmin(flags)) if not flags.all() else len(flags)
+
+
+def detect_static_border(
+    frames: Iterable[np.ndarray], tolerance: int = BORDER_TOLERANCE
+) -> tuple[int, int, int, int]:
+    """Tightest (top, right, bottom, left) inset of unchanging edge-colored lines.
+
+    A row or column belongs to the border when, across all ``frames``, its
+    pixels have (within ``tolerance``) zero temporal variance and match the
+    color of that side's outermost line, all along its length. Counting stops
+    at the first line that fails, so content touching an edge is never cut.
+    Rows are measured first; columns only over the rows that are left.
+
+    Args:
+        frames: ``(height, width, 3)`` uint8 arrays, e.g. a sample of a
+            recording; read one at a time
+
+    Returns:
+        The inset, or all zeros when nothing would be left of the frame or the
+        frames differ in size (a resized window, a ``downscale`` memory policy).
+    """
+    frame_iter = iter(frames)
+    first = next(frame_iter, None)
+    if first is None:
+        return 0, 0, 0, 0
+    # Running per-pixel range over time: two frame-sized buffers, however many samples
+    low, high = first.copy(), first.copy()
+    for pixels in frame_iter:
+        if pixels.shape != first.shape:
+            return 0, 0, 0, 0
+        np.minimum(low, pixels, out=low)
+        np.maximum(high, pixels, out=high)
+    static = (high - low <= tolerance).all(axis=2)  # (h, w); high >= low, no wrap
+    reference = first.astype(np.int16)
+    height, width = first.shape[:2]
+
+    def border_lines(lines: np.ndarray, still: np.ndarray) -> int:
+        # lines: (k, length, 3) outermost first; still: (k, length)
+        color = lines[0, lines.shape[1] // 2]
+        matches = (np.abs(lines - color) <= tolerance).all(axis=(1, 2))
+        return _leading_true(matches & still.all(axis=1))
+
+    top = border_lines(reference, static)
+    bottom = border_lines(reference[::-1], static[::-1])
+    if top + bottom >= height:
+        return 0, 0, 0, 0  # a blank, static recording: nothing to keep
+    # Columns only between the row borders, so a title strip across the top
+    # does not stop the side borders
+    columns = reference[top : height - bottom].transpose(1, 0, 2)
+    static_columns = static[top : height - bottom].T
+    left = border_lines(columns, static_columns)
+    right = border_lines(columns[::-1], static_columns[::-1])
+    if left + right >= width:
+        return 0, 0, 0, 0
+    return top, right, bottom, left
+
+
+def _block_means(pixels: np.ndarray, factor: int) -> np.ndarray:
+    """``factor`` x ``factor`` box averages (the frame reduced for diffing)."""
+    height, width = (n // factor for n in pixels.shape[:2])
+    blocks = pixels[: height * factor, : width * factor].reshape(height, factor, width, factor, 3)
+    return blocks.mean(axis=(1, 3), dtype=np.float32)
+
+
+def change_index(frames: Iterable[np.ndarray], tolerance: float = CHANGE_TOLERANCE) -> list[float]:
+    """Per-frame change magnitude: the share (0..1) of the picture that changed
+    since the previous frame.
+
+    Frames are box-averaged to at most ``CHANGE_SIDE`` px per side and diffed
+    block by block; a block counts as changed when a channel mean moved by more
+    than ``tolerance``. Averaging keeps small changes (a caret, one digit)
+    visible while filtering pixel noise. The first frame is 0; a frame of
+    another size than its predecessor (a ``downscale`` memory policy) is 1.
+
+    Args:
+        frames: ``(height, width, 3)`` uint8 arrays, read one at a time
+    """
+    index: list[float] = []
+    previous: np.ndarray | None = None
+    factor = 1
+    shape: tuple[int, ...] | None = None
+    for pixels in frames:
+        resized = shape is not None and pixels.shape != shape
+        if shape is None or resized:
+            factor = max(1, -(-max(pixels.shape[:2]) // CHANGE_SIDE))
+            shape = pixels.shape
+        reduced = _block_means(pixels, factor)
+        if previous is None:
+            index.append(0.0)
+        elif resized:
+            index.append(1.0)
+        else:
+            changed = (np.abs(reduced - previous) > tolerance).any(axis=2)
+            index.append(float(changed.mean()))
+        previous = reduced
+    return index
+
+
+def idle_trim(
+    index: Sequence[float], timestamps: Sequence[float], max_idle: float
+) -> tuple[int, int]:
+    """Frame range ``(start, stop)`` keeping at most ``max_idle`` seconds of the
+    still picture before the first change and after the last one.
+
+    The frame just before the first change is always kept (it is what the idle
+    head shows), as is the frame of the last change. A recording without any
+    change is kept whole.
+    """
+    changes = [i for i, value in enumerate(index) if value > 0]
+    if not changes:
+        return 0, len(index)
+    first, last = changes[0], changes[-1]
+    start = first - 1
+    while start > 0 and timestamps[first] - timestamps[start - 1] <= max_idle:
+        start -= 1
+    stop = last + 1
+    while stop < len(index) and timestamps[stop] - timestamps[last] <= max_idle:
+        stop += 1
+    return start, stop
+
+
+def prune_near_duplicates(
+    frames: Iterable[np.ndarray], max_changed_px: int, tolerance: int = PRUNE_TOLERANCE
+) -> list[int]:
+    """Indices of the frames to keep when near-duplicates are dropped.
+
+    Each frame is compared with the last kept one (not its predecessor, so
+    slow drift still adds up to a kept frame): it is dropped when at most
+    ``max_changed_px`` pixels differ by more than ``tolerance`` in any channel,
+    e.g. a blinking caret or antialiasing noise. The first frame, and any
+    frame of a new size (a downscaled recording), is kept.
+
+    Args:
+        frames: Same-size ``(height, width, 3)`` uint8 arrays, read one at a time
+    """
+    keep: list[int] = []
+    kept: np.ndarray | None = None
+    for i, pixels in enumerate(frames):
+        if kept is not None and pixels.shape == kept.shape:
+            # |a - b| in uint8 without widening: max - min never wraps
+            diff = np.maximum(pixels, kept) - np.minimum(pixels, kept)
+            if int(np.count_nonzero((diff > tolerance).any(axis=2))) <= max_changed_px:
+                continue
+        keep.append(i)
+        kept = pixels
+    return keep
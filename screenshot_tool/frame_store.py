@@ -0,0 +1,179 @@
+"""Recorded frames with byte accounting, for recordings under a memory budget.
+
+``FrameStore`` is the recorder's frame list: a sequence of ``Frame`` objects
+that also tracks the bytes its in-memory frames hold and offers the ways to
+give memory back - spill frames to a raw file on disk, downscale them, or thin
+them out. Exports read frames back one at a time through ``arrays()`` /
+``images()``, so a spilled recording never has to fit in memory again.
+"""
+
+import shutil
+import threading
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+import numpy as np
+from PIL import Image
+
+from .frame import Frame
+
+SPILL_FILE = "frames.raw"
+
+
+@dataclass(frozen=True)
+class _Spilled:
+    """Where a frame's raw RGB pixels live in the spill file."""
+
+    offset: int
+    size: tuple[int, int]
+    timestamp: float
+
+
+class FrameStore:
+    """Recorded frames, in memory or spilled to disk."""
+
+    def __init__(self) -> None:
+        self._timestamps: list[float] = []
+        self._frames: list[Frame | _Spilled] = []
+        self.bytes_held = 0  # pixel bytes of the frames still in memory
+        self.spill_dir: Path | None = None
+        self._spill: BinaryIO | None = None
+        self._spill_end = 0
+        self._spill_lock = threading.Lock()  # segment encoders read in parallel
+        # (top, right, bottom, left) cut from every frame as it is read back
+        self.inset = (0, 0, 0, 0)
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def __getitem__(self, index: int) -> Frame:
+        return self._load(self._frames[index])
+
+    def __iter__(self) -> Iterator[Frame]:
+        for i in range(len(self)):
+            yield self[i]
+
+    @property
+    def timestamps(self) -> list[float]:
+        return self._timestamps
+
+    @property
+    def spilling(self) -> bool:
+        return self._spill is not None
+
+    def append(self, frame: Frame) -> None:
+        """Add a frame; once spilling, it goes straight to disk."""
+        self._timestamps.append(frame.timestamp)
+        if self._spill is not None:
+            self._frames.append(self._write_spilled(frame))
+        else:
+            self._frames.append(frame)
+            self.bytes_held += frame.nbytes_held
+
+    def arrays(self, indices: Iterable[int] | None = None) -> Iterator[np.ndarray]:
+        """Pixel arrays in order (or at ``indices``), loading spilled frames one
+        at a time. No copies: crop views are yielded as they are.
+
+        A repeated index (held frame in a constant-rate video) is read once.
+        """
+        last_index, last = -1, None
+        for i in range(len(self)) if indices is None else indices:
+            if i != last_index or last is None:
+                last_index, last = i, self._load(self._frames[i])
+            yield last.pixels
+
+    def images(self, indices: Iterable[int] | None = None) -> Iterator[Image.Image]:
+        """Like ``arrays``, as PIL images for encoders that need them."""
+        for pixels in self.arrays(indices):
+            yield Image.fromarray(np.ascontiguousarray(pixels), "RGB")
+
+    def spill(self, directory: Path) -> int:
+        """Move every in-memory frame to ``directory``; later frames follow.
+
+        Returns:
+            Bytes freed.
+        """
+        if self._spill is None:
+            directory.mkdir(parents=True, exist_ok=True)
+            self.spill_dir = directory
+            self._spill = (directory / SPILL_FILE).open("w+b")
+        freed = self.bytes_held
+        self._frames = [self._write_spilled(f) if isinstance(f, Frame) else f for f in self._frames]
+        self.bytes_held = 0
+        return freed
+
+    def downscale(self, factor: int = 2) -> int:
+        """Shrink in-memory frames by ``factor`` per side.
+
+        Returns:
+            Bytes freed.
+        """
+        before = self.bytes_held
+        self._frames = [f.reduce(factor) if isinstance(f, Frame) else f for f in self._frames]
+        self._recount()
+        return before - self.bytes_held
+
+    def thin(self) -> int:
+        """Drop every other frame, keeping the first and the last.
+
+        Returns:
+            Bytes freed.
+        """
+        before = self.bytes_held
+        keep = list(range(0, len(self), 2))
+        if keep and keep[-1] != len(self) - 1:
+            keep.append(len(self) - 1)
+        self._timestamps = [self._timestamps[i] for i in keep]
+        self._frames = [self._frames[i] for i in keep]
+        self._recount()
+        return before - self.bytes_held
+
+    def trim(self, start: int, stop: int) -> int:
+        """Keep only the frames in ``range(start, stop)``.
+
+        Returns:
+            Bytes freed.
+        """
+        before = self.bytes_held
+        self._timestamps = self._timestamps[start:stop]
+        self._frames = self._frames[start:stop]
+        self._recount()
+        return before - self.bytes_held
+
+    def crop(self, inset: tuple[int, int, int, int]) -> None:
+        """Read every frame back without ``inset`` (a view; nothing is copied)."""
+        self.inset = inset
+
+    def close(self) -> None:
+        """Delete the spill file (spilled frames become unreadable)."""
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+        if self.spill_dir is not None:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+            self.spill_dir = None
+
+    def _recount(self) -> None:
+        self.bytes_held = sum(f.nbytes_held for f in self._frames if isinstance(f, Frame))
+
+    def _write_spilled(self, frame: Frame) -> _Spilled:
+        assert self._spill is not None
+        pixels = np.ascontiguousarray(frame.pixels)  # copies only a crop view
+        self._spill.seek(self._spill_end)
+        self._spill.write(pixels.data)
+        spilled = _Spilled(self._spill_end, frame.size, frame.timestamp)
+        self._spill_end += pixels.nbytes
+        return spilled
+
+    def _load(self, frame: Frame | _Spilled) -> Frame:
+        if isinstance(frame, Frame):
+            return frame.crop(*self.inset)
+        assert self._spill is not None, "spilled frames read after close()"
+        width, height = frame.size
+        with self._spill_lock:
+            self._spill.seek(frame.offset)
+            data = self._spill.read(width * height * 3)
+        pixels = np.frombuffer(data, dtype=np.uint8).reshape(height, width, 3)
+        return Frame(pixels, frame.timestamp).crop(*self.inset)
@@ -0,0 +1,78 @@
+"""Per-language checkpoint journal for language screenshot runs.
+
+After every language the run appends one JSON line to
+``<output_dir>/journal.jsonl``: the code, output path, SHA-256 of the written
+file, and status. ``--resume`` reads it back and retries only the languages
+that failed or whose file is missing or no longer matches its hash.
+"""
+
+import hashlib
+import json
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+JOURNAL_NAME = "journal.jsonl"
+
+
+@dataclass(frozen=True)
+class JournalEntry:
+    """Outcome of one language capture."""
+
+    code: str
+    status: str  # "ok" or "failed"
+    path: str | None = None
+    sha256: str | None = None
+    error: str | None = None
+
+
+def file_sha256(path: Path) -> str:
+    """Hex SHA-256 of a file's bytes."""
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+class CaptureJournal:
+    """Append-only JSON-lines journal; the last entry per code wins."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def start(self, resume: bool) -> None:
+        """Begin a run: keep the existing journal when resuming, else clear it."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if not resume:
+            self.path.write_text("", encoding="utf-8")
+        elif self.path.is_file():
+            content = self.path.read_bytes()
+            if content and not content.endswith(b"\n"):
+                # Terminate a line cut off by a crash so new entries stay separate
+                with self.path.open("ab") as f:
+                    f.write(b"\n")
+
+    def record(self, entry: JournalEntry) -> None:
+        """Append one entry; written immediately so a crash loses nothing."""
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(asdict(entry)) + "\n")
+
+    def entries(self) -> dict[str, JournalEntry]:
+        """Latest entry per language code; unreadable lines are skipped."""
+        if not self.path.is_file():
+            return {}
+        latest: dict[str, JournalEntry] = {}
+        for line in self.path.read_text(encoding="utf-8").splitlines():
+            try:
+                entry = JournalEntry(**json.loads(line))
+            except (ValueError, TypeError):
+                continue  # e.g. a line cut off by a crash
+            latest[entry.code] = entry
+        return latest
+
+    def completed(self) -> set[str]:
+        """Codes captured successfully whose file is still on disk, unchanged."""
+        done = set()
+        for code, entry in self.entries().items():
+            if entry.status != "ok" or not entry.path:
+                continue
+            path = Path(entry.path)
+            if path.is_file() and file_sha256(path) == entry.sha256:
+                done.add(code)
+        return done
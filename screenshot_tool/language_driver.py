@@ -0,0 +1,82 @@
+"""Select dropdown languages directly through UI Automation."""
+
+from typing import Any
+
+from .app_logger import AppLogger
+from .dropdown_reader import DropdownReader
+
+
+class LanguageDriver(DropdownReader):
+    """Selects and reads the language ComboBox via UIA patterns.
+
+    Faster and more reliable than walking the dropdown with keypresses: the
+    ComboBox wrapper is resolved once on ``connect`` and its item list cached,
+    items are selected by name or index (SelectionItem pattern), and the
+    selection is read back from the cached wrapper - no tree search per call.
+    """
+
+    def __init__(self, hwnd: int):
+        super().__init__(hwnd)
+        self._combobox: Any = None
+        self.items: list[str] = []
+
+    def connect(self) -> bool:
+        """Connect and resolve the ComboBox once.
+
+        Returns:
+            True if the ComboBox was found and lists its items
+        """
+        if not super().connect():
+            return False
+        try:
+            self._combobox = self._window.child_window(control_type="ComboBox").wrapper_object()
+            self.items = self._read_items()
+        except Exception as e:
+            AppLogger.error(f"Could not resolve the language ComboBox: {e}")
+            self._combobox = None
+            return False
+        return bool(self.items)
+
+    def _read_items(self) -> list[str]:
+        items = list(self._combobox.texts())
+        if not items:
+            # Some ComboBoxes only expose their list items while expanded
+            self._combobox.expand()
+            try:
+                items = list(self._combobox.texts())
+            finally:
+                self._combobox.collapse()
+        return [str(item) for item in items]
+
+    def select(self, item: str | int) -> bool:
+        """Select an item by display name or index and verify the selection.
+
+        Args:
+            item: Display name (e.g., "Deutsch") or index into ``items``
+
+        Returns:
+            True if the ComboBox now shows the requested item
+        """
+        expected = self.items[item] if isinstance(item, int) else item
+        try:
+            self._combobox.select(item)
+            if self._combobox.is_expanded():
+                self._combobox.collapse()
+        except Exception as e:
+            AppLogger.error(f"Selecting '{expected}' failed: {e}")
+            return False
+        selected = self.get_selected_language()
+        if selected != expected:
+            AppLogger.error(f"Selected '{expected}' but the dropdown shows '{selected}'")
+            return False
+        return True
+
+    def get_selected_language(self) -> str | None:
+        """Currently selected display name, read from the cached wrapper."""
+        if self._combobox is None:
+            return super().get_selected_language()
+        try:
+            return self._combobox.selected_text() or None
+        except Exception as e:
+            AppLogger.error(f"Error reading dropdown: {e}")
+            return None
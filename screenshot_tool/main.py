@@ -17,14 +17,21 @@ Usage:
     uv run screenshot-tool --config config/other-app.json  # Other target app
     uv run screenshot-tool --config config/app.json --demo 1    # Record demo 1
     uv run screenshot-tool --config config/app.json --demo all  # Record all demos
+    uv run screenshot-tool --config config/app.json --language-demo 2 --parallel 4
+    uv run screenshot-tool --compare baseline/  # Diff the stills against a baseline
+    uv run screenshot-tool --serve              # Keep the tool loaded for recording jobs
+    uv run screenshot-tool --config config/app.json --demo 1 --submit  # Record via the daemon
 """
 
 import argparse
 import io
 import sys
+from pathlib import Path
 
+# Only the light modules at import time: each mode below imports what it
+# needs, so --help and --list start without the automation/imaging stack
 from . import config
-from .cli import ScreenshotCLI
+from .app_logger import AppLogger
 
 
 def setup_utf8_console() -> None:
@@ -35,6 +42,15 @@ def setup_utf8_console() -> None:
         sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", errors="replace")
 
 
+def list_languages() -> None:
+    """Log all supported language codes of the configured app."""
+    names = config.settings.language_names or {}
+    AppLogger.info("Supported language codes:\n")
+    for code in config.settings.language_codes:
+        AppLogger.info(f"  {code:4} - {names.get(code, '')}")
+    AppLogger.info(f"\nTotal: {len(config.settings.language_codes)} languages")
+
+
 def main() -> int:
     """Main entry point.
 
@@ -50,6 +66,7 @@ Examples:
   uv run screenshot-tool                    # Capture all languages
   uv run screenshot-tool --list             # Show all language codes
   uv run screenshot-tool --start-from de    # Start from German
+  uv run screenshot-tool --resume           # Retry failed/missing languages only
   uv run screenshot-tool --output ./imgs    # Custom output directory
   uv run screenshot-tool --delay 0.5        # Wait 0.5s between captures
   uv run screenshot-tool --config config/other-app.json  # Other target app
@@ -72,11 +89,53 @@ Examples:
         help="Language code to start from (skips earlier languages)",
     )
 
+    parser.add_argument(
+        "--resume",
+        "-r",
+        action="store_true",
+        help="Retry only the languages the last run's journal does not record as captured",
+    )
+
+    parser.add_argument(
+        "--skip-unchanged",
+        action="store_true",
+        help="Compare with existing output files and leave pixel-identical ones untouched",
+    )
+
+    parser.add_argument(
+        "--metrics",
+        metavar="PATH",
+        help="Also append structured metrics (phases, frame counts, durations, bytes, "
+        "errors) to PATH as JSON lines",
+    )
+
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile each run (cProfile + tracemalloc) and save a .prof file and an "
+        "allocations report per run under the output directory",
+    )
+
+    parser.add_argument(
+        "--memory-budget",
+        metavar="MB",
+        type=float,
+        help="Cap on the frame memory of each demo recording in MiB (overrides the "
+        "config's memory_budget_mb)",
+    )
+
+    parser.add_argument(
+        "--memory-policy",
+        choices=config.MEMORY_POLICIES,
+        help="What a recording does at its memory budget (overrides memory_policy; default: stop)",
+    )
+
     parser.add_argument(
         "--delay",
         "-d",
         type=float,
-        help="Delay in seconds after each language change (default: from config)",
+        help="Max seconds to wait for the UI to settle after each language change "
+        "(default: from config)",
     )
 
     parser.add_argument(
@@ -89,29 +148,171 @@ Examples:
         help="Record the given demo (or all demos) of the configured app and exit",
     )
 
+    parser.add_argument(
+        "--language-demo",
+        metavar="ID",
+        type=int,
+        help="Capture language screenshots unattended: launch the given demo once per "
+        "language and save the stills it requests",
+    )
+
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run as a recording daemon: stay loaded and run --submit jobs from localhost",
+    )
+
+    parser.add_argument(
+        "--submit",
+        action="store_true",
+        help="Send the --demo run (with --config and overrides) to the running daemon "
+        "and stream its progress instead of recording in this process",
+    )
+
+    parser.add_argument(
+        "--port",
+        metavar="N",
+        type=int,
+        help="Localhost port of the recording daemon (default: 47310)",
+    )
+
+    parser.add_argument(
+        "--compare",
+        metavar="BASELINE",
+        help="Compare every still in the output directory with the same file under "
+        "BASELINE; writes heatmaps and compare.json/.html and exits 1 on differences",
+    )
+
+    parser.add_argument(
+        "--compare-threshold",
+        metavar="PCT",
+        type=float,
+        help="Share of changed pixels (%%) above which --compare reports a still as changed "
+        "(default: 0.1)",
+    )
+
+    parser.add_argument(
+        "--parallel",
+        "-p",
+        metavar="N",
+        type=int,
+        default=1,
+        help="App instances running at once with --language-demo (default: 1)",
+    )
+
     args = parser.parse_args()
 
     if args.demo and (args.list or args.start_from):
         parser.error("--demo cannot be combined with --list or --start-from")
+    if args.language_demo is not None and (args.demo or args.list):
+        parser.error("--language-demo cannot be combined with --demo or --list")
+    if args.resume and (args.demo or args.language_demo is not None or args.list):
+        parser.error("--resume applies to language mode only")
+    if args.profile and (args.language_demo is not None or args.list):
+        parser.error("--profile applies to language mode and --demo only")
+    if args.memory_budget is not None and args.memory_budget <= 0:
+        parser.error("--memory-budget must be greater than 0")
+    if args.compare and (args.demo or args.language_demo is not None or args.list):
+        parser.error("--compare cannot be combined with --demo, --language-demo or --list")
+    if args.compare_threshold is not None and (args.compare_threshold < 0 or not args.compare):
+        parser.error("--compare-threshold needs --compare and a value >= 0")
+    if args.serve and (
+        args.demo or args.language_demo is not None or args.list or args.compare or args.submit
+    ):
+        parser.error("--serve cannot be combined with a run mode or --submit")
+    if args.serve and (
+        args.metrics
+        or args.profile
+        or args.memory_budget is not None
+        or args.memory_policy
+        or args.skip_unchanged
+    ):
+        parser.error(
+            "--serve takes no run options; pass --metrics, --profile, --memory-budget, "
+            "--memory-policy and --skip-unchanged with each --submit"
+        )
+    if args.submit and not args.demo:
+        parser.error("--submit needs --demo")
+    if args.port is not None and not (args.serve or args.submit):
+        parser.error("--port applies to --serve and --submit only")
+    if args.parallel < 1:
+        parser.error("--parallel must be at least 1")
+
+    if args.submit:
+        # The daemon runs the job: it loads the config and writes the metrics.
+        # Paths are made absolute because its working directory may differ
+        from .daemon import DEFAULT_DAEMON_PORT, submit_job
+
+        request = {
+            "demo": args.demo,
+            "config": str(Path(args.config).resolve()) if args.config else None,
+            "cwd": str(Path.cwd()),
+            "skip_unchanged": args.skip_unchanged,
+            "profile": args.profile,
+            "memory_budget_mb": args.memory_budget,
+            "memory_policy": args.memory_policy,
+            "metrics": str(Path(args.metrics).resolve()) if args.metrics else None,
+        }
+        return submit_job(request, args.port or DEFAULT_DAEMON_PORT)
 
+    if args.serve:
+        from .daemon import DEFAULT_DAEMON_PORT, RecordingDaemon
+
+        # Jobs run in their client's directory; the default config must not move with them
+        default_config = str(Path(args.config).resolve()) if args.config else None
+        return RecordingDaemon(args.port or DEFAULT_DAEMON_PORT, default_config).serve_forever()
+
+    if args.metrics:
+        AppLogger.enable_metrics(Path(args.metrics))
     if args.config:
         config.load_config(args.config)
 
+    if args.compare:
+        from .compare import DEFAULT_THRESHOLD, run_compare
+
+        threshold = args.compare_threshold
+        return run_compare(
+            Path(args.output or config.settings.output_dir),
+            Path(args.compare),
+            DEFAULT_THRESHOLD if threshold is None else threshold,
+        )
+
     if args.demo:
         from .demo_cli import DemoCLI
 
-        return DemoCLI().run(args.demo)
+        return DemoCLI(
+            skip_unchanged=args.skip_unchanged,
+            profile=args.profile,
+            memory_budget_mb=args.memory_budget,
+            memory_policy=args.memory_policy,
+        ).run(args.demo)
+
+    if args.language_demo is not None:
+        from .demo_cli import DemoCLI
 
-    # Create CLI instance
-    cli = ScreenshotCLI(output_dir=args.output, delay=args.delay)
+        return DemoCLI(skip_unchanged=args.skip_unchanged).run_languages(
+            args.language_demo,
+            parallel=args.parallel,
+            output_dir=args.output,
+            start_from=args.start_from,
+        )
 
     # Handle --list
     if args.list:
-        cli.list_languages()
+        list_languages()
         return 0
 
+    from .cli import ScreenshotCLI
+
+    cli = ScreenshotCLI(
+        output_dir=args.output,
+        delay=args.delay,
+        skip_unchanged=args.skip_unchanged,
+        profile=args.profile,
+    )
+
     # Run automated capture
-    return cli.run_automated(start_from=args.start_from)
+    return cli.run_automated(start_from=args.start_from, resume=args.resume)
 
 
 if __name__ == "__main__":
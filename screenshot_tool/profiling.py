@@ -0,0 +1,142 @@
+"""Built-in profiling for ``--profile``: cProfile + tracemalloc per run.
+
+A ``RunProfiler`` covers one run (one demo, or one language session). Each
+phase of the run is profiled with cProfile and bracketed by tracemalloc
+snapshots; the recorder thread is profiled too. ``save`` writes
+
+- ``<run>.prof``: the merged cProfile stats of all phases and threads (open
+  with ``python -m pstats``, snakeviz, ...)
+- ``<run>.allocations.txt``: per phase, the peak traced memory and the source
+  lines that allocated the most memory still alive at the end of the phase.
+"""
+
+import cProfile
+import io
+import pstats
+import re
+import sys
+import threading
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from .app_logger import AppLogger
+
+# Source lines listed per phase in the allocations report
+TOP_ALLOCATIONS = 10
+# Functions listed in the log summary after a run
+TOP_FUNCTIONS = 15
+
+# From Python 3.12 cProfile sits on sys.monitoring, which sees every thread
+# but allows one active profiler; before that, each thread needs its own
+_PER_THREAD = sys.version_info < (3, 12)
+
+
+def _file_stem(run: str) -> str:
+    """Run label as a file name: 'basic-math [de]' -> 'basic-math_de'."""
+    return re.sub(r"[^\w.-]+", "_", run).strip("_") or "run"
+
+
+def _mib(size: int) -> str:
+    return f"{size / (1024 * 1024):.2f} MiB"
+
+
+class RunProfiler:
+    """Profiles the phases of one run and writes its reports."""
+
+    def __init__(self, run: str) -> None:
+        self.run = run
+        self._profile = cProfile.Profile()
+        self._thread_profiles: list[cProfile.Profile] = []
+        self._report: list[str] = []
+        self._started_tracemalloc = False
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Profile the enclosed block as phase ``name``."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        tracemalloc.reset_peak()
+        before = tracemalloc.take_snapshot()
+        self._profile.enable()
+        try:
+            yield
+        finally:
+            self._profile.disable()
+            peak = tracemalloc.get_traced_memory()[1]
+            after = tracemalloc.take_snapshot()
+            self._add_phase_report(name, peak, after.compare_to(before, "lineno"))
+
+    def profile_thread(self, thread: threading.Thread) -> None:
+        """Include a not yet started thread (the recorder) in the profile."""
+        if not _PER_THREAD:
+            return  # the phase profiler already sees it
+        profile = cProfile.Profile()
+        self._thread_profiles.append(profile)
+        target = thread.run
+
+        def run() -> None:
+            profile.enable()
+            try:
+                target()
+            finally:
+                profile.disable()
+
+        thread.run = run  # type: ignore[method-assign]
+
+    def _add_phase_report(
+        self, name: str, peak: int, diff: list[tracemalloc.StatisticDiff]
+    ) -> None:
+        net = sum(stat.size_diff for stat in diff)
+        self._report.append(f"Phase {name}: peak {_mib(peak)}, net {_mib(net)}")
+        grown = sorted((s for s in diff if s.size_diff > 0), key=lambda s: -s.size_diff)
+        for stat in grown[:TOP_ALLOCATIONS]:
+            frame = stat.traceback[0]
+            self._report.append(
+                f"  +{_mib(stat.size_diff):>12} {stat.count_diff:>+8} blocks  "
+                f"{frame.filename}:{frame.lineno}"
+            )
+        self._report.append("")
+
+    def stats(self) -> pstats.Stats:
+        """Merged cProfile stats of all phases and threads."""
+        stats = pstats.Stats(self._profile, stream=io.StringIO())
+        for profile in self._thread_profiles:
+            stats.add(profile)
+        return stats
+
+    def save(self, directory: Path) -> tuple[Path, Path]:
+        """Save ``<run>.prof`` and ``<run>.allocations.txt`` in ``directory``
+        and log where they are, with the hottest functions.
+
+        Returns:
+            The two file paths.
+        """
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        directory.mkdir(parents=True, exist_ok=True)
+        stem = _file_stem(self.run)
+        prof_path = directory / f"{stem}.prof"
+        self.stats().dump_stats(prof_path)
+        alloc_path = directory / f"{stem}.allocations.txt"
+        alloc_path.write_text("\n".join(self._report), encoding="utf-8")
+        AppLogger.info(f"\nProfile of '{self.run}' (cumulative time):")
+        for line in self.top_functions():
+            AppLogger.info(f"  {line}")
+        AppLogger.info(f"  Profile: {prof_path}")
+        AppLogger.info(f"  Allocations: {alloc_path}")
+        return prof_path, alloc_path
+
+    def top_functions(self, limit: int = TOP_FUNCTIONS) -> list[str]:
+        """The ``limit`` functions with the most cumulative time, as text lines."""
+        out = io.StringIO()
+        stats = self.stats()
+        stats.stream = out  # type: ignore[attr-defined]
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+        # Drop pstats' header; keep the column titles and rows
+        lines = out.getvalue().splitlines()
+        start = next((i for i, line in enumerate(lines) if "ncalls" in line), 0)
+        return [line for line in lines[start:] if line.strip()]
@@ -2,92 +2,340 @@
 
 Stills requested via ``request_still`` are saved from the next captured frame,
 so they are always consistent with the recording (and full quality — the
-capture is already lossless).
+capture is already lossless). A still request wakes the capture thread at once
+for an extra frame, so the still shows the state the app asked for rather than
+one up to a frame interval later.
+
+With a ``MemoryBudget`` the recorder accounts the bytes its frames hold and,
+when they exceed the budget, applies the budget's policy: spill the frames
+to disk, downscale them, halve the frame rate, or stop and keep what it has.
+Each application is logged and listed in ``memory_report()``.
 """
 
 import threading
 import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
 from pathlib import Path
 
-from PIL import Image
-
 from .app_logger import AppLogger
 from .capture import WindowCapture
+from .frame import Frame
+from .frame_store import FrameStore
 
+# Without a memory budget, warn once when a recording grows past this
 _FRAME_WARN_THRESHOLD = 1000
+# Spilled frames live here under the stills folder until the export is done
+SPILL_DIR = ".spill"
+# Downscaling stops (and recording with it) below this frame side, in px
+_MIN_DOWNSCALED_SIDE = 64
+
+
+def _fixed(deadline: float) -> Callable[[], float]:
+    """A ``_wait_until`` deadline bound to its value now."""
+    return lambda: deadline
+
+
+@dataclass(frozen=True)
+class MemoryBudget:
+    """Cap on the frame bytes a recording holds, and what to do at the cap.
+
+    Policies: "spill" (move frames to disk), "downscale" (halve the frame
+    size), "reduce_fps" (drop every other frame, capture at half the rate),
+    "stop" (end the recording; what it has is exported). A policy that can
+    not shrink further (fps 1, tiny frames) falls back to "stop".
+    """
+
+    limit_bytes: int
+    policy: str = "stop"
 
 
-class Recorder(threading.Thread):
-    """Captures a window region at a fixed fps until stopped."""
+@dataclass(frozen=True)
+class BudgetEvent:
+    """One time the memory budget was reached."""
+
+    seconds: float  # into the recording
+    frames: int  # frames recorded at that point
+    policy: str  # what was applied ("stop" when the policy was exhausted)
+    bytes_before: int
+    bytes_after: int
+
+    def describe(self) -> str:
+        mib = 1024 * 1024
+        return (
+            f"{self.policy} at {self.seconds:.1f}s (frame {self.frames}): "
+            f"{self.bytes_before / mib:.1f} -> {self.bytes_after / mib:.1f} MiB in memory"
+        )
+
+
+class FrameRecorder(threading.Thread):
+    """Base for recorders: timestamped frames plus stills saved from them."""
 
     def __init__(
         self,
-        hwnd: int,
         fps: int,
         stills_dir: Path,
-        crop: tuple[int, int, int, int] = (0, 0, 0, 0),
+        skip_unchanged: bool = False,
+        budget: MemoryBudget | None = None,
     ) -> None:
         super().__init__(daemon=True)
-        self.hwnd = hwnd
         self.fps = fps
         self.stills_dir = stills_dir
-        self.crop = crop  # (top, right, bottom, left) px removed from each frame
-        self.frames: list[tuple[float, Image.Image]] = []
+        self.skip_unchanged = skip_unchanged
+        self.frames = FrameStore()
+        self.budget = budget
+        self.budget_events: list[BudgetEvent] = []
+        self.peak_bytes = 0
+        # Raised by the downscale / reduce_fps policies
+        self.scale_divisor = 1
+        self.fps_divisor = 1
+        self._warned = False
         self.saved_stills: list[str] = []
-        self._pending_stills: list[str] = []
+        # save_screenshot result ("written"/"changed"/"unchanged") -> count
+        self.still_results: Counter[str] = Counter()
+        # (name, perf_counter time of the request)
+        self._pending_stills: list[tuple[str, float]] = []
         self._lock = threading.Lock()
-        self._stop = threading.Event()
-        self._warned = False
+        self._stop_event = threading.Event()
 
     def request_still(self, name: str) -> None:
         """Save the next captured frame as ``<stills_dir>/<name>.png``."""
         with self._lock:
-            self._pending_stills.append(name)
+            self._pending_stills.append((name, time.perf_counter()))
 
     def stop(self) -> None:
-        self._stop.set()
+        self._stop_event.set()
 
-    def run(self) -> None:
-        interval = 1.0 / self.fps
-        next_tick = time.perf_counter()
-        while not self._stop.is_set():
-            try:
-                image = WindowCapture.capture_window(self.hwnd)
-            except Exception as e:
-                AppLogger.error(f"Frame capture failed, stopping recording: {e}")
-                return
-            image = self._apply_crop(image)
-            self.frames.append((time.perf_counter(), image))
-            self._save_pending_stills(image)
+    def export_fps(self) -> int:
+        """Frame rate to encode constant-rate formats (MP4) at."""
+        return max(1, round(self.fps / self.fps_divisor))
+
+    def memory_report(self) -> dict:
+        """Budget, peak frame bytes held, and every time the budget was reached."""
+        return {
+            "budget_bytes": self.budget.limit_bytes if self.budget else None,
+            "policy": self.budget.policy if self.budget else None,
+            "peak_bytes": self.peak_bytes,
+            "spilled": self.frames.spilling,
+            "events": [asdict(event) for event in self.budget_events],
+        }
+
+    def _store_frame(self, frame: Frame) -> bool:
+        """Keep a frame, enforcing the memory budget; False: stop recording."""
+        if self.scale_divisor > 1:
+            frame = frame.reduce(self.scale_divisor)
+        self.frames.append(frame)
+        self.peak_bytes = max(self.peak_bytes, self.frames.bytes_held)
+        if self.budget is None:
             if len(self.frames) > _FRAME_WARN_THRESHOLD and not self._warned:
                 self._warned = True
                 AppLogger.info(
-                    f"Recording exceeds {_FRAME_WARN_THRESHOLD} frames; memory use is growing"
+                    f"Recording exceeds {_FRAME_WARN_THRESHOLD} frames "
+                    f"({self.frames.bytes_held / (1024 * 1024):.0f} MiB); set a memory "
+                    f"budget to cap it"
                 )
-            next_tick += interval
-            delay = next_tick - time.perf_counter()
-            if delay > 0:
-                time.sleep(delay)
-            else:
-                # Capture slower than fps: skip missed ticks instead of drifting
-                next_tick = time.perf_counter()
-
-    def _apply_crop(self, image: Image.Image) -> Image.Image:
-        """Remove the configured (top, right, bottom, left) inset from a frame."""
-        top, right, bottom, left = self.crop
-        if not (top or right or bottom or left):
-            return image
-        w, h = image.size
-        box = (left, top, w - right, h - bottom)
-        if box[2] <= box[0] or box[3] <= box[1]:
-            return image  # inset larger than the frame; ignore rather than crash
-        return image.crop(box)
-
-    def _save_pending_stills(self, image: Image.Image) -> None:
+            return True
+        if self.frames.bytes_held <= self.budget.limit_bytes:
+            return True
+        return self._enforce_budget(frame)
+
+    def _enforce_budget(self, frame: Frame) -> bool:
+        assert self.budget is not None
+        before = self.frames.bytes_held
+        policy = self.budget.policy
+        if policy == "spill":
+            self.frames.spill(self.stills_dir / SPILL_DIR)
+        elif policy == "downscale" and min(frame.size) >= 2 * _MIN_DOWNSCALED_SIDE:
+            self.frames.downscale(2)
+            self.scale_divisor *= 2
+        elif policy == "reduce_fps" and self.fps // self.fps_divisor >= 2:
+            self.frames.thin()
+            self.fps_divisor *= 2
+        else:
+            policy = "stop"
+        event = BudgetEvent(
+            seconds=round(frame.timestamp - self.frames.timestamps[0], 3),
+            frames=len(self.frames),
+            policy=policy,
+            bytes_before=before,
+            bytes_after=self.frames.bytes_held,
+        )
+        self.budget_events.append(event)
+        AppLogger.warning(f"Memory budget reached - {event.describe()}")
+        AppLogger.metric("memory_budget", **asdict(event))
+        return policy != "stop"
+
+    def _take_pending_stills(self) -> list[tuple[str, float]]:
         with self._lock:
             pending, self._pending_stills = self._pending_stills, []
-        for name in pending:
+        return pending
+
+    def _save_stills(
+        self, frame: Frame, pending: list[tuple[str, float]], captured_at: float
+    ) -> None:
+        """Save ``frame`` once per requested still, logging request-to-capture latency."""
+        if not pending:
+            return
+        image = frame.to_image()
+        for name, requested_at in pending:
             path = self.stills_dir / f"{name}.png"
-            WindowCapture.save_screenshot(image, path)
+            result = WindowCapture.save_screenshot(image, path, self.skip_unchanged)
+            self.still_results[result] += 1
             self.saved_stills.append(name)
-            AppLogger.info(f"Saved still '{name}'")
+            latency_ms = (captured_at - requested_at) * 1000
+            verb = "Kept unchanged" if result == "unchanged" else "Saved"
+            AppLogger.info(f"{verb} still '{name}' (captured {latency_ms:.0f} ms after request)")
+
+
+class Recorder(FrameRecorder):
+    """Captures a window region until stopped.
+
+    The ``crop`` inset is left out of the grabbed screen region itself, so the
+    cropped edges are never transferred or allocated.
+
+    ``mode="timer"`` captures at a fixed fps. ``mode="dirty"`` captures only
+    after the app reports a repaint (``notify_dirty``), at most fps times per
+    second - idle stretches cost nothing, and the GIF's per-frame durations
+    keep them at their real length.
+    """
+
+    def __init__(
+        self,
+        hwnd: int,
+        fps: int,
+        stills_dir: Path,
+        crop: tuple[int, int, int, int] = (0, 0, 0, 0),
+        mode: str = "timer",
+        skip_unchanged: bool = False,
+        budget: MemoryBudget | None = None,
+    ) -> None:
+        super().__init__(fps, stills_dir, skip_unchanged, budget)
+        self.hwnd = hwnd
+        self.crop = crop  # (top, right, bottom, left) px left out of each grab
+        self.mode = mode
+        self.frames_captured = 0
+        # Window pixels per frame the crop keeps out of the grab
+        self.pixels_skipped_per_frame = 0
+        self._dirty = False
+        # Wakes the capture thread: still request, repaint, or stop
+        self._changed = threading.Condition(self._lock)
+
+    def request_still(self, name: str) -> None:
+        super().request_still(name)
+        with self._changed:
+            self._changed.notify()
+
+    def notify_dirty(self) -> None:
+        """The app repainted: capture soon (dirty mode; ignored by the timer)."""
+        if self.mode != "dirty":
+            return
+        with self._changed:
+            self._dirty = True
+            self._changed.notify()
+
+    def stop(self) -> None:
+        super().stop()
+        with self._changed:
+            self._changed.notify()
+
+    def capture_report(self) -> dict:
+        """The crop inset and the pixels/bytes it kept out of the grabs."""
+        return {
+            "crop": list(self.crop),
+            "pixels_skipped_per_frame": self.pixels_skipped_per_frame,
+            "bytes_skipped": self.pixels_skipped_per_frame * 3 * self.frames_captured,
+        }
+
+    def run(self) -> None:
+        self._check_crop()
+        if self.mode == "dirty":
+            self._run_on_dirty()
+        else:
+            self._run_on_timer()
+
+    def _run_on_timer(self) -> None:
+        next_tick = time.perf_counter()
+        while True:
+            self._wait_until(_fixed(next_tick))
+            if self._stop_event.is_set():
+                return
+            on_schedule = time.perf_counter() >= next_tick
+            if not self._capture_frame():
+                return
+            if not on_schedule:
+                continue  # extra frame for a still; keep the schedule
+            # Capture slower than fps: skip missed ticks instead of drifting
+            next_tick = max(next_tick + self.fps_divisor / self.fps, time.perf_counter())
+
+    def _run_on_dirty(self) -> None:
+        if not self._capture_frame():  # the initial state
+            return
+        while True:
+            # Rate limit: repaints reported meanwhile are covered by one capture
+            self._wait_until(
+                lambda: (
+                    self.frames.timestamps[-1] + self.fps_divisor / self.fps
+                    if self._dirty
+                    else None
+                )
+            )
+            if self._stop_event.is_set():
+                break
+            with self._lock:
+                self._dirty = False
+            if not self._capture_frame():
+                return
+        # Closing frame: gives the last change its real on-screen duration
+        self._capture_frame()
+
+    def _wait_until(self, due: Callable[[], float | None]) -> None:
+        """Block until a still is requested, the recorder stops, or the
+        ``perf_counter`` time returned by ``due`` (None: nothing due) passes.
+
+        ``due`` is re-evaluated on every wake-up, under the lock.
+        """
+        with self._changed:
+            while not self._stop_event.is_set() and not self._pending_stills:
+                deadline = due()
+                if deadline is None:
+                    self._changed.wait()
+                elif (delay := deadline - time.perf_counter()) > 0:
+                    self._changed.wait(delay)
+                else:
+                    return
+
+    def _check_crop(self) -> None:
+        """Validate the crop against the window once, before the first frame."""
+        if not any(self.crop):
+            return
+        try:
+            region = WindowCapture.window_region(self.hwnd)
+        except RuntimeError:
+            return  # the first capture fails and reports it
+        cropped = WindowCapture.inset_region(region, self.crop)
+        width, height = region[2], region[3]
+        if cropped is None:
+            AppLogger.warning(
+                f"Crop {self.crop} is larger than the {width}x{height} window; recording uncropped"
+            )
+            self.crop = (0, 0, 0, 0)
+            return
+        self.pixels_skipped_per_frame = width * height - cropped[2] * cropped[3]
+
+    def _capture_frame(self) -> bool:
+        """Capture and store one frame; False if capture failed or the
+        memory budget stopped the recording."""
+        # Taken before the grab: a still never shows a state older than its request
+        pending = self._take_pending_stills()
+        try:
+            image = WindowCapture.capture_window(self.hwnd, self.crop)
+        except Exception as e:
+            AppLogger.error(f"Frame capture failed, stopping recording: {e}")
+            return False
+        captured_at = time.perf_counter()
+        self.frames_captured += 1
+        frame = Frame.from_image(image, captured_at)  # the one pixel copy
+        # Stills before the budget may shrink the frame: always full quality
+        self._save_stills(frame, pending, captured_at)
+        return self._store_frame(frame)
@@ -0,0 +1,34 @@
+"""Per-run report: one ``report.json`` next to a run's outputs.
+
+Components add named sections (recording stats, memory budget, ...) while a
+run progresses; ``write`` saves them together, so a CI job can read one file
+per run instead of parsing the log.
+"""
+
+import json
+from pathlib import Path
+from typing import Any
+
+REPORT_NAME = "report.json"
+
+
+class RunReport:
+    """Sections collected for one run, written as a JSON object."""
+
+    def __init__(self, run: str) -> None:
+        self.run = run
+        self.sections: dict[str, Any] = {}
+
+    def add(self, section: str, data: Any) -> None:
+        """Set (or replace) one section; ``data`` must be JSON-serializable."""
+        self.sections[section] = data
+
+    def write(self, directory: Path) -> Path:
+        """Write ``<directory>/report.json`` and return its path."""
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / REPORT_NAME
+        path.write_text(
+            json.dumps({"run": self.run, **self.sections}, indent=2, default=str),
+            encoding="utf-8",
+        )
+        return path
@@ -0,0 +1,129 @@
+"""Resource usage of the demoed app while a demo plays.
+
+``ResourceSampler`` is a background thread that samples the app's process tree
+(the launched process and all its children) a few times per second: CPU
+percent, resident memory, threads and OS handles (file descriptors outside
+Windows), summed over the tree. Demo events are marked on the same clock, and
+every sample carries the last event before it, so the report shows what the
+app was doing at each point - a recording doubles as a performance smoke test.
+"""
+
+import threading
+import time
+
+import psutil
+
+# Seconds between samples; psutil reads a handful of counters per process
+SAMPLE_INTERVAL_S = 0.25
+
+
+def _handle_count(process: psutil.Process) -> int:
+    """OS handles on Windows, open file descriptors elsewhere."""
+    if hasattr(process, "num_handles"):
+        return process.num_handles()
+    return process.num_fds()
+
+
+class ResourceSampler(threading.Thread):
+    """Samples CPU, RSS, threads and handles of a process tree until stopped."""
+
+    def __init__(self, pid: int, interval: float = SAMPLE_INTERVAL_S) -> None:
+        super().__init__(daemon=True, name="resource-sampler")
+        self.pid = pid
+        self.interval = interval
+        # perf_counter time all sample and event times are relative to
+        self.started_at = time.perf_counter()
+        self.samples: list[dict] = []
+        self.events: list[dict] = []
+        self._last_event: str | None = None
+        # Process objects by pid: cpu_percent() measures since the previous
+        # call on the same object
+        self._processes: dict[int, psutil.Process] = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+    def mark(self, event: str) -> None:
+        """Put a demo event on the sample timeline."""
+        with self._lock:
+            self.events.append({"t": self._now(), "event": event})
+            self._last_event = event
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def run(self) -> None:
+        try:
+            root = psutil.Process(self.pid)
+        except psutil.NoSuchProcess:
+            return
+        while not self._stop_event.is_set():
+            if not self._sample(root):
+                return  # the app exited
+            self._stop_event.wait(self.interval)
+
+    def _now(self) -> float:
+        return round(time.perf_counter() - self.started_at, 3)
+
+    def _tree(self, root: psutil.Process) -> list[psutil.Process]:
+        """The root and its current children, reusing known Process objects."""
+        tree = [root, *root.children(recursive=True)]
+        self._processes = {p.pid: self._processes.get(p.pid, p) for p in tree}
+        return list(self._processes.values())
+
+    def _sample(self, root: psutil.Process) -> bool:
+        """Add one sample of the tree; False once the root process is gone."""
+        try:
+            tree = self._tree(root)
+        except psutil.NoSuchProcess:
+            return False
+        cpu = rss = threads = handles = 0.0
+        alive = 0
+        for process in tree:
+            try:
+                with process.oneshot():
+                    cpu += process.cpu_percent()
+                    rss += process.memory_info().rss
+                    threads += process.num_threads()
+                    handles += _handle_count(process)
+                alive += 1
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue  # a child exited (or is off limits) mid-sample
+        with self._lock:
+            self.samples.append(
+                {
+                    "t": self._now(),
+                    "event": self._last_event,
+                    "processes": alive,
+                    "cpu_percent": round(cpu, 1),
+                    "rss_bytes": int(rss),
+                    "threads": int(threads),
+                    "handles": int(handles),
+                }
+            )
+        return True
+
+    def report(self, recording_start: float | None = None) -> dict:
+        """Samples, events and peaks, for the run report.
+
+        Args:
+            recording_start: ``perf_counter`` time the recording started at;
+                stored as ``recording_offset`` so sample times map to video time
+        """
+        with self._lock:
+            samples, events = list(self.samples), list(self.events)
+        peak = {
+            key: max((s[key] for s in samples), default=0)
+            for key in ("cpu_percent", "rss_bytes", "threads", "handles")
+        }
+        # The first sample only primes psutil's CPU counters
+        cpu = [s["cpu_percent"] for s in samples[1:]]
+        return {
+            "interval_seconds": self.interval,
+            "recording_offset": (
+                round(recording_start - self.started_at, 3) if recording_start is not None else None
+            ),
+            "peak": peak,
+            "mean_cpu_percent": round(sum(cpu) / len(cpu), 1) if cpu else 0.0,
+            "events": events,
+            "samples": samples,
+        }
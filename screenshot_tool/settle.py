@@ -0,0 +1,78 @@
+"""Visual settle detection: wait until a window stops changing.
+
+Replaces a fixed sleep after a UI change (language mode's
+``delay_after_change``). The window is sampled repeatedly; each sample is
+reduced to a small grayscale thumbnail and compared with the previous one as a
+NumPy array. The UI counts as settled after ``stable_samples`` identical
+samples in a row, typically within a few tens of milliseconds; the caller's
+fixed delay remains the upper bound.
+"""
+
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import numpy as np
+from PIL import Image
+
+SETTLE_SAMPLES = 3
+SETTLE_INTERVAL_S = 0.02
+# Each thumbnail pixel averages a 4x4 block: small enough to compare in
+# microseconds, fine enough to see a changed label
+_THUMBNAIL_FACTOR = 4
+
+
+@dataclass(frozen=True)
+class SettleResult:
+    """Outcome of one settle wait."""
+
+    image: Image.Image  # last full-resolution sample: the settled frame
+    thumbnail: np.ndarray  # its comparison thumbnail (baseline for the next wait)
+    seconds: float
+    settled: bool  # False: gave up at the timeout
+
+
+def thumbnail(image: Image.Image) -> np.ndarray:
+    """Downsampled grayscale array of a frame, as used for comparisons."""
+    return np.asarray(image.convert("L").reduce(_THUMBNAIL_FACTOR))
+
+
+def wait_for_settle(
+    capture: Callable[[], Image.Image],
+    timeout: float,
+    baseline: np.ndarray | None = None,
+    stable_samples: int = SETTLE_SAMPLES,
+    interval: float = SETTLE_INTERVAL_S,
+) -> SettleResult:
+    """Sample ``capture`` until ``stable_samples`` consecutive frames are identical.
+
+    Args:
+        capture: Grabs one full frame of the window
+        timeout: Upper bound in seconds (the former fixed delay)
+        baseline: Thumbnail from before the UI change. When given, the UI must
+            first differ from it - so a change whose repaint has not started
+            yet is not mistaken for a settled screen.
+        stable_samples: Identical samples in a row that count as settled
+        interval: Pause between samples in seconds
+
+    Returns:
+        The last sample, its thumbnail, the time waited, and whether the UI
+        settled before the timeout.
+    """
+    start = time.monotonic()
+    changed = baseline is None
+    previous: np.ndarray | None = None
+    run = 0
+    while True:
+        image = capture()
+        current = thumbnail(image)
+        elapsed = time.monotonic() - start
+        run = run + 1 if previous is not None and np.array_equal(previous, current) else 1
+        if not changed and baseline is not None:
+            changed = not np.array_equal(baseline, current)
+        if changed and run >= stable_samples:
+            return SettleResult(image, current, elapsed, True)
+        if elapsed >= timeout:
+            return SettleResult(image, current, elapsed, False)
+        previous = current
+        time.sleep(min(interval, timeout - elapsed))
@@ -0,0 +1,222 @@
+"""App-pushed frames over a shared-memory ring buffer.
+
+Optional protocol extension (see docs/AUTOMATION_INTERFACE.md): an app that can
+render its own frames writes each one into a ``multiprocessing.shared_memory``
+ring and announces it with a ``frame`` event, instead of the tool grabbing the
+window's screen region. Recordings become pixel-exact, unaffected by
+overlapping windows, and follow the app's own frame timing.
+
+Ring layout: ``slots`` consecutive slots; frame ``i`` goes into slot
+``i % slots``, which holds an 8-byte little-endian signed frame index followed
+by ``width * height * 3`` bytes of top-down RGB pixels. The writer sets the
+index to -1 while it fills a slot, so a reader that sees the expected index
+both before and after copying knows the frame was not overwritten mid-copy.
+"""
+
+import queue
+import sys
+import time
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from pathlib import Path
+
+from .app_logger import AppLogger
+from .demo_server import FrameBufferSpec
+from .frame import Frame
+from .recorder import FrameRecorder, MemoryBudget
+
+_HEADER_BYTES = 8
+_WRITING = -1
+
+
+def slot_bytes(spec: FrameBufferSpec) -> int:
+    """Size of one ring slot: index header plus RGB pixels."""
+    return _HEADER_BYTES + spec.width * spec.height * 3
+
+
+def _own_view(shm: shared_memory.SharedMemory) -> memoryview:
+    # A view of our own, released before shm.close() (which fails while views exist)
+    assert shm.buf is not None  # only None after close()
+    return memoryview(shm.buf)
+
+
+def _read_header(buf: memoryview, offset: int) -> int:
+    return int.from_bytes(buf[offset : offset + _HEADER_BYTES], "little", signed=True)
+
+
+def _write_header(buf: memoryview, offset: int, value: int) -> None:
+    buf[offset : offset + _HEADER_BYTES] = value.to_bytes(_HEADER_BYTES, "little", signed=True)
+
+
+class FrameRing:
+    """Tool-side attachment to the ring an app announced in ``demo_started``."""
+
+    def __init__(self, spec: FrameBufferSpec) -> None:
+        self.spec = spec
+        if sys.version_info >= (3, 13):
+            self._shm = shared_memory.SharedMemory(name=spec.shm, track=False)
+        else:
+            self._shm = shared_memory.SharedMemory(name=spec.shm)
+            if sys.platform != "win32":
+                # Attaching registers the segment with this process's resource
+                # tracker, which would unlink the app's segment when the tool exits
+                from multiprocessing import resource_tracker
+
+                # The tracker keys POSIX segments by their "/"-prefixed name
+                resource_tracker.unregister("/" + self._shm.name, "shared_memory")
+        self._buf = _own_view(self._shm)
+        if self._shm.size < spec.slots * slot_bytes(spec):
+            self.close()
+            raise ValueError(
+                f"Shared memory '{spec.shm}' is smaller than {spec.slots} slots "
+                f"of {spec.width}x{spec.height} RGB"
+            )
+
+    def read(self, index: int, timestamp: float = 0.0) -> Frame | None:
+        """Copy frame ``index`` out of its slot into a new frame buffer.
+
+        The pixels are copied straight from the shared buffer - one copy, no
+        intermediate ``bytes``.
+
+        Returns:
+            The frame, or None when the slot no longer holds it (the app has
+            lapped the ring before the copy finished).
+        """
+        spec = self.spec
+        offset = (index % spec.slots) * slot_bytes(spec)
+        buf = self._buf
+        if _read_header(buf, offset) != index:
+            return None
+        start = offset + _HEADER_BYTES
+        with buf[start : start + spec.width * spec.height * 3] as pixels:
+            frame = Frame.from_buffer(pixels, spec.width, spec.height, timestamp)
+        if _read_header(buf, offset) != index:
+            return None
+        return frame
+
+    def close(self) -> None:
+        self._buf.release()
+        self._shm.close()
+
+
+class SharedFrameWriter:
+    """App side of the ring: creates the segment and writes frames into it.
+
+    Reference implementation of the writer, used by the tests; apps in other
+    languages reproduce the same layout.
+    """
+
+    def __init__(self, width: int, height: int, slots: int = 8) -> None:
+        probe = FrameBufferSpec("", width, height, slots)
+        self._shm = shared_memory.SharedMemory(create=True, size=slots * slot_bytes(probe))
+        self.spec = FrameBufferSpec(self._shm.name, width, height, slots)
+        self._buf = _own_view(self._shm)
+        self._next_index = 0
+        for slot in range(slots):
+            # A zeroed header would read as frame 0 in every slot
+            _write_header(self._buf, slot * slot_bytes(self.spec), _WRITING)
+
+    def write(self, pixels: bytes | bytearray | memoryview) -> int:
+        """Write one top-down RGB frame into the next slot.
+
+        Returns:
+            The frame index to announce in the ``frame`` event.
+
+        Raises:
+            ValueError: If ``pixels`` is not exactly ``width * height * 3`` bytes.
+        """
+        size = self.spec.width * self.spec.height * 3
+        if len(pixels) != size:
+            raise ValueError(f"Expected {size} bytes of RGB pixels, got {len(pixels)}")
+        index = self._next_index
+        offset = (index % self.spec.slots) * slot_bytes(self.spec)
+        buf = self._buf
+        _write_header(buf, offset, _WRITING)
+        buf[offset + _HEADER_BYTES : offset + _HEADER_BYTES + size] = pixels
+        _write_header(buf, offset, index)
+        self._next_index += 1
+        return index
+
+    def close(self) -> None:
+        """Release and remove the segment (the app owns it)."""
+        self._buf.release()
+        self._shm.close()
+        self._shm.unlink()
+
+
+@dataclass(frozen=True)
+class _StillRequest:
+    name: str
+    requested_at: float
+
+
+class SharedFrameRecorder(FrameRecorder):
+    """Records the frames an app pushes through its shared-memory ring.
+
+    ``push_frame`` is called for every ``frame`` event; the copy out of the
+    ring happens on this thread, so the event loop never blocks on pixels.
+    Still requests travel through the same queue, so each one is served by
+    the first frame the app announced after it.
+    """
+
+    def __init__(
+        self,
+        ring: FrameRing,
+        fps: int,
+        stills_dir: Path,
+        skip_unchanged: bool = False,
+        budget: MemoryBudget | None = None,
+    ) -> None:
+        super().__init__(fps, stills_dir, skip_unchanged, budget)
+        self.ring = ring
+        self.dropped = 0
+        self._announced_count = 0
+        # (index, timestamp) per frame, a still request, or None to stop
+        self._announced: queue.Queue[tuple[int, float] | _StillRequest | None] = queue.Queue()
+
+    def push_frame(self, index: int, timestamp: float | None = None) -> None:
+        """Queue announced frame ``index``; without an app timestamp the arrival time is used."""
+        self._announced.put((index, timestamp if timestamp is not None else time.perf_counter()))
+
+    def request_still(self, name: str) -> None:
+        self._announced.put(_StillRequest(name, time.perf_counter()))
+
+    def stop(self) -> None:
+        # Frames announced before the stop are still copied
+        super().stop()
+        self._announced.put(None)
+
+    def export_fps(self) -> int:
+        """Measured rate of the pushed frames; the configured fps until there are two."""
+        timestamps = self.frames.timestamps
+        if len(timestamps) < 2:
+            return self.fps
+        span = timestamps[-1] - timestamps[0]
+        return max(1, round((len(timestamps) - 1) / span)) if span > 0 else self.fps
+
+    def run(self) -> None:
+        try:
+            pending: list[tuple[str, float]] = []
+            while (announced := self._announced.get()) is not None:
+                if isinstance(announced, _StillRequest):
+                    pending.append((announced.name, announced.requested_at))
+                    continue
+                index, timestamp = announced
+                self._announced_count += 1
+                if not pending and self._announced_count % self.fps_divisor:
+                    continue  # reduce_fps policy: keep every fps_divisor-th frame
+                frame = self.ring.read(index, timestamp)
+                if frame is None:
+                    self.dropped += 1
+                    continue
+                self._save_stills(frame, pending, time.perf_counter())
+                pending = []
+                if not self._store_frame(frame):
+                    break
+        finally:
+            self.ring.close()
+            if self.dropped:
+                AppLogger.warning(
+                    f"Dropped {self.dropped} pushed frame(s) the app overwrote before they "
+                    f"were copied; announce a larger ring ('slots')"
+                )
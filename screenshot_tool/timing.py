@@ -0,0 +1,107 @@
+"""Monotonic phase timing for demo runs.
+
+Each demo run is split into named phases (launch, connect, record, export, ...).
+``PhaseTimer`` records one span per phase so a slow ``--demo all`` can be broken
+down per run and per phase — as a log table, and as a Chrome trace file that
+opens in ``chrome://tracing`` or https://ui.perfetto.dev.
+"""
+
+import json
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+from .app_logger import AppLogger
+
+
+@dataclass(frozen=True)
+class Span:
+    """One timed phase of one run, in seconds since the timer was created."""
+
+    run: str
+    phase: str
+    start: float
+    end: float
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+class PhaseTimer:
+    """Collects the phase spans of every run in one tool invocation."""
+
+    def __init__(self) -> None:
+        self._origin = time.monotonic()
+        self.spans: list[Span] = []
+
+    @contextmanager
+    def span(self, run: str, phase: str) -> Iterator[None]:
+        """Time the enclosed block as ``phase`` of ``run``; recorded even on error.
+
+        Each span is also emitted as a "phase" metric (see ``AppLogger.metric``).
+        """
+        start = time.monotonic() - self._origin
+        try:
+            yield
+        finally:
+            span = Span(run, phase, start, time.monotonic() - self._origin)
+            self.spans.append(span)
+            AppLogger.metric("phase", run=run, phase=phase, seconds=round(span.duration, 4))
+
+    def _runs_and_phases(self) -> tuple[list[str], list[str]]:
+        # dict keys keep first-appearance order, so columns follow the run flow
+        runs = list(dict.fromkeys(s.run for s in self.spans))
+        phases = list(dict.fromkeys(s.phase for s in self.spans))
+        return runs, phases
+
+    def breakdown_lines(self) -> list[str]:
+        """Per-run table: one row per run, one column (seconds) per phase, plus
+        the run's wall-clock total."""
+        runs, phases = self._runs_and_phases()
+        if not runs:
+            return []
+        label_width = max(len("run"), *(len(r) for r in runs))
+        widths = [max(7, len(p)) for p in phases]
+        header = f"{'run':<{label_width}}"
+        header += "".join(f" {p:>{w}}" for p, w in zip(phases, widths))
+        lines = [header + f" {'total':>7}"]
+        for run in runs:
+            spans = [s for s in self.spans if s.run == run]
+            row = f"{run:<{label_width}}"
+            for phase, width in zip(phases, widths):
+                seconds = sum(s.duration for s in spans if s.phase == phase)
+                row += f" {seconds:>{width}.2f}"
+            total = max(s.end for s in spans) - min(s.start for s in spans)
+            lines.append(row + f" {total:>7.2f}")
+        return lines
+
+    def to_chrome_trace(self) -> dict:
+        """Spans as Chrome trace events: one track (tid) per run."""
+        runs, _ = self._runs_and_phases()
+        tids = {run: index + 1 for index, run in enumerate(runs)}
+        events: list[dict] = [
+            {"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": run}}
+            for run, tid in tids.items()
+        ]
+        events += [
+            {
+                "name": s.phase,
+                "cat": "demo",
+                "ph": "X",
+                "ts": round(s.start * 1_000_000),
+                "dur": round(s.duration * 1_000_000),
+                "pid": 1,
+                "tid": tids[s.run],
+                "args": {"run": s.run},
+            }
+            for s in self.spans
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: Path) -> None:
+        """Write the spans as a Chrome trace JSON file."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_chrome_trace(), indent=1), encoding="utf-8")
@@ -1,6 +1,7 @@
 """Windows API integration for finding application windows."""
 
 import ctypes
+import time
 from ctypes import wintypes
 import psutil
 
@@ -31,6 +32,9 @@ dwmapi.DwmGetWindowAttribute.argtypes = [
     ctypes.c_void_p,
     wintypes.DWORD,
 ]
+# DwmFlush: blocks until the next DWM composition pass has been presented
+dwmapi.DwmFlush.restype = ctypes.c_long  # HRESULT
+dwmapi.DwmFlush.argtypes = []
 
 
 class _MONITORINFO(ctypes.Structure):
@@ -266,6 +270,35 @@ class WindowFinder:
             AppLogger.info(f"Moving window from ({rect[0]}, {rect[1]}) to ({x}, {y})")
             user32.SetWindowPos(hwnd, 0, x, y, 0, 0, SWP_NOSIZE | SWP_NOZORDER | SWP_NOACTIVATE)
 
+    @staticmethod
+    def wait_for_composition(hwnd: int, timeout: float) -> float:
+        """Wait until DWM has composed the window at a stable position.
+
+        Replaces a fixed sleep after raising/moving the window: each ``DwmFlush``
+        returns once the next composition pass is on screen, and the window
+        counts as settled when its visible bounds are unchanged across two
+        passes — typically a few tens of milliseconds. ``timeout`` caps the wait.
+
+        Args:
+            hwnd: Window handle
+            timeout: Upper bound in seconds
+
+        Returns:
+            Seconds actually waited.
+        """
+        start = time.monotonic()
+        previous: tuple[int, int, int, int] | None = None
+        while (elapsed := time.monotonic() - start) < timeout:
+            if dwmapi.DwmFlush() != 0:
+                # No composition to synchronize with: fall back to the fixed wait
+                time.sleep(timeout - elapsed)
+                break
+            bounds = WindowFinder.get_extended_frame_bounds(hwnd)
+            if bounds == previous:
+                break
+            previous = bounds
+        return time.monotonic() - start
+
     @staticmethod
     def is_window_valid(hwnd: int) -> bool:
         """Check if window handle is still valid.
@@ -0,0 +1,145 @@
+"""Integration tests for AsyncDemoServer: multiplexing, routing, and a burst stress test."""
+
+import asyncio
+import json
+import socket
+import threading
+import time
+
+from screenshot_tool.demo_server import AsyncDemoServer, DemoServer
+
+BURST_EVENTS = 50_000
+
+
+def event_line(**payload) -> bytes:
+    return json.dumps(payload).encode("utf-8") + b"\n"
+
+
+async def send(port: int, *lines: bytes) -> asyncio.StreamWriter:
+    _, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(b"".join(lines))
+    await writer.drain()
+    return writer
+
+
+def test_events_are_routed_per_demo_across_connections():
+    async def scenario() -> None:
+        server = AsyncDemoServer()
+        await server.start()
+        app1 = await send(
+            server.port,
+            event_line(event="demo_started", demo=1, hwnd=1),
+            event_line(event="screenshot", name="one"),
+        )
+        app2 = await send(
+            server.port,
+            event_line(event="demo_started", demo=2, hwnd=2),
+            event_line(event="screenshot", name="two"),
+        )
+        try:
+            started = await server.next_event(demo=2, timeout=5)
+            shot = await server.next_event(demo=2, timeout=5)
+            assert started is not None and started.event.hwnd == 2
+            assert shot is not None and (shot.demo, shot.event.name) == (2, "two")
+            # Demo 1's events were kept for their own consumer
+            first = await server.next_event(demo=1, timeout=5)
+            assert first is not None and first.event.event == "demo_started"
+            assert first.connection != shot.connection
+        finally:
+            app1.close()
+            app2.close()
+            await server.close()
+
+    asyncio.run(scenario())
+
+
+def test_events_iterator_ends_when_its_connection_closes():
+    async def scenario() -> None:
+        server = AsyncDemoServer()
+        await server.start()
+        app = await send(
+            server.port,
+            event_line(event="demo_started", demo=3, hwnd=1),
+            event_line(event="demo_ended", demo=3),
+        )
+        connection = await server.accept(timeout=5)
+        assert connection is not None
+        app.close()
+        try:
+            names = [routed.event.event async for routed in server.events(connection)]
+            assert names == ["demo_started", "demo_ended"]
+        finally:
+            await server.close()
+
+    asyncio.run(scenario())
+
+
+def test_send_command_reaches_the_app():
+    async def scenario() -> None:
+        server = AsyncDemoServer()
+        await server.start()
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        try:
+            connection = await server.accept(timeout=5)
+            assert connection is not None
+            assert await server.send_command(connection, "shutdown")
+            line = await asyncio.wait_for(reader.readline(), 5)
+            assert json.loads(line) == {"command": "shutdown"}
+        finally:
+            writer.close()
+            await server.close()
+
+    asyncio.run(scenario())
+
+
+def test_burst_arrives_complete_through_sync_facade():
+    """A fake app floods the connection; every event must arrive, in order."""
+    burst = b"".join(
+        event_line(event="screenshot", name=f"shot-{i}") for i in range(BURST_EVENTS)
+    ) + event_line(event="demo_ended", demo=1)
+    server = DemoServer()
+
+    def fake_app() -> None:
+        with socket.create_connection(("127.0.0.1", server.port), timeout=5) as conn:
+            conn.sendall(burst)
+            time.sleep(1)
+
+    client = threading.Thread(target=fake_app, daemon=True)
+    client.start()
+    try:
+        assert server.accept(timeout=5)
+        received = 0
+        while (event := server.next_event(timeout=10)) is not None:
+            if event.event == "demo_ended":
+                break
+            assert event.name == f"shot-{received}"
+            received += 1
+        assert received == BURST_EVENTS
+    finally:
+        client.join(timeout=5)
+        server.close()
+
+
+def test_burst_arrives_complete_through_async_iterator():
+    """The same flood read with ``events()``: every event arrives once, in order."""
+
+    async def scenario() -> None:
+        server = AsyncDemoServer()
+        await server.start()
+        app = await send(
+            server.port,
+            *(event_line(event="screenshot", name=f"shot-{i}") for i in range(BURST_EVENTS)),
+        )
+        connection = await server.accept(timeout=5)
+        assert connection is not None
+        app.close()  # ends the iterator once the burst is read
+        try:
+            received = 0
+            async for routed in server.events(connection):
+                assert routed.event.name == f"shot-{received}"
+                received += 1
+            assert received == BURST_EVENTS
+        finally:
+            await server.close()
+
+    asyncio.run(asyncio.wait_for(scenario(), 60))
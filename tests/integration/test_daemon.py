@@ -0,0 +1,110 @@
+"""Integration tests for the recording daemon over a real localhost socket."""
+
+import json
+import socket
+import threading
+import time
+
+import pytest
+
+from screenshot_tool.app_logger import AppLogger
+from screenshot_tool.daemon import RecordingDaemon, parse_job, submit_job
+
+
+@pytest.fixture
+def daemon():
+    runs: list[dict] = []
+
+    def runner(request, default_config):
+        runs.append(request)
+        AppLogger.info(f"recording demo {request['demo']}")
+        time.sleep(0.2)
+        if request["demo"] == "boom":
+            raise RuntimeError("app vanished")
+        if request["demo"] != "1":
+            AppLogger.error(f"demo {request['demo']} ended abnormally")
+        return 0 if request["demo"] == "1" else 1
+
+    server = RecordingDaemon(port=0, runner=runner)
+    server.start()
+    server.runs = runs
+    yield server
+    server.shutdown()
+
+
+def test_job_streams_progress_and_exit_code(daemon):
+    with socket.create_connection(("127.0.0.1", daemon.port), timeout=5) as conn:
+        conn.sendall(b'{"demo": "1", "skip_unchanged": true}\n')
+        replies = [json.loads(line) for line in conn.makefile("rb")]
+
+    assert [r["type"] for r in replies] == ["queued", "started", "log", "done"]
+    assert replies[2]["message"] == "recording demo 1"
+    assert replies[-1]["exit_code"] == 0
+    assert daemon.runs == [{"demo": "1", "skip_unchanged": True}]
+
+
+def test_submit_job_returns_the_exit_code(daemon):
+    assert submit_job({"demo": "1"}, daemon.port) == 0
+    assert submit_job({"demo": "2"}, daemon.port) == 1
+
+
+def test_submit_job_relays_log_levels(daemon, caplog):
+    assert submit_job({"demo": "2"}, daemon.port) == 1
+    relayed = [r for r in caplog.records if r.threadName == threading.current_thread().name]
+    levels = {r.getMessage(): r.levelname for r in relayed}
+    assert levels["recording demo 2"] == "INFO"
+    assert levels["demo 2 ended abnormally"] == "ERROR"
+
+
+def test_jobs_run_one_at_a_time_in_order(daemon):
+    results: dict[str, int] = {}
+
+    def submit(demo: str) -> None:
+        results[demo] = submit_job({"demo": demo}, daemon.port)
+
+    threads = [threading.Thread(target=submit, args=(demo,)) for demo in ("1", "2", "1")]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.05)  # fixes the queue order
+    for thread in threads:
+        thread.join(timeout=10)
+
+    assert [run["demo"] for run in daemon.runs] == ["1", "2", "1"]
+    assert results == {"1": 0, "2": 1}
+
+
+def test_crashing_job_reports_failure_and_daemon_keeps_serving(daemon):
+    assert submit_job({"demo": "boom"}, daemon.port) == 1
+    assert submit_job({"demo": "1"}, daemon.port) == 0
+
+
+def test_malformed_job_is_rejected(daemon):
+    with socket.create_connection(("127.0.0.1", daemon.port), timeout=5) as conn:
+        conn.sendall(b'{"demo": 1}\n')
+        reply = json.loads(conn.makefile("rb").readline())
+    assert reply["type"] == "error"
+    assert daemon.runs == []
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        b"not json",
+        b"[]",
+        b"{}",
+        b'{"demo": "1", "fps": 5}',
+        b'{"demo": "1", "profile": 1}',
+        b'{"demo": "1", "memory_budget_mb": 0}',
+        b'{"demo": "1", "memory_budget_mb": -64}',
+    ],
+)
+def test_parse_job_rejects_bad_requests(line):
+    with pytest.raises(ValueError):
+        parse_job(line)
+
+
+def test_submit_without_daemon_fails():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        free_port = probe.getsockname()[1]
+    assert submit_job({"demo": "1"}, free_port) == 1
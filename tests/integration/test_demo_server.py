@@ -1,10 +1,14 @@
 """Integration tests for DemoServer over a real localhost socket."""
 
 import socket
+import subprocess
+import sys
 import threading
 import time
 
-from screenshot_tool.demo_server import DemoServer
+import pytest
+
+from screenshot_tool.demo_server import AppExitedError, DemoServer
 
 
 def client_thread(port: int, lines: list[bytes]) -> threading.Thread:
@@ -65,3 +69,52 @@ def test_next_event_times_out_on_silence():
     finally:
         conn.close()
         server.close()
+
+
+def exiting_process(delay: float) -> subprocess.Popen:
+    return subprocess.Popen([sys.executable, "-c", f"import time; time.sleep({delay})"])
+
+
+def test_accept_wakes_immediately_when_app_exits():
+    server = DemoServer()
+    proc = exiting_process(0.1)
+    server.watch_process(proc)
+    try:
+        start = time.monotonic()
+        with pytest.raises(AppExitedError):
+            server.accept(timeout=30)
+        assert time.monotonic() - start < 10
+    finally:
+        server.close()
+
+
+def test_next_event_wakes_immediately_when_app_exits():
+    server = DemoServer()
+    conn = socket.create_connection(("127.0.0.1", server.port), timeout=5)
+    proc = exiting_process(0.1)
+    try:
+        assert server.accept(timeout=5)
+        server.watch_process(proc)
+        start = time.monotonic()
+        with pytest.raises(AppExitedError):
+            server.next_event(timeout=30)
+        assert time.monotonic() - start < 10
+    finally:
+        conn.close()
+        server.close()
+
+
+def test_events_sent_before_exit_are_delivered_first():
+    server = DemoServer()
+    conn = socket.create_connection(("127.0.0.1", server.port), timeout=5)
+    proc = exiting_process(0)
+    try:
+        assert server.accept(timeout=5)
+        conn.sendall(b'{"event": "demo_ended", "demo": 1}\n')
+        proc.wait()
+        server.watch_process(proc)
+        ended = server.next_event(timeout=5)
+        assert ended is not None and ended.event == "demo_ended"
+    finally:
+        conn.close()
+        server.close()
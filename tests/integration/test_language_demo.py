@@ -0,0 +1,68 @@
+"""Integration test: language screenshots through the demo protocol, in parallel."""
+
+import json
+import sys
+
+from PIL import Image
+
+from screenshot_tool import config
+from screenshot_tool.app_logger import AppLogger
+from screenshot_tool.capture import WindowCapture
+from screenshot_tool.demo_cli import DemoCLI
+
+# Minimal app: reports its (fake) window, requests one still, then handles shutdown
+LANGUAGE_APP = """
+import json, socket, sys, time
+conn = socket.create_connection(("127.0.0.1", int(sys.argv[1])), timeout=30)
+def send(**payload):
+    conn.sendall(json.dumps(payload).encode("utf-8") + b"\\n")
+send(event="demo_started", demo=2, hwnd=4242)
+time.sleep(0.2)
+send(event="screenshot", name="main")
+send(event="demo_ended", demo=2)
+for line in conn.makefile("r", encoding="utf-8"):
+    if json.loads(line).get("command") == "shutdown":
+        send(event="exiting")
+        break
+"""
+
+
+def test_languages_are_captured_by_parallel_app_instances(tmp_path, monkeypatch):
+    app = tmp_path / "language_app.py"
+    app.write_text(LANGUAGE_APP, encoding="utf-8")
+    cfg = {
+        "process_name": "python.exe",
+        "title_substring": "unused",
+        "output_dir": str(tmp_path / "shots"),
+        "languages": {"de": "Deutsch", "en": "English", "fr": "Français"},
+        "launch": {"command": [sys.executable, str(app), "{port}"]},
+        "demos": [{"id": 2, "name": "main-window", "settle_timeout": 0}],
+    }
+    path = tmp_path / "app.json"
+    path.write_text(json.dumps(cfg), encoding="utf-8")
+    config.load_config(path)
+    monkeypatch.setattr(
+        WindowCapture,
+        "capture_window",
+        staticmethod(lambda hwnd: Image.new("RGB", (8, 8), "blue")),
+    )
+
+    metrics = tmp_path / "metrics.jsonl"
+    AppLogger.enable_metrics(metrics)
+    cli = DemoCLI()
+    try:
+        assert cli.run_languages(2, parallel=3) == 0
+    finally:
+        AppLogger.close_metrics()
+
+    for code in ("de", "en", "fr"):
+        assert (tmp_path / "shots" / code / "main.png").is_file()
+    # All three instances were up at the same time
+    launches = [s for s in cli.timer.spans if s.phase == "capture"]
+    assert max(s.start for s in launches) < min(s.end for s in launches)
+    assert (tmp_path / "shots" / "trace.json").is_file()
+    records = [json.loads(line) for line in metrics.read_text(encoding="utf-8").splitlines()]
+    summary = [r for r in records if r["event"] == "summary"]
+    assert summary[0]["succeeded"] == 3 and summary[0]["written"] == 3
+    assert len([r for r in records if r["event"] == "still"]) == 3
+    assert {r["phase"] for r in records if r["event"] == "phase"} >= {"launch", "capture"}
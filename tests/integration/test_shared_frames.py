@@ -0,0 +1,85 @@
+"""Integration tests for app-pushed frames through the shared-memory ring."""
+
+import json
+import sys
+
+from PIL import Image
+
+from screenshot_tool import config
+from screenshot_tool.demo_cli import DemoCLI
+from screenshot_tool.shared_frames import FrameRing, SharedFrameWriter
+
+WIDTH, HEIGHT, FRAMES = 32, 24, 20
+
+# Stdlib-only app writing the documented ring layout itself: one solid gray
+# frame per step, a still at frame 10, then the shutdown handshake
+PUSHING_APP = f"""
+import json, socket, sys, time
+from multiprocessing import shared_memory
+W, H, SLOTS = {WIDTH}, {HEIGHT}, 4
+SLOT = 8 + W * H * 3
+shm = shared_memory.SharedMemory(create=True, size=SLOTS * SLOT)
+for s in range(SLOTS):
+    shm.buf[s * SLOT:s * SLOT + 8] = (-1).to_bytes(8, "little", signed=True)
+conn = socket.create_connection(("127.0.0.1", int(sys.argv[1])), timeout=30)
+def send(**payload):
+    conn.sendall(json.dumps(payload).encode("utf-8") + b"\\n")
+send(event="demo_started", demo=1,
+     frame_buffer={{"shm": shm.name, "width": W, "height": H, "slots": SLOTS}})
+for i in range({FRAMES}):
+    offset = (i % SLOTS) * SLOT
+    shm.buf[offset:offset + 8] = (-1).to_bytes(8, "little", signed=True)
+    shm.buf[offset + 8:offset + SLOT] = bytes([i * 10]) * (W * H * 3)
+    shm.buf[offset:offset + 8] = i.to_bytes(8, "little", signed=True)
+    send(event="frame", index=i, timestamp=i / 20)
+    if i == 10:
+        send(event="screenshot", name="middle")
+    time.sleep(0.02)
+send(event="demo_ended", demo=1)
+for line in conn.makefile("r", encoding="utf-8"):
+    if json.loads(line).get("command") == "shutdown":
+        send(event="exiting")
+        break
+shm.close()
+shm.unlink()
+"""
+
+
+def test_ring_read_detects_lapped_slot():
+    writer = SharedFrameWriter(2, 1, slots=2)
+    try:
+        ring = FrameRing(writer.spec)
+        first = writer.write(bytes([1, 2, 3, 4, 5, 6]))
+        assert tuple(ring.read(first).pixels[0, 1]) == (4, 5, 6)
+        writer.write(bytes(6))
+        writer.write(bytes(6))  # frame 2 reuses frame 0's slot
+        assert ring.read(first) is None
+        ring.close()
+    finally:
+        writer.close()
+
+
+def test_demo_records_pushed_frames(tmp_path):
+    app = tmp_path / "pushing_app.py"
+    app.write_text(PUSHING_APP, encoding="utf-8")
+    cfg = {
+        "process_name": "python.exe",
+        "title_substring": "unused",
+        "output_dir": str(tmp_path),
+        "launch": {"command": [sys.executable, str(app), "{port}"]},
+        "demos": [{"id": 1, "name": "pushed", "fps": 20, "formats": ["gif"], "tail": 0.1}],
+    }
+    path = tmp_path / "app.json"
+    path.write_text(json.dumps(cfg), encoding="utf-8")
+    config.load_config(path)
+
+    cli = DemoCLI()
+    assert cli._run_demo(config.settings.demos[0])
+
+    out_dir = tmp_path / "demos" / "pushed"
+    assert (out_dir / "demo.gif").is_file()
+    with Image.open(out_dir / "middle.png") as still:
+        # Saved from the first frame copied after the request: frame 10 or later
+        assert still.getpixel((0, 0))[0] >= 100
+    with Image.open(out_dir / "demo.gif") as gif:
+        assert gif.size == (WIDTH, HEIGHT)
@@ -0,0 +1,63 @@
+"""Integration tests for the shutdown command / exiting ack with a real app process."""
+
+import subprocess
+import sys
+import time
+
+from screenshot_tool.demo_cli import DemoCLI
+from screenshot_tool.demo_server import DemoServer
+
+# Minimal app: connects, then quits as soon as the tool asks it to
+HANDSHAKE_APP = """
+import json, socket, sys
+conn = socket.create_connection(("127.0.0.1", int(sys.argv[1])), timeout=30)
+for line in conn.makefile("r", encoding="utf-8"):
+    if json.loads(line).get("command") == "shutdown":
+        conn.sendall(b'{"event": "exiting"}\\n')
+        break
+"""
+
+# Pre-handshake app: ignores commands and quits on its own a little later
+LEGACY_APP = """
+import socket, sys, time
+conn = socket.create_connection(("127.0.0.1", int(sys.argv[1])), timeout=30)
+time.sleep(0.5)
+"""
+
+
+def launch(server: DemoServer, script: str) -> subprocess.Popen:
+    proc = subprocess.Popen([sys.executable, "-c", script, str(server.port)])
+    server.watch_process(proc)
+    assert server.accept(timeout=30)
+    return proc
+
+
+def test_shutdown_handshake_exits_without_grace_period():
+    server = DemoServer()
+    try:
+        proc = launch(server, HANDSHAKE_APP)
+        start = time.monotonic()
+        DemoCLI._shutdown(server, proc)
+        assert proc.returncode == 0
+        assert time.monotonic() - start < 5
+    finally:
+        server.close()
+
+
+def test_app_without_handshake_still_exits_on_its_own():
+    server = DemoServer()
+    try:
+        proc = launch(server, LEGACY_APP)
+        DemoCLI._shutdown(server, proc)
+        assert proc.returncode == 0
+    finally:
+        server.close()
+
+
+def test_lingering_app_is_killed():
+    proc = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+    try:
+        DemoCLI._kill(proc)
+        assert proc.wait(timeout=5) is not None
+    finally:
+        proc.kill()
@@ -0,0 +1,53 @@
+"""Startup benchmark: --help and --list must not import the automation stack.
+
+Runs the real CLI under ``python -X importtime`` and checks which modules it
+imported and how long the package's own imports took in total.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+HEAVY_MODULES = {"pyautogui", "pywinauto", "keyboard", "PIL", "numpy", "psutil", "comtypes"}
+# Light enough for tens of milliseconds; the automation/imaging stack alone
+# takes several times this
+IMPORT_BUDGET_US = 200_000
+
+
+def _imported(args: list[str]) -> dict[str, int]:
+    """Module name -> cumulative import time (us) for one CLI run."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "screenshot_tool.main", *args],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+        timeout=60,
+        check=False,
+    )
+    assert result.returncode == 0, result.stderr
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+
+@pytest.mark.parametrize("args", [["--help"], ["--list"]])
+def test_cli_starts_without_heavy_imports(args):
+    modules = _imported(args)
+
+    heavy = {name for name in modules if name.split(".")[0] in HEAVY_MODULES}
+    assert not heavy
+    own = {name for name in modules if name.startswith("screenshot_tool")}
+    assert own <= {"screenshot_tool", "screenshot_tool.config", "screenshot_tool.app_logger"}
+    # Top-level entries only: nested ones are already in their parent's total
+    total = sum(modules[name] for name in own)
+    assert total < IMPORT_BUDGET_US, f"package imports took {total / 1000:.0f} ms"
@@ -0,0 +1,47 @@
+"""Unit tests for AppLogger's structured JSON-lines metrics sink."""
+
+import json
+
+from screenshot_tool.app_logger import AppLogger
+
+
+def _records(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_metrics_are_noop_until_enabled(tmp_path):
+    AppLogger.metric("phase", run="r", phase="launch", seconds=0.1)
+    assert not list(tmp_path.iterdir())
+
+
+def test_metrics_sink_writes_typed_json_lines(tmp_path, caplog):
+    path = tmp_path / "out" / "metrics.jsonl"
+    run_id = AppLogger.enable_metrics(path, run_id="ci-42")
+    try:
+        AppLogger.info("Captured 3 frames")
+        AppLogger.metric("recording", run="demo", frames=3, bytes_written=1024)
+        AppLogger.error("Window closed unexpectedly")
+    finally:
+        AppLogger.close_metrics()
+    AppLogger.metric("phase", run="demo", phase="late")  # after close: dropped
+
+    records = _records(path)
+    assert run_id == "ci-42"
+    assert [r["event"] for r in records] == ["recording", "error"]
+    assert all(r["run_id"] == "ci-42" and isinstance(r["ts"], float) for r in records)
+    assert records[0]["frames"] == 3 and records[0]["bytes_written"] == 1024
+    assert records[1]["message"] == "Window closed unexpectedly"
+    # The human-readable output is unchanged
+    assert caplog.messages == ["Captured 3 frames", "Window closed unexpectedly"]
+
+
+def test_reenabling_metrics_registers_the_exit_hook_once(tmp_path, monkeypatch):
+    registered = []
+    monkeypatch.setattr("atexit.register", registered.append)
+    monkeypatch.setattr(AppLogger, "_atexit_registered", False)
+    try:
+        for job in range(3):
+            AppLogger.enable_metrics(tmp_path / f"job{job}.jsonl")
+    finally:
+        AppLogger.close_metrics()
+    assert registered == [AppLogger.close_metrics]
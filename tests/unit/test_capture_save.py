@@ -13,3 +13,28 @@ def test_save_creates_language_subfolders(tmp_path):
 
     assert output_path.is_file()
     assert Image.open(output_path).size == (4, 4)
+
+
+def test_skip_unchanged_leaves_identical_file_untouched(tmp_path):
+    output_path = tmp_path / "main.png"
+    image = Image.new("RGB", (4, 4), "red")
+
+    assert WindowCapture.save_screenshot(image, output_path, skip_unchanged=True) == "written"
+    mtime = output_path.stat().st_mtime_ns
+    same = Image.new("RGB", (4, 4), "red")
+    assert WindowCapture.save_screenshot(same, output_path, skip_unchanged=True) == "unchanged"
+    assert output_path.stat().st_mtime_ns == mtime
+
+    other = Image.new("RGB", (4, 4), "blue")
+    assert WindowCapture.save_screenshot(other, output_path, skip_unchanged=True) == "changed"
+    assert Image.open(output_path).getpixel((0, 0)) == (0, 0, 255)
+    assert WindowCapture.summarize_saves(["written", "unchanged", "unchanged"]) == (
+        "Files: 1 written, 0 changed, 2 unchanged"
+    )
+
+
+def test_inset_region_shrinks_or_gives_up():
+    region = (10, 20, 100, 50)
+    assert WindowCapture.inset_region(region, (1, 2, 3, 4)) == (14, 21, 94, 46)
+    assert WindowCapture.inset_region(region, (0, 0, 0, 0)) == region
+    assert WindowCapture.inset_region(region, (25, 0, 25, 0)) is None
@@ -0,0 +1,92 @@
+"""Unit tests for the still comparison (--compare)."""
+
+import json
+
+import numpy as np
+from PIL import Image
+
+from screenshot_tool.compare import (
+    COMPARE_DIR,
+    compare_dirs,
+    perceptual_score,
+    run_compare,
+    write_summary,
+)
+
+
+def save(root, relative, pixels):
+    path = root / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    Image.fromarray(pixels, "RGB").save(path)
+
+
+def screen(size=(40, 30), value=200):
+    width, height = size
+    return np.full((height, width, 3), value, dtype=np.uint8)
+
+
+def make_dirs(tmp_path):
+    current, baseline = tmp_path / "current", tmp_path / "baseline"
+    moved = screen()
+    moved[5:15, 10:30] = 0  # a shifted block of text
+    noisy = screen(value=205)  # below the per-channel tolerance
+    for root, de_pixels in ((current, moved), (baseline, screen())):
+        save(root, "de/screenshot.png", de_pixels)
+        save(root, "en/screenshot.png", noisy if root == current else screen())
+    save(current, "fr/screenshot.png", screen())
+    save(baseline, "it/screenshot.png", screen())
+    save(current, "demos/basic/start.png", screen((20, 20)))
+    save(baseline, "demos/basic/start.png", screen((30, 20)))
+    return current, baseline
+
+
+def test_compare_dirs_classifies_every_still(tmp_path):
+    current, baseline = make_dirs(tmp_path)
+
+    results = {r.path: r for r in compare_dirs(current, baseline, threshold=0.1, workers=2)}
+
+    assert {path: r.status for path, r in results.items()} == {
+        "de/screenshot.png": "changed",
+        "demos/basic/start.png": "resized",
+        "en/screenshot.png": "unchanged",
+        "fr/screenshot.png": "new",
+        "it/screenshot.png": "missing",
+    }
+    changed = results["de/screenshot.png"]
+    assert changed.changed_pixels == 200
+    assert changed.score > 0
+    assert (current / COMPARE_DIR / changed.heatmap).is_file()
+    assert results["en/screenshot.png"].heatmap is None
+
+
+def test_perceptual_score_zero_for_identical_and_grows_with_change():
+    base = screen()
+    small, large = base.copy(), base.copy()
+    small[0:4, 0:4] = 0
+    large[0:20, 0:30] = 0
+    assert perceptual_score(base, base) == 0.0
+    assert 0 < perceptual_score(base, small) < perceptual_score(base, large)
+
+
+def test_write_summary_lists_differences(tmp_path):
+    current, baseline = make_dirs(tmp_path)
+    results = compare_dirs(current, baseline, workers=1)
+
+    json_path, html_path = write_summary(results, current, baseline, 0.1)
+
+    summary = json.loads(json_path.read_text(encoding="utf-8"))
+    assert summary["counts"] == {"changed": 1, "missing": 1, "new": 1, "resized": 1, "unchanged": 1}
+    page = html_path.read_text(encoding="utf-8")
+    assert "de/screenshot.png" in page
+    assert "en/screenshot.png" not in page  # unchanged stills are not listed
+
+
+def test_run_compare_exit_codes(tmp_path):
+    current, baseline = tmp_path / "current", tmp_path / "baseline"
+    save(current, "de/screenshot.png", screen())
+    save(baseline, "de/screenshot.png", screen())
+    assert run_compare(current, baseline, workers=1) == 0
+    # A rerun does not compare its own heatmaps/summary
+    save(current, "en/screenshot.png", screen())
+    assert run_compare(current, baseline, workers=1) == 1
+    assert run_compare(current, tmp_path / "nowhere", workers=1) == 1
@@ -254,3 +254,159 @@ def test_write_app_settings_file_writes_json_object(tmp_path):
 def test_write_app_settings_file_none_without_settings(tmp_path):
     settings = config.load_config(write_config(tmp_path, DEMO_ONLY))
     assert config.write_app_settings_file(settings.demos[0], tmp_path) is None
+
+
+def test_settle_timeout_and_tail_defaults(tmp_path):
+    settings = config.load_config(write_config(tmp_path, DEMO_ONLY))
+    assert settings.demos[0].settle_timeout == 0.3
+    assert settings.demos[0].tail == 0.5
+
+
+def test_settle_timeout_and_tail_parsed(tmp_path):
+    data = json.loads(json.dumps(DEMO_ONLY))
+    data["demos"][0].update({"settle_timeout": 1, "tail": 0})
+    settings = config.load_config(write_config(tmp_path, data))
+    assert settings.demos[0].settle_timeout == 1.0
+    assert settings.demos[0].tail == 0.0
+
+
+@pytest.mark.parametrize("key", ["settle_timeout", "tail"])
+@pytest.mark.parametrize("bad", [-1, "0.5", True])
+def test_settle_timeout_and_tail_must_be_non_negative_numbers(tmp_path, key, bad):
+    data = json.loads(json.dumps(DEMO_ONLY))
+    data["demos"][0][key] = bad
+    with pytest.raises(SystemExit, match=key):
+        config.load_config(write_config(tmp_path, data))
+
+
+def test_capture_mode_defaults_to_timer(tmp_path):
+    settings = config.load_config(write_config(tmp_path, DEMO_ONLY))
+    assert settings.demos[0].capture == "timer"
+
+
+def test_capture_mode_dirty_parsed(tmp_path):
+    data = json.loads(json.dumps(DEMO_ONLY))
+    data["demos"][0]["capture"] = "dirty"
+    settings = config.load_config(write_config(tmp_path, data))
+    assert settings.demos[0].capture == "dirty"
+
+
+def test_unknown_capture_mode_rejected(tmp_path):
+    data = json.loads(json.dumps(DEMO_ONLY))
+    data["demos"][0]["capture"] = "vsync"
+    with pytest.raises(SystemExit, match="capture"):
+        config.load_config(write_config(tmp_path, data))
+
+
+def test_languages_with_demos_need_no_dropdown_keys(tmp_path):
+    data = json.loads(json.dumps(DEMO_ONLY))
+    data["languages"] = {"de": "Deutsch", "en": "English"}
+    settings = config.load_config(write_config(tmp_path, data))
+    assert settings.language_codes == ["de", "en"]
+    assert settings.dropdown_relative_pos is None
+
+
+def test_language_mode_rejects_config_without_dropdown_keys(tmp_path, monkeypatch):
+    from screenshot_tool.cli import ScreenshotCLI
+
+    monkeypatch.chdir(tmp_path)
+    data = json.loads(json.dumps(DEMO_ONLY))
+    data["languages"] = {"de": "Deutsch", "en": "English"}
+    config.load_config(write_config(tmp_path, data))
+    cli = ScreenshotCLI()
+    assert cli._missing_dropdown_keys() == [
+        "dropdown_relative_pos",
+        "screenshot_filename",
+        "delay_after_change",
+    ]
+    assert cli._run_automated(None, resume=False) == 1
+    assert ScreenshotCLI(delay=1.0)._missing_dropdown_keys() == [
+        "dropdown_relative_pos",
+        "screenshot_filename",
+    ]
+
+
+def test_memory_budget_parsed(tmp_path):
+    data = json.loads(json.dumps(DEMO_ONLY))
+    data["demos"][0]["memory_budget_mb"] = 256
+    data["demos"][0]["memory_policy"] = "spill"
+    settings = config.load_config(write_config(tmp_path, data))
+    assert settings.demos[0].memory_budget_mb == 256.0
+    assert settings.demos[0].memory_policy == "spill"
+    assert settings.demos[1].memory_budget_mb is None
+    assert settings.demos[1].memory_policy == "stop"
+
+
+@pytest.mark.parametrize(
+    "key, value", [("memory_budget_mb", 0), ("memory_budget_mb", "1G"), ("memory_policy", "swap")]
+)
+def test_invalid_memory_budget_rejected(tmp_path, key, value):
+    data = json.loads(json.dumps(DEMO_ONLY))
+    data["demos"][0][key] = value
+    with pytest.raises(SystemExit, match=key):
+        config.load_config(write_config(tmp_path, data))
+
+
+def test_auto_crop_parsed(tmp_path):
+    data = json.loads(json.dumps(DEMO_ONLY))
+    data["demos"][0]["auto_crop"] = True
+    settings = config.load_config(write_config(tmp_path, data))
+    assert settings.demos[0].auto_crop is True
+    assert settings.demos[1].auto_crop is False
+
+
+def test_auto_crop_must_be_bool(tmp_path):
+    data = json.loads(json.dumps(DEMO_ONLY))
+    data["demos"][0]["auto_crop"] = "yes"
+    with pytest.raises(SystemExit, match="auto_crop"):
+        config.load_config(write_config(tmp_path, data))
+
+
+def test_max_idle_parsed(tmp_path):
+    data = json.loads(json.dumps(DEMO_ONLY))
+    data["demos"][0]["max_idle"] = 1.5
+    settings = config.load_config(write_config(tmp_path, data))
+    assert settings.demos[0].max_idle == 1.5
+    assert settings.demos[1].max_idle is None
+
+
+def test_negative_max_idle_rejected(tmp_path):
+    data = json.loads(json.dumps(DEMO_ONLY))
+    data["demos"][0]["max_idle"] = -1
+    with pytest.raises(SystemExit, match="max_idle"):
+        config.load_config(write_config(tmp_path, data))
+
+
+def test_gif_prune_pixels_parsed(tmp_path):
+    data = json.loads(json.dumps(DEMO_ONLY))
+    data["demos"][0]["gif_prune_pixels"] = 40
+    settings = config.load_config(write_config(tmp_path, data))
+    assert settings.demos[0].gif_prune_pixels == 40
+    assert settings.demos[1].gif_prune_pixels is None
+
+
+@pytest.mark.parametrize("bad", [-1, 1.5, True, "40"])
+def test_invalid_gif_prune_pixels_rejected(tmp_path, bad):
+    data = json.loads(json.dumps(DEMO_ONLY))
+    data["demos"][0]["gif_prune_pixels"] = bad
+    with pytest.raises(SystemExit, match="gif_prune_pixels"):
+        config.load_config(write_config(tmp_path, data))
+
+
+def test_mp4_settings_parsed(tmp_path):
+    data = json.loads(json.dumps(DEMO_ONLY))
+    data["demos"][0]["mp4"] = {"segments": 4, "crf": 23, "preset": "fast", "tune": "animation"}
+    settings = config.load_config(write_config(tmp_path, data))
+    assert settings.demos[0].mp4 == config.Mp4Settings(4, 23, "fast", "animation")
+    assert settings.demos[1].mp4 == config.Mp4Settings()
+
+
+@pytest.mark.parametrize(
+    "mp4",
+    [{"segments": 0}, {"crf": 60}, {"preset": "turbo"}, {"tune": "screen"}, "fast"],
+)
+def test_invalid_mp4_settings_rejected(tmp_path, mp4):
+    data = json.loads(json.dumps(DEMO_ONLY))
+    data["demos"][0]["mp4"] = mp4
+    with pytest.raises(SystemExit, match="mp4"):
+        config.load_config(write_config(tmp_path, data))
@@ -1,8 +1,18 @@
 """Unit tests for GIF/MP4 export from captured frames."""
 
+import numpy as np
+import pytest
 from PIL import Image
 
-from screenshot_tool.exporter import export_gif, export_mp4, frame_durations_ms
+from screenshot_tool.exporter import (
+    constant_rate_indices,
+    export_gif,
+    export_mp4,
+    export_mp4_segmented,
+    frame_durations_ms,
+    merged_durations_ms,
+    split_segments,
+)
 
 
 def make_frames(count=3, size=(16, 16)):
@@ -22,6 +32,15 @@ def test_frame_durations_clamped_to_minimum():
     assert frame_durations_ms([0.0, 0.001]) == [20, 20]
 
 
+def test_constant_rate_indices_hold_frames_until_the_next_change():
+    # Frames at 0 s, 0.3 s, 0.35 s (within one 10 fps tick of the previous) and 0.5 s
+    assert constant_rate_indices([0.0, 0.3, 0.35, 0.5], fps=10) == [0, 0, 0, 1, 2, 3]
+
+
+def test_constant_rate_indices_empty():
+    assert constant_rate_indices([], fps=10) == []
+
+
 def test_export_gif_writes_all_frames(tmp_path):
     path = tmp_path / "demo.gif"
     export_gif(make_frames(3), [0.0, 0.1, 0.2], path)
@@ -30,6 +49,19 @@ def test_export_gif_writes_all_frames(tmp_path):
         assert gif.n_frames == 3
 
 
+def test_merged_durations_keep_total_play_time():
+    assert merged_durations_ms([100, 100, 200, 50, 50], keep=[0, 3]) == [400, 100]
+
+
+def test_export_gif_with_keep_merges_durations(tmp_path):
+    path = tmp_path / "demo.gif"
+    export_gif(make_frames(2), [0.0, 0.1, 0.2, 0.3], path, keep=[0, 2])
+
+    with Image.open(path) as gif:
+        assert gif.n_frames == 2
+        assert gif.info["duration"] == 200
+
+
 def test_export_mp4_is_readable(tmp_path):
     import imageio.v2 as imageio
 
@@ -44,3 +76,45 @@ def test_export_mp4_is_readable(tmp_path):
         assert reader.get_data(0).shape[:2] == (16, 16)
     finally:
         reader.close()
+
+
+def test_split_segments_near_equal_and_capped_by_length():
+    assert split_segments(10, 3) == [range(3), range(3, 7), range(7, 10)]
+    assert split_segments(50, 8, min_length=20) == [range(25), range(25, 50)]
+    assert split_segments(5, 4, min_length=20) == [range(5)]
+
+
+def gradient_frames(count, size=(32, 24)):
+    width, height = size
+    return [np.full((height, width, 3), i * 4 % 256, dtype=np.uint8) for i in range(count)]
+
+
+def test_export_mp4_segmented_joins_segments_with_all_frames(tmp_path):
+    frames = gradient_frames(60)
+    path = tmp_path / "demo.mp4"
+
+    segments = export_mp4_segmented(
+        lambda indices: (frames[i] for i in indices),
+        range(60),
+        fps=10,
+        path=path,
+        segments=3,
+        crf=28,
+        preset="ultrafast",
+        tune="animation",
+    )
+
+    assert segments == 3  # 6 s of video, at least 2 s per segment
+    assert not list(tmp_path.glob(".segments-*"))  # temporary segments removed
+    import imageio_ffmpeg
+
+    assert imageio_ffmpeg.count_frames_and_secs(path)[0] == 60
+
+
+def test_export_mp4_segmented_rejects_wrong_frame_count(tmp_path):
+    frames = gradient_frames(10)
+    with pytest.raises(RuntimeError, match="expected 12"):
+        # The reader delivers fewer frames than the video should have
+        export_mp4_segmented(
+            lambda indices: frames, [*range(10), 9, 9], fps=10, path=tmp_path / "d.mp4", segments=1
+        )
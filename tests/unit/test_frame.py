@@ -0,0 +1,69 @@
+"""Unit tests and allocation benchmark for the NumPy frame type."""
+
+import tracemalloc
+
+import numpy as np
+from PIL import Image
+
+from screenshot_tool.frame import Frame
+from screenshot_tool.frame_store import FrameStore
+
+WIDTH, HEIGHT = 640, 420
+FRAME_BYTES = WIDTH * HEIGHT * 3
+
+
+def test_crop_is_a_view_of_the_same_buffer():
+    frame = Frame.from_image(Image.new("RGB", (10, 8), "red"), 1.5)
+    cropped = frame.crop(1, 2, 3, 4)
+    assert cropped.size == (4, 4)
+    assert np.shares_memory(cropped.pixels, frame.pixels)
+    assert cropped.buffer is frame.buffer
+    assert cropped.timestamp == 1.5
+    # Empty or oversized insets leave the frame as is
+    assert frame.crop(0, 0, 0, 0) is frame
+    assert frame.crop(0, 6, 0, 6) is frame
+
+
+def test_reduce_averages_blocks():
+    pixels = np.zeros((4, 4, 3), dtype=np.uint8)
+    pixels[:2, :2] = 200
+    reduced = Frame(pixels, 0.0).reduce(2)
+    assert reduced.size == (2, 2)
+    assert reduced.pixels[0, 0, 0] == 200 and reduced.pixels[1, 1, 0] == 0
+
+
+def test_to_image_round_trips():
+    image = Image.new("RGB", (3, 2), (1, 2, 3))
+    assert Frame.from_image(image, 0.0).crop(0, 1, 0, 0).to_image().getpixel((0, 0)) == (1, 2, 3)
+
+
+def _bytes_allocated(step) -> int:
+    """Bytes still allocated after ``step`` ran: what it adds per frame."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        kept = step()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    del kept
+    return sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+
+
+def test_allocation_benchmark_one_copy_per_frame():
+    """Capture -> crop -> store -> MP4 feed allocates one frame buffer per frame."""
+    captured = Image.new("RGB", (WIDTH, HEIGHT), "blue")
+    store = FrameStore()
+
+    def record():
+        store.append(Frame.from_image(captured, 0.0).crop(8, 8, 8, 8))
+        return store
+
+    def feed_encoder():
+        return list(store.arrays())
+
+    recorded = _bytes_allocated(record)
+    assert FRAME_BYTES <= recorded < FRAME_BYTES * 1.05  # the copy out of PIL only
+    assert _bytes_allocated(feed_encoder) < 4096  # views, no pixel copies
+    # For comparison, the PIL path this replaced: crop copy + RGB array copy
+    assert _bytes_allocated(lambda: np.asarray(captured.crop((8, 8, 632, 412)))) > FRAME_BYTES * 0.9
@@ -0,0 +1,132 @@
+"""Unit tests for whole-recording frame analyses (static border detection)."""
+
+import numpy as np
+
+from screenshot_tool.frame_analysis import (
+    change_index,
+    detect_static_border,
+    idle_trim,
+    prune_near_duplicates,
+    sample_indices,
+)
+
+BORDER = (3, 1, 2, 4)  # top, right, bottom, left
+
+
+def bordered_frames(count, size=(40, 30), border=BORDER, color=(200, 200, 200)):
+    """Frames with a flat static border around content that changes every frame."""
+    width, height = size
+    top, right, bottom, left = border
+    rng = np.random.default_rng(1)
+    frames = []
+    for _ in range(count):
+        pixels = np.empty((height, width, 3), dtype=np.uint8)
+        pixels[:] = color
+        pixels[top : height - bottom, left : width - right] = rng.integers(
+            0, 256, (height - top - bottom, width - left - right, 3), dtype=np.uint8
+        )
+        frames.append(pixels)
+    return frames
+
+
+def test_sample_indices_spread_over_recording_with_ends():
+    assert sample_indices(5, 24) == [0, 1, 2, 3, 4]
+    indices = sample_indices(100, 5)
+    assert indices[0] == 0 and indices[-1] == 99 and len(indices) == 5
+
+
+def test_static_border_detected():
+    assert detect_static_border(bordered_frames(6)) == BORDER
+
+
+def test_sides_with_their_own_color_detected():
+    frames = bordered_frames(4)
+    for pixels in frames:
+        pixels[:3] = (10, 20, 30)  # a darker title strip on top
+    assert detect_static_border(frames) == BORDER
+
+
+def test_changing_edge_is_kept():
+    frames = bordered_frames(4, border=(0, 0, 0, 0))
+    assert detect_static_border(frames) == (0, 0, 0, 0)
+
+
+def test_static_content_touching_edge_is_not_cut():
+    frames = bordered_frames(4)
+    for pixels in frames:
+        pixels[:, 0] = (200, 200, 200)
+        pixels[10, 0] = (0, 0, 0)  # a static detail in the otherwise flat left column
+    assert detect_static_border(frames)[3] == 0
+
+
+def test_blank_recording_is_not_cropped_away():
+    blank = [np.zeros((10, 10, 3), dtype=np.uint8)] * 3
+    assert detect_static_border(blank) == (0, 0, 0, 0)
+    assert detect_static_border([]) == (0, 0, 0, 0)
+
+
+def test_frames_of_different_size_are_not_cropped():
+    frames = bordered_frames(4)
+    small = frames[0][::2, ::2].copy()  # after a downscale
+    assert detect_static_border([*frames, small]) == (0, 0, 0, 0)
+
+
+def test_change_index_measures_changed_share():
+    still = np.zeros((64, 64, 3), dtype=np.uint8)
+    half = still.copy()
+    half[:32] = 255
+    index = change_index([still, still, half, half])
+    assert index[0] == 0.0 and index[1] == 0.0 and index[3] == 0.0
+    assert index[2] == 0.5
+
+
+def test_change_index_sees_small_change_on_large_frame():
+    before = np.zeros((1080, 1920, 3), dtype=np.uint8)
+    after = before.copy()
+    after[500:516, 900:906] = 255  # a caret-sized change
+    assert change_index([before, after])[1] > 0
+
+
+def test_change_index_counts_a_size_change_as_change():
+    large = np.zeros((64, 64, 3), dtype=np.uint8)
+    small = np.zeros((32, 32, 3), dtype=np.uint8)  # after a downscale
+    assert change_index([large, large, small, small]) == [0.0, 0.0, 1.0, 0.0]
+
+
+def test_idle_trim_keeps_max_idle_around_changes():
+    timestamps = [i / 10 for i in range(40)]  # 4 s at 10 fps
+    index = [0.0] * 40
+    index[20] = index[25] = 0.3  # changes at 2.0 s and 2.5 s
+    start, stop = idle_trim(index, timestamps, max_idle=0.5)
+    assert (timestamps[start], timestamps[stop - 1]) == (1.5, 3.0)
+
+
+def test_idle_trim_keeps_frame_before_first_change():
+    index = [0.0, 0.0, 0.0, 0.4, 0.0]
+    assert idle_trim(index, [0, 1, 2, 3, 4], max_idle=0) == (2, 4)
+
+
+def test_idle_trim_keeps_recording_without_changes():
+    assert idle_trim([0.0, 0.0, 0.0], [0, 1, 2], max_idle=0) == (0, 3)
+
+
+def test_prune_drops_caret_blinks_and_noise():
+    base = np.full((40, 60, 3), 240, dtype=np.uint8)
+    caret = base.copy()
+    caret[10:26, 20:22] = 0  # 32 px caret
+    noisy = base + np.uint8(5)  # antialiasing-level noise everywhere
+    text = base.copy()
+    text[10:26, 20:40] = 0
+    assert prune_near_duplicates([base, caret, noisy, base, text], max_changed_px=32) == [0, 4]
+
+
+def test_prune_compares_with_last_kept_frame():
+    frames = [np.zeros((10, 10, 3), dtype=np.uint8) for _ in range(4)]
+    for i, pixels in enumerate(frames):
+        pixels[0, : i * 3] = 255  # 3 more pixels per frame: each step small, the drift not
+    assert prune_near_duplicates(frames, max_changed_px=4) == [0, 2]
+
+
+def test_prune_keeps_frames_of_a_new_size():
+    frames = [np.zeros((10, 10, 3), dtype=np.uint8), np.zeros((5, 5, 3), dtype=np.uint8)]
+    assert prune_near_duplicates(frames, max_changed_px=1000) == [0, 1]
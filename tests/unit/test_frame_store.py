@@ -0,0 +1,72 @@
+"""Unit tests for the recorder's frame store (accounting, spill, shrink)."""
+
+import numpy as np
+
+from screenshot_tool.frame import Frame
+from screenshot_tool.frame_store import SPILL_FILE, FrameStore
+
+
+def make_frame(value, timestamp, size=(8, 4)):
+    width, height = size
+    return Frame(np.full((height, width, 3), value, dtype=np.uint8), timestamp)
+
+
+def make_store(count):
+    store = FrameStore()
+    for i in range(count):
+        store.append(make_frame(i, i / 10))
+    return store
+
+
+def test_bytes_held_counts_pixel_data():
+    store = make_store(3)
+    assert len(store) == 3
+    assert store.bytes_held == 3 * 8 * 4 * 3
+
+
+def test_crop_views_are_accounted_by_their_whole_buffer():
+    store = FrameStore()
+    store.append(make_frame(0, 0.0).crop(1, 1, 1, 1))
+    assert store.bytes_held == 96
+
+
+def test_spill_moves_frames_to_disk_and_reads_them_back(tmp_path):
+    store = make_store(2)
+    assert store.spill(tmp_path / "spill") == 2 * 96
+    store.append(make_frame(2, 0.2))  # goes straight to disk
+
+    assert store.bytes_held == 0
+    assert (tmp_path / "spill" / SPILL_FILE).is_file()
+    assert [pixels[0, 0, 0] for pixels in store.arrays()] == [0, 1, 2]
+    assert [pixels[0, 0, 0] for pixels in store.arrays([2, 2, 0])] == [2, 2, 0]
+    assert [img.getpixel((0, 0))[0] for img in store.images()] == [0, 1, 2]
+    assert store[1].timestamp == 0.1
+    store.close()
+    assert not (tmp_path / "spill").exists()
+
+
+def test_downscale_and_thin_free_memory():
+    store = make_store(5)
+    assert store.downscale(2) == 5 * 96 - 5 * 24
+    assert store[0].size == (4, 2)
+    store.thin()
+    # Every other frame, the last one kept
+    assert store.timestamps == [0.0, 0.2, 0.4]
+    assert store.bytes_held == 3 * 24
+
+
+def test_crop_applies_to_memory_and_spilled_frames(tmp_path):
+    store = make_store(2)
+    store.spill(tmp_path / "spill")
+    store.append(make_frame(9, 0.2))
+    store.crop((1, 2, 0, 3))
+    assert [f.size for f in store] == [(3, 3)] * 3
+    assert [a.shape for a in store.arrays()] == [(3, 3, 3)] * 3
+    store.close()
+
+
+def test_trim_keeps_range_and_frees_memory():
+    store = make_store(5)
+    assert store.trim(1, 3) == 3 * 96
+    assert store.timestamps == [0.1, 0.2]
+    assert [f.timestamp for f in store] == [0.1, 0.2]
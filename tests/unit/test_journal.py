@@ -0,0 +1,74 @@
+"""Unit tests for the language capture journal used by --resume."""
+
+import json
+
+from screenshot_tool import config
+from screenshot_tool.cli import ScreenshotCLI
+from screenshot_tool.journal import CaptureJournal, JournalEntry, file_sha256
+
+
+def record_ok(journal, tmp_path, code, content=b"png"):
+    path = tmp_path / code / "screenshot.png"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    journal.record(JournalEntry(code, "ok", str(path), file_sha256(path)))
+    return path
+
+
+def test_completed_lists_only_intact_successful_captures(tmp_path):
+    journal = CaptureJournal(tmp_path / "journal.jsonl")
+    journal.start(resume=False)
+    record_ok(journal, tmp_path, "de")
+    changed = record_ok(journal, tmp_path, "en")
+    deleted = record_ok(journal, tmp_path, "fr")
+    journal.record(JournalEntry("it", "failed", error="Could not read dropdown"))
+    changed.write_bytes(b"edited")
+    deleted.unlink()
+    assert journal.completed() == {"de"}
+
+
+def test_last_entry_per_code_wins(tmp_path):
+    journal = CaptureJournal(tmp_path / "journal.jsonl")
+    journal.start(resume=False)
+    journal.record(JournalEntry("de", "failed", error="Window closed unexpectedly"))
+    record_ok(journal, tmp_path, "de")
+    assert journal.completed() == {"de"}
+
+
+def test_start_without_resume_clears_and_truncated_lines_are_skipped(tmp_path):
+    journal = CaptureJournal(tmp_path / "journal.jsonl")
+    journal.start(resume=False)
+    record_ok(journal, tmp_path, "de")
+    with journal.path.open("a", encoding="utf-8") as f:
+        f.write('{"code": "en", "sta')  # cut off by a crash
+    journal.start(resume=True)
+    journal.record(JournalEntry("it", "failed", error="Not in dropdown"))
+    assert set(journal.entries()) == {"de", "it"}
+    journal.start(resume=False)
+    assert journal.entries() == {}
+
+
+def test_run_that_finds_no_window_keeps_the_journal(tmp_path, monkeypatch):
+    config_path = tmp_path / "app.json"
+    config_path.write_text(
+        json.dumps(
+            {
+                "process_name": "app.exe",
+                "title_substring": "My App",
+                "dropdown_relative_pos": [100, 200],
+                "output_dir": str(tmp_path / "out"),
+                "screenshot_filename": "main.png",
+                "delay_after_change": 1.5,
+                "languages": {"de": "Deutsch", "en": "English"},
+            }
+        ),
+        encoding="utf-8",
+    )
+    config.load_config(config_path)
+    cli = ScreenshotCLI()
+    cli.journal.start(resume=False)
+    record_ok(cli.journal, tmp_path, "de")
+    monkeypatch.setattr(cli, "find_window", lambda: False)
+
+    assert cli.run_automated() == 1
+    assert cli.journal.completed() == {"de"}
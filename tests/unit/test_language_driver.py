@@ -0,0 +1,49 @@
+"""Unit tests for UIA language selection (ComboBox wrapper replaced by a fake)."""
+
+from screenshot_tool.language_driver import LanguageDriver
+
+
+class FakeComboBox:
+    """Mimics the pywinauto UIA ComboBoxWrapper calls the driver uses."""
+
+    def __init__(self, items, ignore_selection=False):
+        self.items = items
+        self.selected = items[0]
+        self.ignore_selection = ignore_selection
+        self.expanded = False
+
+    def texts(self):
+        return self.items
+
+    def select(self, item):
+        if not self.ignore_selection:
+            self.selected = self.items[item] if isinstance(item, int) else item
+
+    def is_expanded(self):
+        return self.expanded
+
+    def collapse(self):
+        self.expanded = False
+
+    def selected_text(self):
+        return self.selected
+
+
+def make_driver(combobox):
+    driver = LanguageDriver(hwnd=1)
+    driver._combobox = combobox
+    driver.items = driver._read_items()
+    return driver
+
+
+def test_select_by_name_and_index():
+    driver = make_driver(FakeComboBox(["English", "Deutsch", "Français"]))
+    assert driver.select("Deutsch")
+    assert driver.get_selected_language() == "Deutsch"
+    assert driver.select(2)
+    assert driver.get_selected_language() == "Français"
+
+
+def test_select_fails_when_dropdown_does_not_follow():
+    driver = make_driver(FakeComboBox(["English", "Deutsch"], ignore_selection=True))
+    assert not driver.select("Deutsch")
@@ -0,0 +1,34 @@
+"""Unit tests for the --profile run profiler."""
+
+import pstats
+import threading
+
+from screenshot_tool.profiling import RunProfiler
+
+
+def _allocate_frames():
+    return [bytearray(64 * 1024) for _ in range(32)]
+
+
+def _recorder_work():
+    return sum(range(10_000))
+
+
+def test_profiler_covers_phases_and_threads(tmp_path):
+    profiler = RunProfiler("basic-math [de]")
+    kept = []
+    with profiler.phase("record"):
+        thread = threading.Thread(target=_recorder_work)
+        profiler.profile_thread(thread)
+        thread.start()
+        thread.join()
+        kept.append(_allocate_frames())
+
+    prof_path, alloc_path = profiler.save(tmp_path / "profile")
+
+    assert prof_path.name == "basic-math_de.prof"
+    functions = {name for _, _, name in pstats.Stats(str(prof_path)).stats}
+    assert {"_allocate_frames", "_recorder_work"} <= functions
+    report = alloc_path.read_text(encoding="utf-8")
+    assert report.startswith("Phase record: peak")
+    assert "test_profiling.py" in report  # the bytearrays kept alive above
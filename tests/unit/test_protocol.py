@@ -2,7 +2,7 @@
 
 import pytest
 
-from screenshot_tool.demo_server import DemoEvent, parse_event_line
+from screenshot_tool.demo_server import DemoEvent, FrameBufferSpec, parse_event_line
 
 
 def test_parse_demo_started_with_hwnd():
@@ -29,3 +29,36 @@ def test_parse_demo_ended():
 def test_garbage_raises_value_error(line):
     with pytest.raises(ValueError):
         parse_event_line(line)
+
+
+def test_parse_exiting_ack():
+    event = parse_event_line('{"event": "exiting"}')
+    assert event == DemoEvent(event="exiting", demo=None, name=None, hwnd=None)
+
+
+def test_parse_demo_started_with_frame_buffer():
+    event = parse_event_line(
+        '{"event": "demo_started", "demo": 1, '
+        '"frame_buffer": {"shm": "calc-frames", "width": 640, "height": 420, "slots": 8}}'
+    )
+    assert event.hwnd is None
+    assert event.frame_buffer == FrameBufferSpec("calc-frames", 640, 420, 8)
+
+
+@pytest.mark.parametrize(
+    "frame_buffer",
+    ['"calc-frames"', '{"shm": "f", "width": 0, "height": 1, "slots": 1}', '{"width": 1}'],
+)
+def test_invalid_frame_buffer_raises_value_error(frame_buffer):
+    with pytest.raises(ValueError):
+        parse_event_line(f'{{"event": "demo_started", "frame_buffer": {frame_buffer}}}')
+
+
+def test_parse_frame():
+    event = parse_event_line('{"event": "frame", "index": 42, "timestamp": 1.5}')
+    assert (event.event, event.index, event.timestamp) == ("frame", 42, 1.5)
+
+
+def test_frame_without_index_raises_value_error():
+    with pytest.raises(ValueError):
+        parse_event_line('{"event": "frame", "timestamp": 1.5}')
@@ -0,0 +1,164 @@
+"""Unit tests for the Recorder capture modes (window capture stubbed out)."""
+
+import itertools
+import time
+
+from PIL import Image
+
+from screenshot_tool.capture import WindowCapture
+from screenshot_tool.recorder import MemoryBudget, Recorder
+
+
+def fake_capture(monkeypatch):
+    calls: list[float] = []
+
+    def capture_window(hwnd, inset=(0, 0, 0, 0)):
+        calls.append(time.perf_counter())
+        return Image.new("RGB", (4, 4), "red")
+
+    monkeypatch.setattr(WindowCapture, "capture_window", staticmethod(capture_window))
+    return calls
+
+
+def test_dirty_mode_captures_nothing_while_idle(monkeypatch, tmp_path):
+    fake_capture(monkeypatch)
+    recorder = Recorder(1, fps=50, stills_dir=tmp_path, mode="dirty")
+    recorder.start()
+    time.sleep(0.2)
+    recorder.notify_dirty()
+    time.sleep(0.1)
+    recorder.stop()
+    recorder.join(timeout=5)
+    # Initial state, the one repaint, and the closing frame
+    assert len(recorder.frames) == 3
+
+
+def test_dirty_mode_is_rate_limited_to_fps(monkeypatch, tmp_path):
+    fake_capture(monkeypatch)
+    recorder = Recorder(1, fps=10, stills_dir=tmp_path, mode="dirty")
+    recorder.start()
+    end = time.perf_counter() + 0.35
+    while time.perf_counter() < end:
+        recorder.notify_dirty()
+        time.sleep(0.001)
+    recorder.stop()
+    recorder.join(timeout=5)
+    timestamps = recorder.frames.timestamps
+    # The closing frame taken at stop() is not rate-limited; every gap before it is
+    gaps = [b - a for a, b in itertools.pairwise(timestamps[:-1])]
+    assert 3 <= len(recorder.frames) <= 6
+    assert min(gaps) >= 0.099
+
+
+def test_timer_mode_ignores_dirty_notifications(monkeypatch, tmp_path):
+    fake_capture(monkeypatch)
+    recorder = Recorder(1, fps=20, stills_dir=tmp_path)
+    recorder.start()
+    recorder.notify_dirty()
+    time.sleep(0.2)
+    recorder.stop()
+    recorder.join(timeout=5)
+    assert len(recorder.frames) >= 3
+
+
+def test_still_request_wakes_timer_mode_immediately(monkeypatch, tmp_path):
+    fake_capture(monkeypatch)
+    # 1 fps: without the wake-up the still would wait up to a second
+    recorder = Recorder(1, fps=1, stills_dir=tmp_path)
+    recorder.start()
+    time.sleep(0.1)
+    requested = time.perf_counter()
+    recorder.request_still("now")
+    deadline = requested + 2
+    while not recorder.saved_stills and time.perf_counter() < deadline:
+        time.sleep(0.005)
+    assert recorder.saved_stills == ["now"]
+    assert recorder.frames[-1].timestamp - requested < 0.25
+    recorder.stop()
+    recorder.join(timeout=5)
+    assert (tmp_path / "now.png").is_file()
+
+
+def test_still_request_bypasses_dirty_mode_idle(monkeypatch, tmp_path):
+    fake_capture(monkeypatch)
+    recorder = Recorder(1, fps=10, stills_dir=tmp_path, mode="dirty")
+    recorder.start()
+    time.sleep(0.05)
+    recorder.request_still("idle")
+    time.sleep(0.1)
+    recorder.stop()
+    recorder.join(timeout=5)
+    assert recorder.saved_stills == ["idle"]
+
+
+def test_stop_policy_ends_recording_at_the_budget(monkeypatch, tmp_path):
+    fake_capture(monkeypatch)
+    # 4x4 RGB = 48 bytes per frame: the fourth frame exceeds 150 bytes
+    recorder = Recorder(1, fps=100, stills_dir=tmp_path, budget=MemoryBudget(150, "stop"))
+    recorder.start()
+    recorder.join(timeout=5)
+    assert not recorder.is_alive()
+    assert len(recorder.frames) == 4
+    assert [e.policy for e in recorder.budget_events] == ["stop"]
+    assert recorder.memory_report()["peak_bytes"] == 4 * 48
+
+
+def test_reduce_fps_policy_thins_frames_and_halves_the_rate(monkeypatch, tmp_path):
+    fake_capture(monkeypatch)
+    recorder = Recorder(1, fps=40, stills_dir=tmp_path, budget=MemoryBudget(150, "reduce_fps"))
+    recorder.start()
+    deadline = time.perf_counter() + 5
+    while not recorder.budget_events and time.perf_counter() < deadline:
+        time.sleep(0.005)
+    recorder.stop()
+    recorder.join(timeout=5)
+    assert recorder.budget_events[0].policy == "reduce_fps"
+    assert recorder.budget_events[0].bytes_after < recorder.budget_events[0].bytes_before
+    assert recorder.export_fps() <= 20
+
+
+def test_spill_policy_keeps_recording_on_disk(monkeypatch, tmp_path):
+    fake_capture(monkeypatch)
+    recorder = Recorder(1, fps=100, stills_dir=tmp_path, budget=MemoryBudget(150, "spill"))
+    recorder.start()
+    time.sleep(0.2)
+    recorder.stop()
+    recorder.join(timeout=5)
+    assert [e.policy for e in recorder.budget_events] == ["spill"]
+    assert len(recorder.frames) > 4 and recorder.frames.bytes_held == 0
+    assert all(frame.size == (4, 4) for frame in recorder.frames)
+    recorder.frames.close()
+
+
+def test_crop_is_left_out_of_the_grab(monkeypatch, tmp_path):
+    insets = []
+
+    def capture_window(hwnd, inset=(0, 0, 0, 0)):
+        insets.append(inset)
+        return Image.new("RGB", (100 - inset[1] - inset[3], 50 - inset[0] - inset[2]))
+
+    monkeypatch.setattr(WindowCapture, "capture_window", staticmethod(capture_window))
+    monkeypatch.setattr(WindowCapture, "window_region", staticmethod(lambda hwnd: (0, 0, 100, 50)))
+    recorder = Recorder(1, fps=50, stills_dir=tmp_path, crop=(5, 10, 5, 10))
+    recorder.start()
+    time.sleep(0.1)
+    recorder.stop()
+    recorder.join(timeout=5)
+
+    assert set(insets) == {(5, 10, 5, 10)}
+    assert recorder.frames[0].size == (80, 40)
+    report = recorder.capture_report()
+    assert report["pixels_skipped_per_frame"] == 100 * 50 - 80 * 40
+    assert report["bytes_skipped"] == (100 * 50 - 80 * 40) * 3 * recorder.frames_captured
+
+
+def test_crop_larger_than_the_window_is_ignored(monkeypatch, tmp_path):
+    fake_capture(monkeypatch)
+    monkeypatch.setattr(WindowCapture, "window_region", staticmethod(lambda hwnd: (0, 0, 4, 4)))
+    recorder = Recorder(1, fps=50, stills_dir=tmp_path, crop=(3, 0, 3, 0))
+    recorder.start()
+    time.sleep(0.05)
+    recorder.stop()
+    recorder.join(timeout=5)
+    assert recorder.crop == (0, 0, 0, 0)
+    assert recorder.capture_report()["bytes_skipped"] == 0
@@ -0,0 +1,51 @@
+"""Unit tests for the app resource sampler."""
+
+import subprocess
+import sys
+import time
+
+import psutil
+
+from screenshot_tool.resource_sampler import ResourceSampler
+
+
+def test_samples_process_tree_with_events():
+    # A parent that starts a child: both count towards the tree
+    code = (
+        "import subprocess, sys, time; "
+        "subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(5)']); time.sleep(5)"
+    )
+    proc = subprocess.Popen([sys.executable, "-c", code])
+    try:
+        sampler = ResourceSampler(proc.pid, interval=0.05)
+        sampler.start()
+        time.sleep(0.5)
+        sampler.mark("demo_started")
+        time.sleep(0.2)
+        sampler.stop()
+        sampler.join(timeout=5)
+    finally:
+        for child in psutil.Process(proc.pid).children(recursive=True):
+            child.kill()
+        proc.kill()
+        proc.wait()
+
+    report = sampler.report(recording_start=sampler.started_at + 0.5)
+    samples = report["samples"]
+    assert len(samples) >= 3
+    assert max(s["processes"] for s in samples) == 2
+    assert report["peak"]["rss_bytes"] > 0 and report["peak"]["threads"] >= 2
+    assert report["events"][0]["event"] == "demo_started"
+    assert samples[-1]["event"] == "demo_started"  # samples carry the last event
+    assert samples[0]["event"] is None
+    assert report["recording_offset"] == 0.5
+
+
+def test_stops_when_process_exits():
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait()
+    sampler = ResourceSampler(proc.pid, interval=0.05)
+    sampler.start()
+    sampler.join(timeout=5)
+    assert not sampler.is_alive()
+    assert sampler.report()["peak"]["rss_bytes"] == 0
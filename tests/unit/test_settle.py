@@ -0,0 +1,43 @@
+"""Unit tests for visual settle detection (captures replaced by a frame sequence)."""
+
+from PIL import Image
+
+from screenshot_tool.settle import thumbnail, wait_for_settle
+
+
+def frames(*colors):
+    """Capture stub returning one solid frame per call, repeating the last."""
+    images = [Image.new("RGB", (32, 16), color) for color in colors]
+    calls = iter(range(10_000))
+    return lambda: images[min(next(calls), len(images) - 1)]
+
+
+def test_settles_after_identical_samples_well_before_timeout():
+    result = wait_for_settle(frames("white"), timeout=5, stable_samples=3, interval=0.001)
+    assert result.settled
+    assert result.seconds < 1
+
+
+def test_waits_for_changes_to_stop():
+    capture = frames("white", "gray", "black", "black", "black")
+    result = wait_for_settle(capture, timeout=5, stable_samples=3, interval=0.001)
+    assert result.settled and result.image.getpixel((0, 0)) == (0, 0, 0)
+
+
+def test_baseline_requires_a_visible_change_first():
+    baseline = thumbnail(Image.new("RGB", (32, 16), "white"))
+    # The repaint starts late: three unchanged samples must not count as settled
+    capture = frames("white", "white", "white", "white", "red")
+    result = wait_for_settle(
+        capture, timeout=5, baseline=baseline, stable_samples=3, interval=0.001
+    )
+    assert result.settled and result.image.getpixel((0, 0)) == (255, 0, 0)
+
+
+def test_timeout_is_the_upper_bound():
+    baseline = thumbnail(Image.new("RGB", (32, 16), "white"))
+    result = wait_for_settle(
+        frames("white"), timeout=0.05, baseline=baseline, stable_samples=3, interval=0.01
+    )
+    assert not result.settled
+    assert 0.05 <= result.seconds < 1
@@ -0,0 +1,70 @@
+"""Unit tests for phase spans, the breakdown table, and the Chrome trace export."""
+
+import json
+
+import pytest
+
+from screenshot_tool.timing import PhaseTimer, Span
+
+
+def make_timer(spans):
+    timer = PhaseTimer()
+    timer.spans = [Span(*s) for s in spans]
+    return timer
+
+
+def test_span_records_phase_with_monotonic_bounds():
+    timer = PhaseTimer()
+    with timer.span("basic-math", "launch"):
+        pass
+    (span,) = timer.spans
+    assert (span.run, span.phase) == ("basic-math", "launch")
+    assert 0 <= span.start <= span.end
+
+
+def test_span_is_recorded_when_block_raises():
+    timer = PhaseTimer()
+    with pytest.raises(RuntimeError), timer.span("basic-math", "connect"):
+        raise RuntimeError("app died")
+    assert [s.phase for s in timer.spans] == ["connect"]
+
+
+def test_breakdown_has_one_row_per_run_and_phase_columns_in_flow_order():
+    timer = make_timer(
+        [
+            ("a", "launch", 0.0, 1.0),
+            ("a", "record", 1.0, 4.0),
+            ("b [de]", "launch", 4.0, 4.5),
+            ("b [de]", "record", 4.5, 6.0),
+        ]
+    )
+    header, row_a, row_b = timer.breakdown_lines()
+    assert header.split() == ["run", "launch", "record", "total"]
+    assert row_a.split() == ["a", "1.00", "3.00", "4.00"]
+    assert row_b.split() == ["b", "[de]", "0.50", "1.50", "2.00"]
+
+
+def test_breakdown_empty_without_spans():
+    assert PhaseTimer().breakdown_lines() == []
+
+
+def test_chrome_trace_has_one_track_per_run(tmp_path):
+    timer = make_timer([("a", "launch", 0.0, 0.25), ("b", "export", 1.0, 1.5)])
+    path = tmp_path / "demos" / "trace.json"
+    timer.write_chrome_trace(path)
+
+    events = json.loads(path.read_text(encoding="utf-8"))["traceEvents"]
+    names = {e["tid"]: e["args"]["name"] for e in events if e["ph"] == "M"}
+    assert names == {1: "a", 2: "b"}
+    complete = [e for e in events if e["ph"] == "X"]
+    assert complete[0] == {
+        "name": "launch",
+        "cat": "demo",
+        "ph": "X",
+        "ts": 0,
+        "dur": 250_000,
+        "pid": 1,
+        "tid": 1,
+        "args": {"run": "a"},
+    }
+    assert complete[1]["tid"] == 2 and complete[1]["ts"] == 1_000_000